@@ -0,0 +1,130 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmarks the graph search stage of ChunkBasedSearch and TopicBasedSearch: one query per start node,
+submitted to a thread pool of num_workers threads (as these retrievers did previously), compared with the
+single UNWIND query they now issue for all start nodes.
+
+The benchmark runs against a local stand-in for a graph store, which models a network round trip per
+query, a server-side cost per start node, and a limited number of connections shared by all concurrent
+requests. No graph database is required. Several requests are run concurrently, so that the per-node
+queries of different requests compete for connections, as they do under load.
+
+Usage:
+
+    python chunk_search_benchmark.py --round-trip-ms 5 --per-node-ms 2 --connections 8 --concurrent-requests 8
+"""
+
+import argparse
+import concurrent.futures
+import statistics
+import threading
+import time
+
+from llama_index.core.bridge.pydantic import PrivateAttr
+
+from graphrag_toolkit.storage.graph_store import GraphStore
+from graphrag_toolkit.storage.vector_store import VectorStore
+from graphrag_toolkit.retrieval.retrievers import ChunkBasedSearch, TopicBasedSearch
+
+class LatencyGraphStore(GraphStore):
+    """
+    A graph store stand-in that returns one search result per start node after sleeping for the round trip
+    plus the per-node cost, while holding one of a fixed number of connections.
+    """
+
+    round_trip_ms:float
+    per_node_ms:float
+    connections:int
+
+    _semaphore:threading.BoundedSemaphore = PrivateAttr()
+
+    def model_post_init(self, __context):
+        self._semaphore = threading.BoundedSemaphore(self.connections)
+
+    def execute_query(self, cypher, parameters={}, correlation_id=None):
+
+        ids = parameters.get('chunkIds') or parameters.get('topicIds')
+
+        with self._semaphore:
+            time.sleep((self.round_trip_ms + self.per_node_ms * len(ids)) / 1000)
+
+        return [
+            {'result': {'id': id, 'results': [search_result(id)]}}
+            for id in ids
+        ]
+
+def search_result(id):
+    return {
+        'score': 1.0,
+        'source': {'sourceId': f'source-{id}', 'metadata': {}},
+        'topics': [{
+            'topic': f'topic-{id}',
+            'chunks': [{'chunkId': id}],
+            'statements': [{'statementId': f'statement-{id}', 'statement': f'statement {id}', 'facts': [], 'chunkId': id, 'score': 1}]
+        }]
+    }
+
+def per_node_search(graph_search, ids, num_workers):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futures = [executor.submit(graph_search, id) for id in ids]
+        return [result for future in futures for result in future.result()]
+
+def time_requests(fn, num_requests, concurrent_requests):
+
+    def timed():
+        start = time.perf_counter()
+        fn()
+        return (time.perf_counter() - start) * 1000
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrent_requests) as executor:
+        timings = list(executor.map(lambda _: timed(), range(num_requests)))
+
+    return statistics.median(timings), statistics.quantiles(timings, n=20)[-1]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-node vs single UNWIND graph search in ChunkBasedSearch and TopicBasedSearch')
+    parser.add_argument('--round-trip-ms', type=float, default=5.0, help='Network round trip per query')
+    parser.add_argument('--per-node-ms', type=float, default=2.0, help='Server-side cost per start node')
+    parser.add_argument('--connections', type=int, default=8, help='Connections shared by all requests')
+    parser.add_argument('--start-nodes', type=int, default=10, help='Start nodes (vector hits) per request (see vss_top_k)')
+    parser.add_argument('--num-workers', type=int, default=10, help='Thread pool size for per-node queries (see num_workers)')
+    parser.add_argument('--concurrent-requests', type=int, default=8)
+    parser.add_argument('--num-requests', type=int, default=80)
+    cli_args = parser.parse_args()
+
+    print(f'Round trip: {cli_args.round_trip_ms}ms, per node: {cli_args.per_node_ms}ms, connections: {cli_args.connections}, '
+          f'start nodes: {cli_args.start_nodes}, concurrent requests: {cli_args.concurrent_requests}')
+    print(f'{"":18} {"per-node median":>16} {"per-node p95":>13} {"UNWIND median":>14} {"UNWIND p95":>11} {"speedup":>8}')
+
+    for (retriever_type, prefix) in [(ChunkBasedSearch, 'chunk'), (TopicBasedSearch, 'topic')]:
+
+        graph_store = LatencyGraphStore(
+            round_trip_ms=cli_args.round_trip_ms,
+            per_node_ms=cli_args.per_node_ms,
+            connections=cli_args.connections
+        )
+        retriever = retriever_type(graph_store, VectorStore())
+        ids = [f'{prefix}-{i}' for i in range(cli_args.start_nodes)]
+
+        single_search = getattr(retriever, f'{prefix}_based_graph_search')
+        batch_search = getattr(retriever, f'batch_{prefix}_based_graph_search')
+
+        assert len(per_node_search(single_search, ids, cli_args.num_workers)) == len(batch_search(ids))
+
+        per_node_median, per_node_p95 = time_requests(
+            lambda: per_node_search(single_search, ids, cli_args.num_workers),
+            cli_args.num_requests,
+            cli_args.concurrent_requests
+        )
+        unwind_median, unwind_p95 = time_requests(
+            lambda: batch_search(ids),
+            cli_args.num_requests,
+            cli_args.concurrent_requests
+        )
+
+        print(f'{retriever_type.__name__:18} {per_node_median:>14.1f}ms {per_node_p95:>11.1f}ms {unwind_median:>12.1f}ms {unwind_p95:>9.1f}ms {per_node_median / unwind_median:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
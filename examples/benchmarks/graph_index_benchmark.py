@@ -0,0 +1,119 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmarks MERGE throughput in FalkorDB with and without the indexes created by GraphStore.ensure_schema().
+
+Writes the same synthetic workload – statements, facts and subject/object entities, merged on their ids
+in batches of UNWIND ... MERGE statements, as the build stage's graph builders do – to two empty graphs:
+one without indexes, and one on which ensure_schema() has been called. Throughput is reported for
+successive segments of the workload, to show how MERGE performance changes as each graph grows.
+
+Each graph is deleted afterwards unless --keep is supplied.
+
+Usage:
+
+    python graph_index_benchmark.py --endpoint localhost:6379 --num-facts 200000
+"""
+
+import argparse
+import random
+import time
+
+from graphrag_toolkit.storage import GraphStoreFactory
+from graphrag_toolkit.storage.graph_utils import search_string_from
+
+def merge_query(graph_store):
+    return '\n'.join([
+        '// benchmark merge facts',
+        'UNWIND $params AS params',
+        f'MERGE (statement:`__Statement__`{{{graph_store.node_id("statementId")}: params.statement_id}})',
+        f'MERGE (fact:`__Fact__`{{{graph_store.node_id("factId")}: params.fact_id}})',
+        'MERGE (fact)-[:`__SUPPORTS__`]->(statement)',
+        f'MERGE (subject:`__Entity__`{{{graph_store.node_id("entityId")}: params.s_id}})',
+        'ON CREATE SET subject.value = params.s, subject.search_str = params.s_search_str',
+        'MERGE (subject)-[:`__SUBJECT__`]->(fact)',
+        f'MERGE (object:`__Entity__`{{{graph_store.node_id("entityId")}: params.o_id}})',
+        'ON CREATE SET object.value = params.o, object.search_str = params.o_search_str',
+        'MERGE (object)-[:`__OBJECT__`]->(fact)'
+    ])
+
+def fact_params(i, num_entities, rng):
+    s = rng.randrange(num_entities)
+    o = rng.randrange(num_entities)
+    return {
+        'statement_id': f'statement-{i // 3}',
+        'fact_id': f'fact-{i}',
+        's_id': f'entity-{s}',
+        's': f'Entity {s}',
+        's_search_str': search_string_from(f'Entity {s}'),
+        'o_id': f'entity-{o}',
+        'o': f'Entity {o}',
+        'o_search_str': search_string_from(f'Entity {o}')
+    }
+
+def run(graph_store, num_facts, num_entities, batch_size, num_segments):
+
+    rng = random.Random(42)
+    query = merge_query(graph_store)
+
+    segment_size = max(num_facts // num_segments, batch_size)
+    segments = []
+    total_start = time.perf_counter()
+    segment_start = total_start
+    segment_written = 0
+
+    for batch_start in range(0, num_facts, batch_size):
+        params = [fact_params(i, num_entities, rng) for i in range(batch_start, min(batch_start + batch_size, num_facts))]
+        graph_store.execute_query(query, {'params': params})
+        written = batch_start + len(params)
+        if written - segment_written >= segment_size or written == num_facts:
+            now = time.perf_counter()
+            segments.append((written, (written - segment_written) / (now - segment_start)))
+            segment_start = now
+            segment_written = written
+
+    return num_facts / (time.perf_counter() - total_start), segments
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark FalkorDB MERGE throughput with and without graph indexes')
+    parser.add_argument('--endpoint', default='localhost:6379')
+    parser.add_argument('--num-facts', type=int, default=200000)
+    parser.add_argument('--num-entities', type=int, default=100000)
+    parser.add_argument('--batch-size', type=int, default=25, help='Facts per MERGE query (see GraphRAGConfig.build_batch_write_size)')
+    parser.add_argument('--num-segments', type=int, default=10)
+    parser.add_argument('--keep', action='store_true', help='Do not delete the benchmark graphs afterwards')
+    cli_args = parser.parse_args()
+
+    results = {}
+
+    for (database, create_indexes) in [('mergebenchmarknoindexes', False), ('mergebenchmarkindexed', True)]:
+
+        graph_store = GraphStoreFactory.for_graph_store(f'falkordb://{cli_args.endpoint}', database=database)
+
+        try:
+            graph_store.client.delete()
+        except Exception:
+            pass
+
+        try:
+            if create_indexes:
+                created_indexes = graph_store.ensure_schema()
+                print(f'Created indexes: {", ".join(str(i) for i in created_indexes)}')
+            else:
+                print(f'Missing indexes: {", ".join(str(i) for i in graph_store.missing_indexes())}')
+
+            results[create_indexes] = run(graph_store, cli_args.num_facts, cli_args.num_entities, cli_args.batch_size, cli_args.num_segments)
+        finally:
+            if not cli_args.keep:
+                graph_store.client.delete()
+
+    print(f'Facts: {cli_args.num_facts}, entities: {cli_args.num_entities}, facts per query: {cli_args.batch_size}')
+    print(f'{"facts written":>14} {"no indexes (facts/s)":>22} {"indexed (facts/s)":>20}')
+    for (written, no_index_rate), (_, indexed_rate) in zip(results[False][1], results[True][1]):
+        print(f'{written:>14} {no_index_rate:>22.0f} {indexed_rate:>20.0f}')
+    print(f'{"overall":>14} {results[False][0]:>22.0f} {results[True][0]:>20.0f}')
+    print(f'speedup: {results[True][0] / results[False][0]:.1f}x')
+
+if __name__ == '__main__':
+    main()
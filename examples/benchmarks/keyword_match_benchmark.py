@@ -0,0 +1,175 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmarks the keyword-to-entity match used by KeywordRankingSearch against a FalkorDB graph with a large
+number of __Entity__ nodes (1M by default).
+
+Compares matching on a case-insensitive comparison of entity values – WHERE toLower(e.value) = toLower(keyword),
+which cannot use a property index and so scans every __Entity__ node – with matching on the normalized
+search_str property written by the build stage, both before and after a range index is created on
+__Entity__(search_str).
+
+The benchmark loads a synthetic graph into a dedicated FalkorDB graph (deleted afterwards unless --keep is
+supplied). Only --num-matching entities are connected to facts and statements; the remainder exist to
+make the entity scan realistic.
+
+Usage:
+
+    python keyword_match_benchmark.py --host localhost --port 6379 --num-entities 1000000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from falkordb import FalkorDB
+
+from graphrag_toolkit.storage.graph_utils import search_string_from
+
+# The match clauses below mirror the query in KeywordRankingSearch._retrieve(), before and after
+# matching was moved onto search_str
+
+VALUE_MATCH_QUERY = '''
+UNWIND $keywords AS keyword
+MATCH (e:`__Entity__`)
+WHERE toLower(e.value) = toLower(keyword)
+WITH e, keyword
+MATCH (e)-[:`__SUBJECT__`|`__OBJECT__`]->(:`__Fact__`)-[:`__SUPPORTS__`]->(statement:`__Statement__`)
+WITH statement, COLLECT(DISTINCT keyword) as matched_keywords
+RETURN { statement: { statementId: statement.statementId }, matched_keywords: matched_keywords } AS result
+'''
+
+SEARCH_STR_MATCH_QUERY = '''
+UNWIND $keywords AS keyword
+MATCH (e:`__Entity__`)
+WHERE e.search_str = keyword.search_str
+WITH e, keyword
+MATCH (e)-[:`__SUBJECT__`|`__OBJECT__`]->(:`__Fact__`)-[:`__SUPPORTS__`]->(statement:`__Statement__`)
+WITH statement, COLLECT(DISTINCT keyword.keyword) as matched_keywords
+RETURN { statement: { statementId: statement.statementId }, matched_keywords: matched_keywords } AS result
+'''
+
+def entity_value(i):
+    return f'Entity {i:07d}'
+
+def load_graph(graph, num_entities, num_matching, batch_size):
+
+    start = time.time()
+
+    for batch_start in range(0, num_entities, batch_size):
+        params = [
+            {'entityId': f'entity-{i}', 'value': entity_value(i), 'search_str': search_string_from(entity_value(i))}
+            for i in range(batch_start, min(batch_start + batch_size, num_entities))
+        ]
+        graph.query('''
+        UNWIND $params AS params
+        CREATE (:`__Entity__`{entityId: params.entityId, value: params.value, search_str: params.search_str, class: 'Thing'})
+        ''', {'params': params})
+
+    # Connect the first num_matching entities to a fact and a statement. The entityId index keeps
+    # the entity lookups in this step from dominating load time.
+    graph.create_node_range_index('__Entity__', 'entityId')
+
+    for batch_start in range(0, num_matching, batch_size):
+        params = [
+            {'entityId': f'entity-{i}', 'factId': f'fact-{i}', 'statementId': f'statement-{i}'}
+            for i in range(batch_start, min(batch_start + batch_size, num_matching))
+        ]
+        graph.query('''
+        UNWIND $params AS params
+        MATCH (e:`__Entity__`{entityId: params.entityId})
+        CREATE (e)-[:`__SUBJECT__`]->(:`__Fact__`{factId: params.factId})-[:`__SUPPORTS__`]->(:`__Statement__`{statementId: params.statementId})
+        ''', {'params': params})
+
+    print(f'Loaded {num_entities} entities ({num_matching} with statements) in {time.time() - start:.1f}s')
+
+def wait_for_index(graph, keywords):
+    # FalkorDB builds indexes asynchronously: wait until the planner uses the new index
+    plan = None
+    for _ in range(600):
+        plan = '\n'.join(graph.explain(SEARCH_STR_MATCH_QUERY, {'keywords': keywords[0]}).plan)
+        if 'Index Scan' in plan:
+            return
+        time.sleep(1)
+    raise TimeoutError(f'Index on __Entity__(search_str) not used by query plan:\n{plan}')
+
+def plan_summary(graph, query, params):
+    return ' <- '.join(op.strip() for op in graph.explain(query, params).plan)
+
+def time_query(graph, query, keyword_batches, warmup=1):
+    for params in keyword_batches[:warmup]:
+        graph.ro_query(query, {'keywords': params})
+    timings = []
+    for params in keyword_batches:
+        start = time.perf_counter()
+        graph.ro_query(query, {'keywords': params})
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark KeywordRankingSearch keyword matching in FalkorDB')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=6379)
+    parser.add_argument('--graph', default='keyword_match_benchmark')
+    parser.add_argument('--num-entities', type=int, default=1000000)
+    parser.add_argument('--num-matching', type=int, default=10000, help='Number of entities connected to statements')
+    parser.add_argument('--keywords-per-query', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--keep', action='store_true', help='Do not delete the benchmark graph afterwards')
+    cli_args = parser.parse_args()
+
+    db = FalkorDB(host=cli_args.host, port=cli_args.port)
+    graph = db.select_graph(cli_args.graph)
+
+    if cli_args.graph in db.list_graphs():
+        graph.delete()
+
+    try:
+
+        load_graph(graph, cli_args.num_entities, cli_args.num_matching, cli_args.batch_size)
+
+        # LLM-extracted keywords vary in case; the search_str match normalizes them client-side, as
+        # KeywordRankingSearch does
+        rng = random.Random(42)
+        value_batches = []
+        search_str_batches = []
+        for _ in range(cli_args.iterations):
+            keywords = [entity_value(rng.randrange(cli_args.num_matching)).upper() for _ in range(cli_args.keywords_per_query)]
+            value_batches.append(keywords)
+            search_str_batches.append([{'keyword': k, 'search_str': search_string_from(k)} for k in keywords])
+
+        results = [
+            ('toLower(e.value)', VALUE_MATCH_QUERY, value_batches),
+            ('search_str (no index)', SEARCH_STR_MATCH_QUERY, search_str_batches),
+        ]
+
+        timings = [
+            (name, *time_query(graph, query, batches), plan_summary(graph, query, {'keywords': batches[0]}))
+            for name, query, batches in results
+        ]
+
+        graph.create_node_range_index('__Entity__', 'search_str')
+        wait_for_index(graph, search_str_batches)
+
+        timings.append((
+            'search_str (indexed)',
+            *time_query(graph, SEARCH_STR_MATCH_QUERY, search_str_batches),
+            plan_summary(graph, SEARCH_STR_MATCH_QUERY, {'keywords': search_str_batches[0]})
+        ))
+
+        print(f'Entities: {cli_args.num_entities}, keywords per query: {cli_args.keywords_per_query}, iterations: {cli_args.iterations}')
+        for (name, median_ms, p95_ms, plan) in timings:
+            print(f'{name:22}: {median_ms:10.2f}ms (median) {p95_ms:10.2f}ms (p95)')
+            print(f'{"":22}  {plan}')
+
+        print(f'speedup (indexed search_str vs toLower(e.value)): {timings[0][1] / timings[-1][1]:.1f}x')
+
+    finally:
+        if not cli_args.keep:
+            graph.delete()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmarks the traversal-based retriever's processing pipeline – building a result collection from
+raw query results, running DEFAULT_PROCESSORS, copying the results, running DEFAULT_FORMATTING_PROCESSORS,
+and serializing the formatted results – on large synthetic result sets.
+
+Compares the slotted dataclasses in graphrag_toolkit.retrieval.internal_model, which the retrievers use,
+with the pydantic models in graphrag_toolkit.retrieval.model. Processors are duck-typed, so the same
+processor chain runs against both.
+
+Usage:
+
+    python processor_chain_benchmark.py --num-results 1000 --topics-per-result 5 --statements-per-topic 20
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from graphrag_toolkit.retrieval import model, internal_model
+from graphrag_toolkit.retrieval.processors import ProcessorArgs
+from graphrag_toolkit.retrieval.retrievers.traversal_based_base_retriever import DEFAULT_PROCESSORS, DEFAULT_FORMATTING_PROCESSORS
+
+from llama_index.core.schema import QueryBundle
+
+def raw_results(num_results, topics_per_result, statements_per_topic, num_sources, seed=42):
+    rng = random.Random(seed)
+    results = []
+    for r in range(num_results):
+        source_id = f'source-{rng.randrange(num_sources)}'
+        results.append({'result': {
+            'score': rng.random(),
+            'source': {'sourceId': source_id, 'metadata': {'title': f'Document {source_id}', 'url': f'https://example.com/{source_id}'}},
+            'topics': [
+                {
+                    'topic': f'topic {rng.randrange(topics_per_result * 4)}',
+                    'chunks': [{'chunkId': f'chunk-{r}-{t}'}],
+                    'statements': [
+                        {
+                            'statementId': f'statement-{r}-{t}-{s}',
+                            'statement': f'Statement {rng.randrange(statements_per_topic * 10)} about topic {t}',
+                            'facts': [f'fact {s}'],
+                            'chunkId': f'chunk-{r}-{t}',
+                            'score': float(rng.randrange(1, 5))
+                        }
+                        for s in range(statements_per_topic)
+                    ]
+                }
+                for t in range(topics_per_result)
+            ]
+        }})
+    return results
+
+def run_pydantic(results, args, query_bundle):
+    search_results = model.SearchResultCollection(results=[model.SearchResult.model_validate(r['result']) for r in results])
+    for processor in DEFAULT_PROCESSORS:
+        search_results = processor(args).process_results(search_results, query_bundle, 'benchmark')
+    formatted_search_results = search_results.model_copy(deep=True)
+    for processor in DEFAULT_FORMATTING_PROCESSORS:
+        formatted_search_results = processor(args).process_results(formatted_search_results, query_bundle, 'benchmark')
+    return [r.model_dump_json(exclude_none=True, exclude_defaults=True, indent=2) for r in formatted_search_results.results]
+
+def run_slotted(results, args, query_bundle):
+    search_results = internal_model.SearchResultCollection(results=[internal_model.SearchResult.from_dict(r['result']) for r in results])
+    for processor in DEFAULT_PROCESSORS:
+        search_results = processor(args).process_results(search_results, query_bundle, 'benchmark')
+    formatted_search_results = search_results.copy()
+    for processor in DEFAULT_FORMATTING_PROCESSORS:
+        formatted_search_results = processor(args).process_results(formatted_search_results, query_bundle, 'benchmark')
+    return [r.to_json(indent=2) for r in formatted_search_results.results]
+
+def time_ms(fn, results, iterations):
+    timings = []
+    output = None
+    for _ in range(iterations):
+        # Processors modify results in place, so each run starts from a fresh copy of the raw results
+        fresh_results = json.loads(json.dumps(results))
+        start = time.perf_counter()
+        output = fn(fresh_results)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), output
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the DEFAULT_PROCESSORS chain')
+    parser.add_argument('--num-results', type=int, default=1000)
+    parser.add_argument('--topics-per-result', type=int, default=5)
+    parser.add_argument('--statements-per-topic', type=int, default=20)
+    parser.add_argument('--num-sources', type=int, default=200)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--reranker', default='none', help="'none' (default) isolates model overheads; 'tfidf' includes reranking")
+    cli_args = parser.parse_args()
+
+    results = raw_results(cli_args.num_results, cli_args.topics_per_result, cli_args.statements_per_topic, cli_args.num_sources)
+    num_statements = cli_args.num_results * cli_args.topics_per_result * cli_args.statements_per_topic
+
+    args = ProcessorArgs(reranker=cli_args.reranker, max_statements=num_statements, max_search_results=cli_args.num_results)
+    query_bundle = QueryBundle(query_str='What are the statements about topic 1?')
+
+    pydantic_ms, pydantic_output = time_ms(lambda r: run_pydantic(r, args, query_bundle), results, cli_args.iterations)
+    slotted_ms, slotted_output = time_ms(lambda r: run_slotted(r, args, query_bundle), results, cli_args.iterations)
+
+    assert pydantic_output == slotted_output, 'Pydantic and slotted pipelines produced different output'
+
+    print(f'Results: {cli_args.num_results}, statements: {num_statements}, reranker: {cli_args.reranker}, iterations: {cli_args.iterations}')
+    print(f'pydantic models   : {pydantic_ms:10.2f}ms (median)')
+    print(f'slotted dataclass : {slotted_ms:10.2f}ms (median)')
+    print(f'speedup           : {pydantic_ms / slotted_ms:10.2f}x')
+
+if __name__ == '__main__':
+    main()
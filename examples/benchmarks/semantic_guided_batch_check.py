@@ -0,0 +1,184 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Checks that questions answered together by retrieve_batch() do not see each other's intermediate results
+when the engine uses a SemanticGuidedRetriever, whose graph retrievers are shared by all of the questions in
+a batch.
+
+The check runs against local stand-ins for a graph store and a statement vector index. The stand-in graph is
+partitioned: each question has its own set of statements, connected only to one another, and the seed
+retriever returns statements from the question's own partition only. Every statement returned for a question
+– and the seed from which each beam search result was reached – must therefore come from that question's
+partition. No graph database is required, and mock embedding and LLM models are used. Graph queries and seed
+retrieval sleep for a random interval, so that the questions in a batch interleave.
+
+Usage:
+
+    python semantic_guided_batch_check.py --num-questions 50 --rounds 5
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+from llama_index.core.embeddings import MockEmbedding
+from llama_index.core.llms import MockLLM
+from llama_index.core.schema import NodeWithScore, TextNode
+
+from graphrag_toolkit import GraphRAGConfig, LexicalGraphQueryEngine
+from graphrag_toolkit.storage.graph_store import GraphStore
+from graphrag_toolkit.storage.vector_store import VectorStore
+from graphrag_toolkit.storage.vector_index import VectorIndex
+from graphrag_toolkit.retrieval.retrievers import SemanticGuidedRetriever, SemanticBeamGraphSearch
+from graphrag_toolkit.retrieval.retrievers.semantic_guided_base_retriever import SemanticGuidedBaseRetriever
+
+EMBEDDING_DIMENSIONS = 8
+
+def statement_id(partition, i):
+    return f'p{partition}-s{i}'
+
+def partition_of(statement_id):
+    return int(statement_id.split('-')[0][1:])
+
+def question(partition):
+    return f'question {partition}'
+
+def jitter(max_ms):
+    time.sleep(random.uniform(0, max_ms) / 1000)
+
+class PartitionedGraphStore(GraphStore):
+    """
+    A graph store stand-in that answers the neighbour queries issued by SemanticBeamGraphSearch, and the
+    statement query issued by SemanticGuidedRetriever, from a partitioned graph in which each statement
+    is connected to the next two statements in its own partition.
+    """
+
+    statements_per_partition:int
+    max_latency_ms:float
+
+    def execute_query(self, cypher, parameters={}, correlation_id=None):
+
+        jitter(self.max_latency_ms)
+
+        if 'statementId' in parameters:
+            partition, i = partition_of(parameters['statementId']), int(parameters['statementId'].split('-s')[1])
+            return [
+                {'statementId': statement_id(partition, (i + offset) % self.statements_per_partition)}
+                for offset in (1, 2)
+            ]
+
+        if 'statement_ids' in parameters:
+            return [
+                {'result': {
+                    'statement': {'statementId': id, 'value': f'statement {id}'},
+                    'chunk': {'chunkId': f'chunk-{partition_of(id)}'},
+                    'source': {'sourceId': f'source-{partition_of(id)}', 'metadata': {}}
+                }}
+                for id in parameters['statement_ids']
+            ]
+
+        return []
+
+class RandomStatementIndex(VectorIndex):
+    """A statement index stand-in that returns a fixed random embedding per statement."""
+
+    def add_embeddings(self, nodes):
+        return nodes
+
+    def top_k(self, query_bundle, top_k=5):
+        return []
+
+    def get_embeddings(self, ids=[]):
+        return [
+            {'statement': {'statementId': id}, 'embedding': np.random.default_rng(abs(hash(id))).random(EMBEDDING_DIMENSIONS).tolist()}
+            for id in ids
+        ]
+
+class PartitionSeedSearch(SemanticGuidedBaseRetriever):
+    """A stand-in for the initial retrievers that returns the first statements in the question's partition."""
+
+    def __init__(self, vector_store, graph_store, questions, num_seeds, max_latency_ms, **kwargs):
+        super().__init__(vector_store, graph_store, **kwargs)
+        self.partitions = {q: p for p, q in enumerate(questions)}
+        self.num_seeds = num_seeds
+        self.max_latency_ms = max_latency_ms
+
+    def _retrieve(self, query_bundle):
+        jitter(self.max_latency_ms)
+        partition = self.partitions[query_bundle.query_str]
+        return [
+            NodeWithScore(node=TextNode(text='', metadata={'statement': {'statementId': statement_id(partition, i)}}), score=1.0)
+            for i in range(self.num_seeds)
+        ]
+
+def check_results(partition, results, num_seeds):
+    errors = []
+    seed_ids = {statement_id(partition, i) for i in range(num_seeds)}
+    for result in results:
+        id = result.node.metadata['statement']['statementId']
+        if partition_of(id) != partition:
+            errors.append(f'{question(partition)}: statement {id} belongs to {question(partition_of(id))}')
+        path = result.node.metadata.get('path')
+        if path and path[0] not in seed_ids:
+            errors.append(f'{question(partition)}: statement {id} was reached from seed {path[0]}, which is not one of its seeds')
+    return errors
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that SemanticGuidedRetriever keeps the questions in a batch apart')
+    parser.add_argument('--num-questions', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--statements-per-partition', type=int, default=40)
+    parser.add_argument('--num-seeds', type=int, default=3)
+    parser.add_argument('--beam-width', type=int, default=10)
+    parser.add_argument('--max-latency-ms', type=float, default=2.0, help='Upper bound of the random latency of each graph query and seed retrieval')
+    parser.add_argument('--max-concurrency', type=int, default=10)
+    cli_args = parser.parse_args()
+
+    GraphRAGConfig.create_graph_indexes = False
+    GraphRAGConfig.embed_model = MockEmbedding(embed_dim=EMBEDDING_DIMENSIONS)
+
+    questions = [question(p) for p in range(cli_args.num_questions)]
+
+    graph_store = PartitionedGraphStore(
+        statements_per_partition=cli_args.statements_per_partition,
+        max_latency_ms=cli_args.max_latency_ms
+    )
+    vector_store = VectorStore([RandomStatementIndex(index_name='statement')])
+
+    retriever = SemanticGuidedRetriever(
+        vector_store=vector_store,
+        graph_store=graph_store,
+        retrievers=[
+            PartitionSeedSearch(vector_store, graph_store, questions, cli_args.num_seeds, cli_args.max_latency_ms),
+            SemanticBeamGraphSearch(vector_store, graph_store, max_depth=3, beam_width=cli_args.beam_width)
+        ],
+        share_results=True
+    )
+
+    query_engine = LexicalGraphQueryEngine(graph_store, vector_store, llm=MockLLM(), retriever=retriever)
+
+    errors = []
+    num_results = 0
+
+    for _ in range(cli_args.rounds):
+
+        batch_results = query_engine.retrieve_batch(questions, max_concurrency=cli_args.max_concurrency)
+
+        for partition, results in enumerate(batch_results):
+            if not results:
+                errors.append(f'{question(partition)}: no results')
+            num_results += len(results)
+            errors.extend(check_results(partition, results, cli_args.num_seeds))
+
+    print(f'Questions: {cli_args.num_questions}, rounds: {cli_args.rounds}, results: {num_results}, errors: {len(errors)}')
+
+    for error in errors[:20]:
+        print(f'  {error}')
+
+    if errors:
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
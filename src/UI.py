@@ -40,7 +40,8 @@ if 'initialized' not in st.session_state:
     sb_status.write("instantiating query engines")
     graph_rag_query_engine = LexicalGraphQueryEngine.for_semantic_guided_search(
          graph_store,
-         vector_store
+         vector_store,
+         streaming=True
     )
     st.session_state['graph_rag_query_engine'] = graph_rag_query_engine
 
@@ -67,11 +68,11 @@ if prompt := st.chat_input("user entry"):
     # Add user message to chat history
     st.session_state.messages.append({"role": "user", "content": prompt})
 
-    response = f"{st.session_state['query_engine'].query(prompt)}"
+    streaming_response = st.session_state['graph_rag_query_engine'].query(prompt)
 
-    # Display assistant response in chat message container
+    # Display assistant response in chat message container as it is generated
     with st.chat_message("assistant"):
-        st.markdown(response)
+        response = st.write_stream(streaming_response.response_gen)
 
     # Add assistant response to chat history
     st.session_state.messages.append({"role": "assistant", "content": response})
@@ -19,6 +19,8 @@ DEFAULT_EXTRACTION_MODEL = 'anthropic.claude-3-sonnet-20240229-v1:0'
 DEFAULT_RESPONSE_MODEL = 'anthropic.claude-3-sonnet-20240229-v1:0'
 DEFAULT_EMBEDDINGS_MODEL = 'cohere.embed-english-v3'
 DEFAULT_RERANKING_MODEL = 'mixedbread-ai/mxbai-rerank-xsmall-v1'
+DEFAULT_RERANKING_BATCH_SIZE = 128
+DEFAULT_RERANKING_MAX_WAIT_MS = 10
 DEFAULT_EMBEDDINGS_DIMENSIONS = 1024
 DEFAULT_EXTRACTION_NUM_WORKERS = 2
 DEFAULT_EXTRACTION_BATCH_SIZE = 4
@@ -29,6 +31,9 @@ DEFAULT_BUILD_BATCH_WRITE_SIZE = 25
 DEFAULT_BATCH_WRITES_ENABLED = True
 DEFAULT_INCLUDE_DOMAIN_LABELS = False
 DEFAULT_ENABLE_CACHE = False
+DEFAULT_CREATE_GRAPH_INDEXES = True
+DEFAULT_QUERY_EMBEDDING_CACHE_SIZE = 1000
+DEFAULT_QUERY_EXECUTOR_MAX_WORKERS = 32
 
 def _is_json_string(s):
     try:
@@ -51,6 +56,8 @@ class _GraphRAGConfig:
     _embed_model: Optional[BaseEmbedding] = None
     _embed_dimensions: Optional[int] = None
     _reranking_model: Optional[str] = None
+    _reranking_batch_size: Optional[int] = None
+    _reranking_max_wait_ms: Optional[int] = None
     _extraction_num_workers: Optional[int] = None
     _extraction_num_threads_per_worker: Optional[int] = None
     _extraction_batch_size: Optional[int] = None
@@ -60,6 +67,9 @@ class _GraphRAGConfig:
     _batch_writes_enabled: Optional[bool] = None
     _include_domain_labels: Optional[bool] = None
     _enable_cache: Optional[bool] = None
+    _create_graph_indexes: Optional[bool] = None
+    _query_embedding_cache_size: Optional[int] = None
+    _query_executor_max_workers: Optional[int] = None
 
     @property
     def extraction_num_workers(self) -> int:
@@ -157,6 +167,36 @@ class _GraphRAGConfig:
     @enable_cache.setter
     def enable_cache(self, enable_cache:bool) -> None:
         self._enable_cache = enable_cache
+
+    @property
+    def create_graph_indexes(self) -> bool:
+        if self._create_graph_indexes is None:
+            self.create_graph_indexes = string_to_bool(os.environ.get('CREATE_GRAPH_INDEXES'), DEFAULT_CREATE_GRAPH_INDEXES)  
+        return self._create_graph_indexes
+
+    @create_graph_indexes.setter
+    def create_graph_indexes(self, create_graph_indexes:bool) -> None:
+        self._create_graph_indexes = create_graph_indexes
+
+    @property
+    def query_embedding_cache_size(self) -> int:
+        if self._query_embedding_cache_size is None:
+            self.query_embedding_cache_size = int(os.environ.get('QUERY_EMBEDDING_CACHE_SIZE', DEFAULT_QUERY_EMBEDDING_CACHE_SIZE))
+        return self._query_embedding_cache_size
+
+    @query_embedding_cache_size.setter
+    def query_embedding_cache_size(self, query_embedding_cache_size:int) -> None:
+        self._query_embedding_cache_size = query_embedding_cache_size
+
+    @property
+    def query_executor_max_workers(self) -> int:
+        if self._query_executor_max_workers is None:
+            self.query_executor_max_workers = int(os.environ.get('QUERY_EXECUTOR_MAX_WORKERS', DEFAULT_QUERY_EXECUTOR_MAX_WORKERS))
+        return self._query_executor_max_workers
+
+    @query_executor_max_workers.setter
+    def query_executor_max_workers(self, query_executor_max_workers:int) -> None:
+        self._query_executor_max_workers = query_executor_max_workers
    
     @property
     def extraction_llm(self) -> LLM:
@@ -247,5 +287,27 @@ class _GraphRAGConfig:
     @reranking_model.setter
     def reranking_model(self, reranking_model: str) -> None:
        self._reranking_model = reranking_model
+
+    @property
+    def reranking_batch_size(self) -> int:
+        if self._reranking_batch_size is None:
+            self.reranking_batch_size = int(os.environ.get('RERANKING_BATCH_SIZE', DEFAULT_RERANKING_BATCH_SIZE))
+
+        return self._reranking_batch_size
+
+    @reranking_batch_size.setter
+    def reranking_batch_size(self, batch_size:int) -> None:
+        self._reranking_batch_size = batch_size
+
+    @property
+    def reranking_max_wait_ms(self) -> int:
+        if self._reranking_max_wait_ms is None:
+            self.reranking_max_wait_ms = int(os.environ.get('RERANKING_MAX_WAIT_MS', DEFAULT_RERANKING_MAX_WAIT_MS))
+
+        return self._reranking_max_wait_ms
+
+    @reranking_max_wait_ms.setter
+    def reranking_max_wait_ms(self, max_wait_ms:int) -> None:
+        self._reranking_max_wait_ms = max_wait_ms
     
 GraphRAGConfig = _GraphRAGConfig()
\ No newline at end of file
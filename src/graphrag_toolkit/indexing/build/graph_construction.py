@@ -3,7 +3,7 @@
 
 import logging
 from tqdm import tqdm
-from typing import Any, List, Union
+from typing import Any, List, Union, Optional
 
 from graphrag_toolkit.indexing.build.graph_builder import GraphBuilder
 from graphrag_toolkit.indexing.node_handler import NodeHandler
@@ -11,6 +11,7 @@ from graphrag_toolkit.indexing.build.graph_batch_client import GraphBatchClient
 from graphrag_toolkit.storage.graph_store import GraphStore
 from graphrag_toolkit.storage.graph_store_factory import GraphStoreFactory
 from graphrag_toolkit.storage.constants import INDEX_KEY 
+from graphrag_toolkit.storage.statement_lexical_index import StatementLexicalIndex
 from graphrag_toolkit.indexing.build.source_graph_builder import SourceGraphBuilder
 from graphrag_toolkit.indexing.build.chunk_graph_builder import ChunkGraphBuilder
 from graphrag_toolkit.indexing.build.topic_graph_builder import TopicGraphBuilder
@@ -65,6 +66,10 @@ class GraphConstruction(NodeHandler):
         description='Graph builders',
         default_factory=default_builders
     )
+    statement_index_path:Optional[str] = Field(
+        description='Path to a local statement lexical index to be updated as statements are inserted',
+        default=None
+    )
 
     def accept(self, nodes: List[BaseNode], **kwargs: Any):
 
@@ -80,6 +85,8 @@ class GraphConstruction(NodeHandler):
         logger.debug(f'Batch config: [batch_writes_enabled: {batch_writes_enabled}, batch_write_size: {batch_write_size}]')
         logger.debug(f'Graph construction kwargs: {kwargs}')
 
+        lexical_statements = []
+
         with GraphBatchClient(self.graph_client, batch_writes_enabled=batch_writes_enabled, batch_write_size=batch_write_size) as batch_client:
         
             node_iterable = nodes if not self.show_progress else tqdm(nodes, desc=f'Building graph [batch_writes_enabled: {batch_writes_enabled}, batch_write_size: {batch_write_size}]')
@@ -101,6 +108,11 @@ class GraphConstruction(NodeHandler):
                         else:
                             logger.debug(f'No builders for node [index: {index}]')
 
+                        if self.statement_index_path and index == 'statement':
+                            statement_metadata = node.metadata.get('statement', {})
+                            if statement_metadata:
+                                lexical_statements.append((statement_metadata['statementId'], statement_metadata['value']))
+
                     except Exception as e:
                         logger.exception('An error occurred while building the graph')
                         raise e
@@ -112,6 +124,10 @@ class GraphConstruction(NodeHandler):
                     yield node
 
             batch_nodes = batch_client.apply_batch_operations()
+
+            if lexical_statements:
+                StatementLexicalIndex.for_path(self.statement_index_path).add_statements(lexical_statements)
+
             for node in batch_nodes:
                 yield node
 
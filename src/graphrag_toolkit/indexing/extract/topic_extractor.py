@@ -1,13 +1,14 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import time
 import logging
 import asyncio
 from typing import Tuple, List, Optional, Sequence, Dict
 
 from graphrag_toolkit.config import GraphRAGConfig
 from graphrag_toolkit.utils import LLMCache, LLMCacheType
-from graphrag_toolkit.indexing.utils.topic_utils import parse_extracted_topics, format_list, format_text
+from graphrag_toolkit.indexing.utils.topic_utils import parse_extracted_topics, format_list, format_text, TopicParser
 from graphrag_toolkit.indexing.extract.scoped_value_provider import ScopedValueProvider, FixedScopedValueProvider, DEFAULT_SCOPE
 from graphrag_toolkit.indexing.model import TopicCollection
 from graphrag_toolkit.indexing.constants import TOPICS_KEY, DEFAULT_ENTITY_CLASSIFICATIONS
@@ -21,6 +22,8 @@ from llama_index.core.async_utils import run_jobs
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_UNPARSEABLE_LINES = 10
+
 class TopicExtractor(BaseExtractor):
 
     llm: Optional[LLMCache] = Field(
@@ -43,6 +46,14 @@ class TopicExtractor(BaseExtractor):
         description='Topic provider'
     )
 
+    streaming:bool = Field(
+        description='Parse topics as the response is generated'
+    )
+
+    max_unparseable_lines:Optional[int] = Field(
+        description='Stop a streamed response after this many consecutive unparseable lines'
+    )
+
     @classmethod
     def class_name(cls) -> str:
         return 'TopicExtractor'
@@ -53,7 +64,9 @@ class TopicExtractor(BaseExtractor):
                  source_metadata_field=None,
                  num_workers:Optional[int]=None,
                  entity_classification_provider=None,
-                 topic_provider=None
+                 topic_provider=None,
+                 streaming=False,
+                 max_unparseable_lines=DEFAULT_MAX_UNPARSEABLE_LINES
                  ):
                  
         super().__init__(
@@ -65,7 +78,9 @@ class TopicExtractor(BaseExtractor):
             source_metadata_field=source_metadata_field,
             num_workers=num_workers or GraphRAGConfig.extraction_num_threads_per_worker,
             entity_classification_provider=entity_classification_provider or FixedScopedValueProvider(scoped_values={DEFAULT_SCOPE: DEFAULT_ENTITY_CLASSIFICATIONS}),
-            topic_provider=topic_provider or FixedScopedValueProvider(scoped_values={DEFAULT_SCOPE: []})
+            topic_provider=topic_provider or FixedScopedValueProvider(scoped_values={DEFAULT_SCOPE: []}),
+            streaming=streaming,
+            max_unparseable_lines=max_unparseable_lines
         )
     
     async def aextract(self, nodes: Sequence[BaseNode]) -> List[Dict]:
@@ -116,7 +131,43 @@ class TopicExtractor(BaseExtractor):
             TOPICS_KEY: topics.model_dump()
         }
             
+    def _stream_topics(self, text:str, preferred_entity_classifications:List[str], preferred_topics:List[str]) -> Tuple[TopicCollection, List[str]]:
+
+        # Topics, statements and facts are parsed as tokens arrive, so a response that does not 
+        # follow the extraction format can be abandoned before it is fully generated (and cached)
+
+        start = time.time()
+
+        parser = TopicParser(max_unparseable_lines=self.max_unparseable_lines)
+        
+        tokens = self.llm.stream(
+            PromptTemplate(template=self.prompt_template),
+            text=text,
+            preferred_entity_classifications=format_list(preferred_entity_classifications),
+            preferred_topics=format_list(preferred_topics)
+        )
+
+        try:
+            for token in tokens:
+                for topic in parser.feed(token):
+                    logger.debug(f'Parsed topic [topic: {topic.value}, num_statements: {len(topic.statements)}]')
+                if parser.is_malformed:
+                    logger.warning(f'Stopped topic extraction for malformed response [unparseable_lines: {parser.consecutive_unparseable_lines}, last_line: {parser.garbage[-1]}]')
+                    break
+        finally:
+            tokens.close()
+
+        (topics, garbage) = parser.close()
+
+        time_to_first_fact_ms = f'{parser.time_to_first_fact_ms:.2f}ms' if parser.time_to_first_fact_ms is not None else None
+        logger.debug(f'Streamed topic extraction [num_topics: {len(topics.topics)}, num_facts: {parser.num_facts}, time_to_first_fact: {time_to_first_fact_ms}, duration: {(time.time()-start) * 1000:.2f}ms, malformed: {parser.is_malformed}]')
+        
+        return (topics, garbage)
+            
     async def _extract_topics(self, text:str, preferred_entity_classifications:List[str], preferred_topics:List[str]) -> Tuple[TopicCollection, List[str]]:
+
+        if self.streaming:
+            return await asyncio.to_thread(self._stream_topics, text, preferred_entity_classifications, preferred_topics)
         
         def blocking_llm_call():
             return self.llm.predict(
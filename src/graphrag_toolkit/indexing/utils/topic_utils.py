@@ -2,7 +2,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import re
-from typing import Tuple, List
+import time
+from typing import Tuple, List, Optional
 
 from graphrag_toolkit.indexing.constants import DEFAULT_TOPIC
 from graphrag_toolkit.indexing.model import TopicCollection, Topic, Fact, Entity, Relation, Statement
@@ -31,119 +32,176 @@ def strip_full_stop(s):
 def strip_parentheses(s):
     return re.sub('\(.*\)', '', s).replace('  ', ' ').strip()
 
-def parse_extracted_topics(raw_text:str) -> Tuple[TopicCollection, List[str]]:
-    garbage = []
-    current_state = None
+class TopicParser():
+    """
+    Parses extracted topics, statements, entities and facts incrementally, as the extraction
+    response is generated. feed() accepts successive pieces of the response, and returns any topics
+    completed by that piece; close() completes the last topic, and returns the parsed topics and the
+    lines that could not be parsed.
+
+    If max_unparseable_lines consecutive lines cannot be parsed, is_malformed becomes True, so that
+    callers can stop generating a response that does not follow the extraction format.
+    """
+
+    def __init__(self, max_unparseable_lines:Optional[int]=None):
+        self.max_unparseable_lines = max_unparseable_lines
+        self.topics = TopicCollection(topics=[])
+        self.garbage = []
+        self.num_facts = 0
+        self.started_at = time.monotonic()
+        self.first_fact_at = None
+        self.consecutive_unparseable_lines = 0
+        self._buffer = ''
+        self._current_state = None
+        self._current_topic = Topic(value=DEFAULT_TOPIC, facts=[], details=[])
+        self._current_statement:Statement = None
+        self._current_entities = {}
+
+    @property
+    def is_malformed(self) -> bool:
+        return self.max_unparseable_lines is not None and self.consecutive_unparseable_lines >= self.max_unparseable_lines
+
+    @property
+    def time_to_first_fact_ms(self) -> Optional[float]:
+        return (self.first_fact_at - self.started_at) * 1000 if self.first_fact_at is not None else None
+
+    def _unparseable(self, message:str):
+        self.garbage.append(message)
+        self.consecutive_unparseable_lines += 1
+
+    def _add_fact(self, fact:Fact):
+        self._current_statement.facts.append(fact)
+        self.num_facts += 1
+        if self.first_fact_at is None:
+            self.first_fact_at = time.monotonic()
+
+    def _end_statement(self):
+        if self._current_statement and (self._current_statement.details or self._current_statement.facts):
+            self._current_topic.statements.append(self._current_statement)
+
+    def _end_topic(self):
+
+        self._end_statement()
+                
+        if self._current_entities:
+            self._current_topic.entities = list(self._current_entities.values())
 
-    topics = TopicCollection(topics=[])
+        if self._current_topic.entities or self._current_topic.statements:
+            self.topics.topics.append(self._current_topic)
 
-    current_topic = Topic(value=DEFAULT_TOPIC, facts=[], details=[])
-    current_statement:Statement = None
-    current_entities = {}
+    def _parse_line(self, line:str):
 
-    for line in raw_text.split('\n'):
-            
-        if not line:
-            continue
-            
         line = line.strip()
 
         if line.startswith('topic:'):
 
-            if current_statement and (current_statement.details or current_statement.facts):
-                current_topic.statements.append(current_statement)
-                    
-            if current_entities:
-                current_topic.entities = list(current_entities.values())
+            self._end_topic()
 
-            if current_topic.entities or current_topic.statements:
-                topics.topics.append(current_topic)
-
-            current_state = None
-            current_statement = None
-            current_entities = {}
+            self._current_state = None
+            self._current_statement = None
+            self._current_entities = {}
 
             topic_str = format_value(''.join(line.split(':')[1:]).strip())
             topic_str = strip_full_stop(topic_str)
 
-            current_topic = Topic(value=topic_str, facts=[], details=[])
+            self._current_topic = Topic(value=topic_str, facts=[], details=[])
+            self.consecutive_unparseable_lines = 0
                 
-            continue
-            
-        if line.startswith('proposition:'):
+        elif line.startswith('proposition:'):
 
-            if current_statement and (current_statement.details or current_statement.facts):
-                current_topic.statements.append(current_statement)
+            self._end_statement()
                 
-            current_state = None
+            self._current_state = None
 
             statement_str = format_value(''.join(line.split(':')[1:]).strip())
-            current_statement = Statement(value=statement_str, facts=[], details=[])
-                
-            continue
+            self._current_statement = Statement(value=statement_str, facts=[], details=[])
+            self.consecutive_unparseable_lines = 0
 
         elif line.startswith('entities:'):
-            current_state = 'entity-extraction'
-            continue
+            self._current_state = 'entity-extraction'
+            self.consecutive_unparseable_lines = 0
 
         elif line in ['entity-entity relationships:', 'entity-attribute relationships:']:
-            current_state = 'relationship-extraction'
-            continue
+            self._current_state = 'relationship-extraction'
+            self.consecutive_unparseable_lines = 0
 
-        elif current_state and current_state == 'entity-extraction':
+        elif self._current_state and self._current_state == 'entity-extraction':
             parts = line.split('|')
             if len(parts) == 2:
                 entity_raw_value = parts[0]
                 entity_clean_value = clean(entity_raw_value)
                 entity = Entity(value=entity_clean_value, classification=format_classification(parts[1]))
-                if entity_clean_value not in current_entities:
-                    current_entities[entity_clean_value] = entity
+                if entity_clean_value not in self._current_entities:
+                    self._current_entities[entity_clean_value] = entity
+                self.consecutive_unparseable_lines = 0
             else:
-                garbage.append(f'UNPARSEABLE ENTITY: {line}')
+                self._unparseable(f'UNPARSEABLE ENTITY: {line}')
 
-        elif current_state and current_state == 'relationship-extraction':
+        elif self._current_state and self._current_state == 'relationship-extraction':
             parts = line.split('|')
             fact = None
             if len(parts) == 3:
                 s, p, o = parts
                 if s and p and o:
-                    s_entity = current_entities.get(clean(s), None)
-                    o_entity = current_entities.get(clean(o), None)
+                    s_entity = self._current_entities.get(clean(s), None)
+                    o_entity = self._current_entities.get(clean(o), None)
                     if s_entity and o_entity:
                         fact = Fact(
                             subject=s_entity,
                             predicate=Relation(value=format_value(p)),
                             object=o_entity
                         )
-                        if current_statement:
-                            current_statement.facts.append(fact)
+                        if self._current_statement:
+                            self._add_fact(fact)
                     elif s_entity:
                         fact = Fact(
                             subject=s_entity,
                             predicate=Relation(value=format_value(p)),
                             complement=format_value(o)
                         )
-                        if current_statement:
-                            current_statement.facts.append(fact)
+                        if self._current_statement:
+                            self._add_fact(fact)
     
             if not fact:
-                if parts and current_statement:
+                if parts and self._current_statement:
                     details = ' '.join([format_value(part) for part in parts])
                     if details:
-                        current_statement.details.append(details)
-                garbage.append(f'STATEMENT DETAIL: {line}')
+                        self._current_statement.details.append(details)
+                self.garbage.append(f'STATEMENT DETAIL: {line}')
+
+            self.consecutive_unparseable_lines = 0
 
         else:
-            garbage.append(f'UNPARSEABLE: {line}')
+            self._unparseable(f'UNPARSEABLE: {line}')
+
+    def feed(self, text:str) -> List[Topic]:
+        """Parses the complete lines in text (together with any incomplete line from the previous piece), and returns the topics completed."""
+
+        num_topics = len(self.topics.topics)
 
-    if current_topic:
-        if current_statement and (current_statement.details or current_statement.facts):
-            current_topic.statements.append(current_statement)
-                    
-        if current_entities:
-            current_topic.entities = list(current_entities.values())
+        lines = (self._buffer + text).split('\n')
+        self._buffer = lines.pop()
 
-        if current_topic.entities or current_topic.statements:
-            topics.topics.append(current_topic)
+        for line in lines:
+            if line:
+                self._parse_line(line)
 
-    return (topics, garbage)
\ No newline at end of file
+        return self.topics.topics[num_topics:]
+
+    def close(self) -> Tuple[TopicCollection, List[str]]:
+        """Parses any remaining text, completes the last topic, and returns the parsed topics and unparseable lines."""
+
+        if self._buffer:
+            self._parse_line(self._buffer)
+            self._buffer = ''
+
+        if self._current_topic:
+            self._end_topic()
+            self._current_topic = None
+
+        return (self.topics, self.garbage)
+
+def parse_extracted_topics(raw_text:str) -> Tuple[TopicCollection, List[str]]:
+    parser = TopicParser()
+    parser.feed(raw_text)
+    return parser.close()
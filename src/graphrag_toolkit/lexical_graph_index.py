@@ -4,6 +4,7 @@
 from typing import List, Optional, Union, Any
 from pipe import Pipe
 
+from graphrag_toolkit.config import GraphRAGConfig
 from graphrag_toolkit.storage import GraphStoreFactory, GraphStoreType
 from graphrag_toolkit.storage import VectorStoreFactory, VectorStoreType
 from graphrag_toolkit.storage.graph_store import DummyGraphStore
@@ -34,18 +35,22 @@ class ExtractionConfig():
     def __init__(self, 
                  enable_proposition_extraction:bool=True,
                  preferred_entity_classifications:List[str]=DEFAULT_ENTITY_CLASSIFICATIONS,
-                 infer_entity_classifications:Union[InferClassificationsConfig, bool]=False):
+                 infer_entity_classifications:Union[InferClassificationsConfig, bool]=False,
+                 stream_topic_extraction:bool=False):
         
         self.enable_proposition_extraction = enable_proposition_extraction
         self.preferred_entity_classifications = preferred_entity_classifications
         self.infer_entity_classifications = infer_entity_classifications
+        self.stream_topic_extraction = stream_topic_extraction
 
 class BuildConfig():
     def __init__(self,
                  filter:Optional[BuildFilter]=None,
-                 include_domain_labels:Optional[bool]=None):
+                 include_domain_labels:Optional[bool]=None,
+                 statement_index_path:Optional[str]=None):
         self.filter = filter
         self.include_domain_labels = include_domain_labels
+        self.statement_index_path = statement_index_path
         
 class IndexingConfig():
     def __init__(self,
@@ -182,7 +187,8 @@ class LexicalGraphIndex():
             topic_extractor = TopicExtractor(
                 source_metadata_field=PROPOSITIONS_KEY if config.extraction.enable_proposition_extraction else None,
                 entity_classification_provider=entity_classification_provider,
-                topic_provider=topic_provider
+                topic_provider=topic_provider,
+                streaming=config.extraction.stream_topic_extraction
             )
 
         components.append(topic_extractor)
@@ -264,9 +270,12 @@ class LexicalGraphIndex():
         ```
         """
 
+        if GraphRAGConfig.create_graph_indexes:
+            self.graph_store.ensure_schema()
+
         build_pipeline = BuildPipeline.create(
             components=[
-                GraphConstruction.for_graph_store(self.graph_store),
+                GraphConstruction.for_graph_store(self.graph_store, statement_index_path=self.indexing_config.build.statement_index_path),
                 VectorIndexing.for_vector_store(self.vector_store)
             ],
             show_progress=show_progress,
@@ -278,6 +287,9 @@ class LexicalGraphIndex():
 
         sink_fn = sink if not handler else Pipe(handler.accept)
         nodes | build_pipeline | sink_fn
+
+        # Invalidates retriever results and answers cached against earlier versions of the data
+        self.graph_store.index_generation().increment()
         
     def extract_and_build(
             self, 
@@ -312,9 +324,12 @@ class LexicalGraphIndex():
             **kwargs
         )
         
+        if GraphRAGConfig.create_graph_indexes:
+            self.graph_store.ensure_schema()
+
         build_pipeline = BuildPipeline.create(
             components=[
-                GraphConstruction.for_graph_store(self.graph_store),
+                GraphConstruction.for_graph_store(self.graph_store, statement_index_path=self.indexing_config.build.statement_index_path),
                 VectorIndexing.for_vector_store(self.vector_store)
             ],
             show_progress=show_progress,
@@ -325,4 +340,7 @@ class LexicalGraphIndex():
         )
 
         sink_fn = sink if not handler else Pipe(handler.accept)
-        nodes | extraction_pipeline | build_pipeline | sink_fn
\ No newline at end of file
+        nodes | extraction_pipeline | build_pipeline | sink_fn
+
+        # Invalidates retriever results and answers cached against earlier versions of the data
+        self.graph_store.index_generation().increment()
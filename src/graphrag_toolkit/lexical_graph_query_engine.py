@@ -3,21 +3,33 @@
         
 import json
 import yaml
+import inspect
 import logging
 import time
+import functools
+from hashlib import sha256
 from json2xml import json2xml
-from typing import Optional, List, Type, Union
+from typing import Any, Dict, Optional, List, Tuple, Type, Union
 
 from graphrag_toolkit.config import GraphRAGConfig
 from graphrag_toolkit.utils import LLMCache, LLMCacheType
+from graphrag_toolkit.utils.tracing import trace_span, traced
+from graphrag_toolkit.utils.query_executor import QueryExecutor, DEFAULT_QUERY_EXECUTOR, use_query_executor
 from graphrag_toolkit.retrieval.prompts import ANSWER_QUESTION_SYSTEM_PROMPT, ANSWER_QUESTION_USER_PROMPT
 from graphrag_toolkit.retrieval.post_processors.bedrock_context_format import BedrockContextFormat
+from graphrag_toolkit.retrieval.post_processors import RerankerRegistry
 from graphrag_toolkit.retrieval.retrievers import CompositeTraversalBasedRetriever, SemanticGuidedRetriever
 from graphrag_toolkit.retrieval.retrievers import StatementCosineSimilaritySearch, KeywordRankingSearch, SemanticBeamGraphSearch
 from graphrag_toolkit.retrieval.retrievers import WeightedTraversalBasedRetrieverType, SemanticGuidedRetrieverType
 from graphrag_toolkit.storage import GraphStoreFactory, GraphStoreType
 from graphrag_toolkit.storage import VectorStoreFactory, VectorStoreType
-from graphrag_toolkit.storage.vector_index import to_embedded_query
+from graphrag_toolkit.storage.vector_index import to_embedded_query, to_aembedded_query, to_aembedded_queries
+from graphrag_toolkit.storage.query_coalescing import QueryCoalescer
+from graphrag_toolkit.retrieval.utils.async_utils import gather_with_concurrency
+from graphrag_toolkit.retrieval.utils.answer_cache import AnswerCache, CachedAnswer
+from graphrag_toolkit.retrieval.utils.context_packer import ContextPacker
+from graphrag_toolkit.retrieval.utils.result_cache import resolve_index_generation
+from graphrag_toolkit.retrieval.utils.search_result_nodes import formatted_search_result_dict_from, materialize_nodes, supports_search_result_nodes
 
 from llama_index.core import ChatPromptTemplate
 from llama_index.core.llms import ChatMessage, MessageRole
@@ -27,13 +39,29 @@ from llama_index.core.base.base_retriever import BaseRetriever
 from llama_index.core.postprocessor.types import BaseNodePostprocessor
 from llama_index.core.callbacks.base import CallbackManager
 from llama_index.core.base.response.schema import RESPONSE_TYPE
-from llama_index.core.base.response.schema import Response
+from llama_index.core.base.response.schema import Response, StreamingResponse, AsyncStreamingResponse
 from llama_index.core.prompts.mixin import PromptDictType, PromptMixinType
+from llama_index.core.async_utils import asyncio_run
 
 logger = logging.getLogger(__name__)
 
 RetrieverType = Union[BaseRetriever, Type[BaseRetriever]]
 PostProcessorsType = Union[BaseNodePostprocessor, List[BaseNodePostprocessor]]
+QueryBundleType = Union[str, QueryBundle]
+
+DEFAULT_BATCH_CONCURRENCY = 10
+
+def with_query_executor(fn):
+    # Graph, vector, embedding and LLM requests issued by the decorated method run on the engine's executor
+    @functools.wraps(fn)
+    async def async_wrapper(self, *args, **kwargs):
+        with use_query_executor(self.query_executor):
+            return await fn(self, *args, **kwargs)
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        with use_query_executor(self.query_executor):
+            return fn(self, *args, **kwargs)
+    return async_wrapper if inspect.iscoroutinefunction(fn) else wrapper
 
 class LexicalGraphQueryEngine(BaseQueryEngine):
 
@@ -48,7 +76,7 @@ class LexicalGraphQueryEngine(BaseQueryEngine):
             graph_store, 
             vector_store, 
             retrievers=retrievers,
-            **kwargs
+            **(kwargs | {'serialize_results': False})
         )
         
         return LexicalGraphQueryEngine(
@@ -76,7 +104,8 @@ class LexicalGraphQueryEngine(BaseQueryEngine):
             KeywordRankingSearch(
                 vector_store=vector_store,
                 graph_store=graph_store,
-                max_keywords=10
+                max_keywords=10,
+                keyword_cache=kwargs.get('keyword_cache')
             ),
             SemanticBeamGraphSearch(
                 vector_store=vector_store,
@@ -117,8 +146,27 @@ class LexicalGraphQueryEngine(BaseQueryEngine):
         
         graph_store = GraphStoreFactory.for_graph_store(graph_store)
         vector_store = VectorStoreFactory.for_vector_store(vector_store)
+
+        if GraphRAGConfig.create_graph_indexes:
+            graph_store.ensure_schema()
         
         self.context_format = kwargs.get('context_format', 'json')
+        self.streaming = kwargs.get('streaming', False)
+
+        # Opt-in: answers are reused for the same tenant and index generation (a value, or a 
+        # callable returning the current value; defaults to the generation recorded in the graph)
+        self.answer_cache:Optional[AnswerCache] = kwargs.get('answer_cache', None)
+        self.tenant_id = kwargs.get('tenant_id', None)
+        self.index_generation = kwargs.get('index_generation', None)
+        self.graph_store = graph_store
+        self._answer_cache_namespace = None
+
+        # Opt-in: statements, topics and sources are packed into a token budget for the answer context
+        context_token_budget = kwargs.get('context_token_budget', None)
+        self.context_packer = ContextPacker(context_token_budget) if context_token_budget else None
+
+        # Blocking store, embedding and LLM requests share a bounded, stage-limited thread pool
+        self.query_executor:QueryExecutor = kwargs.get('query_executor', None) or DEFAULT_QUERY_EXECUTOR
         
         self.llm = llm if llm and isinstance(llm, LLMCache) else LLMCache(
             llm=llm or GraphRAGConfig.response_llm,
@@ -129,13 +177,20 @@ class LexicalGraphQueryEngine(BaseQueryEngine):
             ChatMessage(role=MessageRole.USER, content=user_prompt),
         ])
 
+        # Retrievers created by the engine pass search results to post-processors as objects; 
+        # the engine serializes them once, before returning results
+        retriever_kwargs = kwargs | {'serialize_results': False}
+
         if retriever:
             if isinstance(retriever, BaseRetriever):
                 self.retriever = retriever
             else:
-                self.retriever = retriever(graph_store, vector_store, **kwargs)
+                self.retriever = retriever(graph_store, vector_store, **retriever_kwargs)
         else:
-            self.retriever = CompositeTraversalBasedRetriever(graph_store, vector_store, **kwargs)
+            self.retriever = CompositeTraversalBasedRetriever(graph_store, vector_store, **retriever_kwargs)
+
+        if str(kwargs.get('reranker', '')).lower() == 'model':
+            RerankerRegistry.warm(GraphRAGConfig.reranking_model)
 
         if post_processors:
             self.post_processors = post_processors if isinstance(post_processors, list) else [post_processors]
@@ -152,6 +207,93 @@ class LexicalGraphQueryEngine(BaseQueryEngine):
 
         super().__init__(callback_manager)
 
+    @property
+    def answer_cache_namespace(self) -> str:
+        if self._answer_cache_namespace is None:
+            self._answer_cache_namespace = sha256('\n'.join([
+                self.llm.llm.to_json(),
+                *[str(m.content) for m in self.chat_template.message_templates],
+                self.context_format,
+                type(self.retriever).__name__,
+                ','.join(type(p).__name__ for p in self.post_processors),
+                str(self.context_packer)
+            ]).encode('utf-8')).hexdigest()
+        return self._answer_cache_namespace
+
+    def _answer_cache_partition(self):
+        index_generation = resolve_index_generation(self.index_generation, self.graph_store)
+        return (self.answer_cache_namespace, self.tenant_id, index_generation)
+
+    def _get_cached_answer(self, query_bundle:QueryBundle) -> Optional[CachedAnswer]:
+        if self.answer_cache is None:
+            return None
+        with trace_span('answer_cache'):
+            return self.answer_cache.get(query_bundle.query_str, query_bundle.embedding, self._answer_cache_partition())
+
+    def _cache_answer(self, query_bundle:QueryBundle, results:List[NodeWithScore], metadata, answer:str):
+        if self.answer_cache is None:
+            return
+        metadata['answer_cache'] = {'hit': False}
+        self.answer_cache.put(
+            query_bundle.query_str, 
+            query_bundle.embedding, 
+            self._answer_cache_partition(), 
+            answer, 
+            results, 
+            {k:v for k,v in metadata.items() if k != 'answer_cache'}
+        )
+
+    def _to_cached_metadata(self, query_bundle:QueryBundle, cached_answer:CachedAnswer, start):
+        
+        metadata = cached_answer.metadata
+        
+        metadata.update({
+            'query': query_bundle.query_str,
+            'retrieve_ms': 0.0,
+            'postprocessing_ms': 0.0,
+            'answer_ms': 0.0,
+            'total_ms': (time.time()-start) * 1000,
+            'answer_cache': {
+                'hit': True,
+                'similarity': cached_answer.similarity,
+                'cached_query': cached_answer.query_str,
+                'cached_at': cached_answer.cached_at
+            }
+        })
+
+        return metadata
+
+    def _to_cached_response(self, query_bundle:QueryBundle, cached_answer:CachedAnswer, start) -> RESPONSE_TYPE:
+
+        metadata = self._to_cached_metadata(query_bundle, cached_answer, start)
+        
+        if self.streaming:
+            return StreamingResponse(
+                response_gen=iter([cached_answer.answer]),
+                source_nodes=cached_answer.source_nodes,
+                metadata=metadata
+            )
+        
+        return Response(
+            response=cached_answer.answer,
+            source_nodes=cached_answer.source_nodes,
+            metadata=metadata
+        )
+    
+    def _to_async_cached_response(self, query_bundle:QueryBundle, cached_answer:CachedAnswer, start) -> RESPONSE_TYPE:
+
+        if not self.streaming:
+            return self._to_cached_response(query_bundle, cached_answer, start)
+
+        async def response_gen():
+            yield cached_answer.answer
+
+        return AsyncStreamingResponse(
+            response_gen=response_gen(),
+            source_nodes=cached_answer.source_nodes,
+            metadata=self._to_cached_metadata(query_bundle, cached_answer, start)
+        )
+
     def _generate_response(
         self, 
         query_bundle: QueryBundle, 
@@ -168,21 +310,50 @@ class LexicalGraphQueryEngine(BaseQueryEngine):
             logger.exception(f'Error answering query [query: {query_bundle.query_str}, context: {context}]')
             raise
             
+    async def _agenerate_response(
+        self, 
+        query_bundle: QueryBundle, 
+        context: str
+    ) -> str:
+        try:
+            response = await self.llm.apredict(
+                prompt=self.chat_template,
+                query=query_bundle.query_str,
+                search_results=context
+            )
+            return response
+        except Exception:
+            logger.exception(f'Error answering query [query: {query_bundle.query_str}, context: {context}]')
+            raise
+            
     def _format_as_text(self, json_results):
         lines = []
         for json_result in json_results:
-            lines.append(f"""## {json_result['topic']}""")
-            lines.append(' '.join([s for s in json_result['statements']]))
+            # Results merged by the context packer may carry several topics from the same source
+            for topic in json_result.get('topics') or [json_result]:
+                lines.append(f"""## {topic['topic']}""")
+                lines.append(' '.join([s for s in topic['statements']]))
             lines.append(f"""[Source: {json_result['source']}]""")
             lines.append('\n')
         return '\n'.join(lines)
+
+    def _pack_context(self, results:List[NodeWithScore]) -> Tuple[List[NodeWithScore], Optional[Dict[str, Any]]]:
+        if self.context_packer is None:
+            return results, None
+        with trace_span('context_packing'):
+            packed_context = self.context_packer.pack(results)
+        return packed_context.nodes, packed_context.report
+    
+    def _prepare_nodes_for(self, post_processor:BaseNodePostprocessor, results:List[NodeWithScore]) -> List[NodeWithScore]:
+        # Post-processors that read node text or metadata directly need serialized results
+        return results if supports_search_result_nodes(post_processor) else materialize_nodes(results)
     
     def _format_context(self, search_results:List[NodeWithScore], context_format:str='json'):
 
         if context_format == 'bedrock_xml':
             return '\n'.join([result.text for result in search_results])
         
-        json_results = [json.loads(result.text) for result in search_results]
+        json_results = [formatted_search_result_dict_from(result.node) for result in search_results]
         
         data = None
         
@@ -197,6 +368,7 @@ class LexicalGraphQueryEngine(BaseQueryEngine):
         
         return data
     
+    @with_query_executor
     def retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
 
         query_bundle = QueryBundle(query_bundle) if isinstance(query_bundle, str) else query_bundle
@@ -206,62 +378,278 @@ class LexicalGraphQueryEngine(BaseQueryEngine):
         results = self.retriever.retrieve(query_bundle)
 
         for post_processor in self.post_processors:
-            results = post_processor.postprocess_nodes(results, query_bundle)
+            results = post_processor.postprocess_nodes(self._prepare_nodes_for(post_processor, results), query_bundle)
+
+        return materialize_nodes(results)
+
+    @with_query_executor
+    async def aretrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+
+        query_bundle = QueryBundle(query_bundle) if isinstance(query_bundle, str) else query_bundle
+
+        query_bundle = await to_aembedded_query(query_bundle, GraphRAGConfig.embed_model)
+                
+        results = await self.retriever.aretrieve(query_bundle)
+
+        for post_processor in self.post_processors:
+            results = await post_processor.apostprocess_nodes(self._prepare_nodes_for(post_processor, results), query_bundle)
+
+        return materialize_nodes(results)
+
+    def retrieve_batch(self, query_bundles:List[QueryBundleType], max_concurrency:int=DEFAULT_BATCH_CONCURRENCY) -> List[List[NodeWithScore]]:
+        return asyncio_run(self.aretrieve_batch(query_bundles, max_concurrency))
+
+    @with_query_executor
+    async def aretrieve_batch(self, query_bundles:List[QueryBundleType], max_concurrency:int=DEFAULT_BATCH_CONCURRENCY) -> List[List[NodeWithScore]]:
+        """
+        Retrieves results for a batch of queries. Queries are embedded together, and identical graph, vector
+        and keyword extraction requests issued by queries in the batch are executed once. Results are returned
+        in the order of the queries.
+        """
+
+        query_bundles = await self._to_embedded_query_batch(query_bundles, max_concurrency)
+
+        with QueryCoalescer.for_batch():
+            return await gather_with_concurrency(
+                max_concurrency, 
+                *[self.aretrieve(query_bundle) for query_bundle in query_bundles]
+            )
+
+    def query_batch(self, query_bundles:List[QueryBundleType], max_concurrency:int=DEFAULT_BATCH_CONCURRENCY) -> List[RESPONSE_TYPE]:
+        return asyncio_run(self.aquery_batch(query_bundles, max_concurrency))
+
+    @with_query_executor
+    async def aquery_batch(self, query_bundles:List[QueryBundleType], max_concurrency:int=DEFAULT_BATCH_CONCURRENCY) -> List[RESPONSE_TYPE]:
+        """
+        Answers a batch of queries, sharing query embedding, keyword extraction and store reads across the
+        batch as per `aretrieve_batch()`. Responses are returned in the order of the queries.
+        """
+
+        query_bundles = await self._to_embedded_query_batch(query_bundles, max_concurrency)
+
+        with QueryCoalescer.for_batch():
+            return await gather_with_concurrency(
+                max_concurrency, 
+                *[self._aquery(query_bundle) for query_bundle in query_bundles]
+            )
 
-        return results
+    async def _to_embedded_query_batch(self, query_bundles:List[QueryBundleType], max_concurrency:int) -> List[QueryBundle]:
+
+        query_bundles = [
+            QueryBundle(query_bundle) if isinstance(query_bundle, str) else query_bundle
+            for query_bundle in query_bundles
+        ]
+
+        start = time.time()
+        
+        query_bundles = await to_aembedded_queries(query_bundles, GraphRAGConfig.embed_model, max_concurrency)
+
+        end = time.time()
+
+        logger.debug(f'Embedded query batch [num_queries: {len(query_bundles)}, duration: {(end-start) * 1000:.2f}ms]')
+
+        return query_bundles
 
  
+    @traced('query')
+    @with_query_executor
     def _query(self, query_bundle: QueryBundle) -> RESPONSE_TYPE:
 
         try:
         
             start = time.time()
 
-            query_bundle = to_embedded_query(query_bundle, GraphRAGConfig.embed_model)
+            with trace_span('embed_query'):
+                query_bundle = to_embedded_query(query_bundle, GraphRAGConfig.embed_model)
+
+            cached_answer = self._get_cached_answer(query_bundle)
+            if cached_answer:
+                return self._to_cached_response(query_bundle, cached_answer, start)
                 
             results = self.retriever.retrieve(query_bundle)
 
             end_retrieve = time.time()
 
+            context_packing = None
+
             for post_processor in self.post_processors:
-                results = post_processor.postprocess_nodes(results, query_bundle)
+                if isinstance(post_processor, BedrockContextFormat):
+                    results, context_packing = self._pack_context(results)
+                with trace_span('postprocessor', {'postprocessor': type(post_processor).__name__}):
+                    results = post_processor.postprocess_nodes(self._prepare_nodes_for(post_processor, results), query_bundle)
+
+            if context_packing is None:
+                results, context_packing = self._pack_context(results)
 
             end_postprocessing = time.time()
 
             context = self._format_context(results, self.context_format)
-            answer = self._generate_response(query_bundle, context)
+            results = materialize_nodes(results)
+
+            if self.streaming:
+                return self._to_streaming_response(query_bundle, results, context, start, end_retrieve, end_postprocessing, context_packing)
+
+            with trace_span('answer'):
+                answer = self._generate_response(query_bundle, context)
             
             end = time.time()
 
-            retrieve_ms = (end_retrieve-start) * 1000
-            postprocess_ms = (end_postprocessing - end_retrieve) * 1000
-            answer_ms = (end-end_retrieve) * 1000
-            total_ms = (end-start) * 1000
-
-            metadata = {
-                'retrieve_ms': retrieve_ms,
-                'postprocessing_ms': postprocess_ms,
-                'answer_ms': answer_ms,
-                'total_ms': total_ms,
-                'context_format': self.context_format,
-                'retriever': f'{type(self.retriever).__name__}: {self.retriever.__dict__}',
-                'query': query_bundle.query_str,
-                'postprocessors': [type(p).__name__ for p in self.post_processors],
-                'context': context,
-                'num_source_nodes': len(results)
-            }
+            return self._to_response(query_bundle, results, context, answer, start, end_retrieve, end_postprocessing, end, context_packing)
 
-            return Response(
-                response=answer,
-                source_nodes=results,
-                metadata=metadata
-            )
         except Exception as e:
             logger.exception('Error in query processing')
             raise
         
+    @traced('query')
+    @with_query_executor
     async def _aquery(self, query_bundle: QueryBundle) -> RESPONSE_TYPE:
-        pass
+
+        try:
+        
+            start = time.time()
+
+            with trace_span('embed_query'):
+                query_bundle = await to_aembedded_query(query_bundle, GraphRAGConfig.embed_model)
+
+            cached_answer = self._get_cached_answer(query_bundle)
+            if cached_answer:
+                return self._to_async_cached_response(query_bundle, cached_answer, start)
+                
+            results = await self.retriever.aretrieve(query_bundle)
+
+            end_retrieve = time.time()
+
+            context_packing = None
+
+            for post_processor in self.post_processors:
+                if isinstance(post_processor, BedrockContextFormat):
+                    results, context_packing = self._pack_context(results)
+                with trace_span('postprocessor', {'postprocessor': type(post_processor).__name__}):
+                    results = await post_processor.apostprocess_nodes(self._prepare_nodes_for(post_processor, results), query_bundle)
+
+            if context_packing is None:
+                results, context_packing = self._pack_context(results)
+
+            end_postprocessing = time.time()
+
+            context = self._format_context(results, self.context_format)
+            results = materialize_nodes(results)
+
+            if self.streaming:
+                return self._to_async_streaming_response(query_bundle, results, context, start, end_retrieve, end_postprocessing, context_packing)
+
+            with trace_span('answer'):
+                answer = await self._agenerate_response(query_bundle, context)
+            
+            end = time.time()
+
+            return self._to_response(query_bundle, results, context, answer, start, end_retrieve, end_postprocessing, end, context_packing)
+
+        except Exception as e:
+            logger.exception('Error in query processing')
+            raise
+
+    def _to_metadata(self, query_bundle, results, context, start, end_retrieve, end_postprocessing, context_packing=None):
+
+        retrieve_ms = (end_retrieve-start) * 1000
+        postprocess_ms = (end_postprocessing - end_retrieve) * 1000
+
+        metadata = {
+            'retrieve_ms': retrieve_ms,
+            'postprocessing_ms': postprocess_ms,
+            'context_format': self.context_format,
+            'retriever': f'{type(self.retriever).__name__}: {self.retriever.__dict__}',
+            'query': query_bundle.query_str,
+            'postprocessors': [type(p).__name__ for p in self.post_processors],
+            'context': context,
+            'num_source_nodes': len(results)
+        }
+
+        if context_packing is not None:
+            # used_tokens is the packer's estimate; context_tokens counts the formatted context
+            metadata['context_packing'] = context_packing | {'context_tokens': self.context_packer.count_tokens(context)}
+
+        return metadata
+
+    def _add_answer_timings(self, metadata, start, end_retrieve, end):
+
+        answer_ms = (end-end_retrieve) * 1000
+        total_ms = (end-start) * 1000
+
+        metadata['answer_ms'] = answer_ms
+        metadata['total_ms'] = total_ms
+
+    def _to_response(self, query_bundle, results, context, answer, start, end_retrieve, end_postprocessing, end, context_packing=None) -> Response:
+
+        metadata = self._to_metadata(query_bundle, results, context, start, end_retrieve, end_postprocessing, context_packing)
+        self._add_answer_timings(metadata, start, end_retrieve, end)
+        self._cache_answer(query_bundle, results, metadata, answer)
+
+        return Response(
+            response=answer,
+            source_nodes=results,
+            metadata=metadata
+        )
+
+    def _to_streaming_response(self, query_bundle, results, context, start, end_retrieve, end_postprocessing, context_packing=None) -> StreamingResponse:
+
+        # first_token_ms, answer_ms and total_ms are added to the metadata as the stream is consumed
+
+        metadata = self._to_metadata(query_bundle, results, context, start, end_retrieve, end_postprocessing, context_packing)
+
+        def response_gen():
+            answer_tokens = []
+            try:
+                tokens = self.llm.stream(
+                    prompt=self.chat_template,
+                    query=query_bundle.query_str,
+                    search_results=context
+                )
+                for token in tokens:
+                    if 'first_token_ms' not in metadata:
+                        metadata['first_token_ms'] = (time.time()-start) * 1000
+                    answer_tokens.append(token)
+                    yield token
+            except Exception:
+                logger.exception(f'Error answering query [query: {query_bundle.query_str}, context: {context}]')
+                raise
+            self._add_answer_timings(metadata, start, end_retrieve, time.time())
+            self._cache_answer(query_bundle, results, metadata, ''.join(answer_tokens))
+
+        return StreamingResponse(
+            response_gen=response_gen(),
+            source_nodes=results,
+            metadata=metadata
+        )
+
+    def _to_async_streaming_response(self, query_bundle, results, context, start, end_retrieve, end_postprocessing, context_packing=None) -> AsyncStreamingResponse:
+
+        metadata = self._to_metadata(query_bundle, results, context, start, end_retrieve, end_postprocessing, context_packing)
+
+        async def response_gen():
+            answer_tokens = []
+            try:
+                tokens = self.llm.astream(
+                    prompt=self.chat_template,
+                    query=query_bundle.query_str,
+                    search_results=context
+                )
+                async for token in tokens:
+                    if 'first_token_ms' not in metadata:
+                        metadata['first_token_ms'] = (time.time()-start) * 1000
+                    answer_tokens.append(token)
+                    yield token
+            except Exception:
+                logger.exception(f'Error answering query [query: {query_bundle.query_str}, context: {context}]')
+                raise
+            self._add_answer_timings(metadata, start, end_retrieve, time.time())
+            self._cache_answer(query_bundle, results, metadata, ''.join(answer_tokens))
+
+        return AsyncStreamingResponse(
+            response_gen=response_gen(),
+            source_nodes=results,
+            metadata=metadata
+        )
         
     def _get_prompts(self) -> PromptDictType:
         pass
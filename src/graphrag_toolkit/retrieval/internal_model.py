@@ -0,0 +1,258 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from graphrag_toolkit.retrieval import model
+from graphrag_toolkit.retrieval.model import ScoredEntity
+
+# Lightweight equivalents of the models in graphrag_toolkit.retrieval.model, used by
+# retrievers and processors while processing search results. Instances are not validated,
+# and are copied field by field; they are converted to the pydantic models only when
+# results are handed to application code. to_dict() produces the same output as
+# model_dump(exclude_none=True, exclude_defaults=True) on the equivalent model.
+
+def _put(d:Dict[str, Any], key:str, value:Any):
+    if value is not None and value != [] and value != {}:
+        d[key] = value
+
+@dataclass(slots=True)
+class Statement():
+    statement:str
+    statementId:Optional[str]=None
+    facts:List[str]=field(default_factory=list)
+    details:Optional[str]=None
+    chunkId:Optional[str]=None
+    score:Optional[float]=None
+    statement_str:Optional[str]=None
+
+    @staticmethod
+    def from_dict(d:Dict[str, Any]) -> 'Statement':
+        return Statement(
+            d['statement'],
+            d.get('statementId'),
+            list(d.get('facts') or ()),
+            d.get('details'),
+            d.get('chunkId'),
+            d.get('score'),
+            d.get('statement_str')
+        )
+
+    def copy(self) -> 'Statement':
+        return Statement(
+            self.statement,
+            self.statementId,
+            list(self.facts),
+            self.details,
+            self.chunkId,
+            self.score,
+            self.statement_str
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {}
+        _put(d, 'statementId', self.statementId)
+        _put(d, 'statement', self.statement)
+        _put(d, 'facts', self.facts)
+        _put(d, 'details', self.details)
+        _put(d, 'chunkId', self.chunkId)
+        _put(d, 'score', self.score)
+        _put(d, 'statement_str', self.statement_str)
+        return d
+
+StatementType = Union[Statement, str]
+
+def _statement_from(s:Union[Dict[str, Any], str]) -> StatementType:
+    return s if isinstance(s, str) else Statement.from_dict(s)
+
+def _copy_statement(s:StatementType) -> StatementType:
+    return s if isinstance(s, str) else s.copy()
+
+def _statement_to_dict(s:StatementType) -> Union[Dict[str, Any], str]:
+    return s if isinstance(s, str) else s.to_dict()
+
+@dataclass(slots=True)
+class Chunk():
+    chunkId:str
+    value:Optional[str]=None
+    score:Optional[float]=None
+
+    @staticmethod
+    def from_dict(d:Dict[str, Any]) -> 'Chunk':
+        return Chunk(d['chunkId'], d.get('value'), d.get('score'))
+
+    def copy(self) -> 'Chunk':
+        return Chunk(self.chunkId, self.value, self.score)
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {}
+        _put(d, 'chunkId', self.chunkId)
+        _put(d, 'value', self.value)
+        _put(d, 'score', self.score)
+        return d
+
+@dataclass(slots=True)
+class Topic():
+    topic:str
+    chunks:List[Chunk]=field(default_factory=list)
+    statements:List[StatementType]=field(default_factory=list)
+
+    @staticmethod
+    def from_dict(d:Dict[str, Any]) -> 'Topic':
+        return Topic(
+            topic=d['topic'],
+            chunks=[Chunk.from_dict(c) for c in d.get('chunks') or ()],
+            statements=[_statement_from(s) for s in d.get('statements') or ()]
+        )
+
+    def copy(self) -> 'Topic':
+        return Topic(
+            topic=self.topic,
+            chunks=[c.copy() for c in self.chunks],
+            statements=[_copy_statement(s) for s in self.statements]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {}
+        _put(d, 'topic', self.topic)
+        _put(d, 'chunks', [c.to_dict() for c in self.chunks])
+        _put(d, 'statements', [_statement_to_dict(s) for s in self.statements])
+        return d
+
+@dataclass(slots=True)
+class Source():
+    sourceId:str
+    metadata:Dict[str, str]=field(default_factory=dict)
+
+    @staticmethod
+    def from_dict(d:Dict[str, Any]) -> 'Source':
+        return Source(sourceId=d['sourceId'], metadata=dict(d.get('metadata') or {}))
+
+    def copy(self) -> 'Source':
+        return Source(sourceId=self.sourceId, metadata=dict(self.metadata))
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {}
+        _put(d, 'sourceId', self.sourceId)
+        _put(d, 'metadata', self.metadata)
+        return d
+
+SourceType = Union[str, Source]
+
+@dataclass(slots=True)
+class SearchResult():
+    source:SourceType
+    topics:List[Topic]=field(default_factory=list)
+    topic:Optional[str]=None
+    statements:List[StatementType]=field(default_factory=list)
+    score:Optional[float]=None
+
+    @staticmethod
+    def from_dict(d:Dict[str, Any]) -> 'SearchResult':
+        source = d['source']
+        return SearchResult(
+            source=source if isinstance(source, str) else Source.from_dict(source),
+            topics=[Topic.from_dict(t) for t in d.get('topics') or ()],
+            topic=d.get('topic'),
+            statements=[_statement_from(s) for s in d.get('statements') or ()],
+            score=d.get('score')
+        )
+
+    @staticmethod
+    def from_model(search_result:model.SearchResult) -> 'SearchResult':
+        return SearchResult.from_dict(search_result.model_dump())
+
+    def copy(self) -> 'SearchResult':
+        return SearchResult(
+            source=self.source if isinstance(self.source, str) else self.source.copy(),
+            topics=[t.copy() for t in self.topics],
+            topic=self.topic,
+            statements=[_copy_statement(s) for s in self.statements],
+            score=self.score
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {}
+        _put(d, 'source', self.source if isinstance(self.source, str) else self.source.to_dict())
+        _put(d, 'topics', [t.to_dict() for t in self.topics])
+        _put(d, 'topic', self.topic)
+        _put(d, 'statements', [_statement_to_dict(s) for s in self.statements])
+        _put(d, 'score', self.score)
+        return d
+
+    def to_json(self, indent:Optional[int]=2) -> str:
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+
+    def to_model(self) -> model.SearchResult:
+        return model.SearchResult.model_validate(self.to_dict())
+
+@dataclass(slots=True)
+class SearchResultCollection():
+    results:List[SearchResult]=field(default_factory=list)
+    entities:List[ScoredEntity]=field(default_factory=list)
+    _entity_index:Optional[Tuple[List[ScoredEntity], int, Dict[str, int]]]=field(default=None, repr=False, compare=False)
+
+    @staticmethod
+    def from_model(search_results:model.SearchResultCollection) -> 'SearchResultCollection':
+        return SearchResultCollection(
+            results=[SearchResult.from_model(r) for r in search_results.results],
+            entities=list(search_results.entities)
+        )
+
+    def add_search_result(self, result:SearchResult):
+        self.results.append(result)
+
+    def _entity_positions(self) -> Dict[str, int]:
+        # Maps entity ids to their positions in the entities list. The index is kept between calls,
+        # and rebuilt only if the entities list has been replaced or modified elsewhere
+        if self.entities is None:
+            self.entities = []
+        if self._entity_index is None or self._entity_index[0] is not self.entities or self._entity_index[1] != len(self.entities):
+            positions = {}
+            for i, x in enumerate(self.entities):
+                positions.setdefault(x.entity.entityId, i)
+            self._entity_index = (self.entities, len(self.entities), positions)
+        return self._entity_index[2]
+
+    def add_entity(self, entity:ScoredEntity):
+        """Adds an entity, accumulating its score if the entity is already in the collection."""
+        positions = self._entity_positions()
+        position = positions.get(entity.entity.entityId)
+        if position is not None:
+            self.entities[position].score += entity.score
+        else:
+            positions[entity.entity.entityId] = len(self.entities)
+            self.entities.append(entity)
+            self._entity_index = (self.entities, len(self.entities), positions)
+
+    def add_entities(self, entities:List[ScoredEntity]):
+        """Adds entities, accumulating the scores of entities already in the collection."""
+        for entity in entities:
+            self.add_entity(entity)
+
+    def with_new_results(self, results:List[SearchResult]):
+        self.results = results
+        return self
+
+    def copy(self) -> 'SearchResultCollection':
+        return SearchResultCollection(
+            results=[r.copy() for r in self.results],
+            entities=list(self.entities)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {}
+        _put(d, 'results', [r.to_dict() for r in self.results])
+        _put(d, 'entities', [e.model_dump(exclude_none=True, exclude_defaults=True) for e in self.entities])
+        return d
+
+    def to_json(self, indent:Optional[int]=2) -> str:
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+
+    def to_model(self) -> model.SearchResultCollection:
+        return model.SearchResultCollection(
+            results=[r.to_model() for r in self.results],
+            entities=list(self.entities)
+        )
@@ -1,8 +1,8 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-from pydantic import BaseModel, ConfigDict, Field, AliasChoices
-from typing import List, Optional, Union, Dict
+from pydantic import BaseModel, ConfigDict, Field, AliasChoices, PrivateAttr
+from typing import List, Optional, Union, Dict, Tuple
 
 class Statement(BaseModel):
     model_config = ConfigDict(strict=True)
@@ -68,17 +68,38 @@ class SearchResultCollection(BaseModel):
     results: List[SearchResult]=[]
     entities: List[ScoredEntity]=[]
 
+    _entity_index:Optional[Tuple[List[ScoredEntity], int, Dict[str, int]]] = PrivateAttr(default=None)
+
     def add_search_result(self, result:SearchResult):
         self.results.append(result)
 
-    def add_entity(self, entity:ScoredEntity):
+    def _entity_positions(self) -> Dict[str, int]:
+        # Maps entity ids to their positions in the entities list. The index is kept between calls,
+        # and rebuilt only if the entities list has been replaced or modified elsewhere
         if self.entities is None:
             self.entities = []
-        existing_entity = next((x for x in self.entities if x.entity.entityId == entity.entity), None)
-        if existing_entity:
-            existing_entity.score += entity.score
+        if self._entity_index is None or self._entity_index[0] is not self.entities or self._entity_index[1] != len(self.entities):
+            positions = {}
+            for i, x in enumerate(self.entities):
+                positions.setdefault(x.entity.entityId, i)
+            self._entity_index = (self.entities, len(self.entities), positions)
+        return self._entity_index[2]
+
+    def add_entity(self, entity:ScoredEntity):
+        """Adds an entity, accumulating its score if the entity is already in the collection."""
+        positions = self._entity_positions()
+        position = positions.get(entity.entity.entityId)
+        if position is not None:
+            self.entities[position].score += entity.score
         else:
+            positions[entity.entity.entityId] = len(self.entities)
             self.entities.append(entity)
+            self._entity_index = (self.entities, len(self.entities), positions)
+
+    def add_entities(self, entities:List[ScoredEntity]):
+        """Adds entities, accumulating the scores of entities already in the collection."""
+        for entity in entities:
+            self.add_entity(entity)
 
     def with_new_results(self, results:List[SearchResult]):
         self.results = results
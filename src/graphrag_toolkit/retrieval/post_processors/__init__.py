@@ -6,5 +6,6 @@ from .reranker_mixin import RerankerMixin
 from .enrich_source_details import EnrichSourceDetails
 from .bedrock_context_format import BedrockContextFormat
 from .sentence_reranker import SentenceReranker
+from .reranker_registry import RerankerRegistry
 from .statement_diversity import StatementDiversityPostProcessor
 from .statement_enhancement import StatementEnhancementPostProcessor
\ No newline at end of file
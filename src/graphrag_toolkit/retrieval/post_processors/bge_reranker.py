@@ -3,7 +3,7 @@
 
 import torch
 import logging
-from typing import List, Optional, Any, Tuple
+from typing import List, Optional, Any, Tuple, Dict
 from pydantic import ConfigDict, Field
 
 from graphrag_toolkit.retrieval.post_processors.reranker_mixin import RerankerMixin
@@ -73,6 +73,9 @@ class BGEReranker(BaseNodePostprocessor, RerankerMixin):
     @property
     def batch_size(self):
         return self.batch_size_internal
+
+    def cache_fingerprint(self) -> Dict[str, Any]:
+        return {'type': type(self).__qualname__, 'model_name': self.model_name}
     
     def rerank_pairs(
         self,
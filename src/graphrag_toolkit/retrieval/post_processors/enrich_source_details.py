@@ -2,9 +2,10 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from string import Template
-from typing import Optional, List, Union, Dict, Any, Callable
+from typing import Optional, List, Union, Dict, Any, Callable, ClassVar
 
-from graphrag_toolkit.retrieval.model import SearchResult
+from graphrag_toolkit.retrieval.internal_model import Source
+from graphrag_toolkit.retrieval.utils.search_result_nodes import SearchResultNode, internal_search_result_from, internal_formatted_search_result_from
 
 from llama_index.core.postprocessor.types import BaseNodePostprocessor
 from llama_index.core.schema import NodeWithScore, QueryBundle
@@ -28,6 +29,8 @@ def source_info_keys(keys:List[str]) -> Callable[[Dict[str, Any]], str]:
 
 class EnrichSourceDetails(BaseNodePostprocessor):
 
+    supports_search_result_nodes:ClassVar[bool] = True
+
     source_info_accessor:SourceInfoAccessorType=None
 
     @classmethod
@@ -62,12 +65,20 @@ class EnrichSourceDetails(BaseNodePostprocessor):
     ) -> List[NodeWithScore]:
         
         for node in nodes:
-            search_result = SearchResult.model_validate_json(node.node.text)
-            source_metadata = node.metadata.get('source', {}).get('metadata', {})
+            source = internal_search_result_from(node.node).source if isinstance(node.node, SearchResultNode) else None
+            if isinstance(source, Source):
+                source_id, source_metadata = source.sourceId, source.metadata
+            else:
+                source_id = node.metadata.get('source', {}).get('sourceId')
+                source_metadata = node.metadata.get('source', {}).get('metadata', {})
             if source_metadata:
-                source_info = self._get_source_info(source_metadata, search_result.source.sourceId)
+                search_result = internal_formatted_search_result_from(node.node)
+                source_info = self._get_source_info(source_metadata, source_id)
                 search_result.source = str(source_info)
-                node.node.text = search_result.model_dump_json(exclude_none=True, exclude_defaults=True, indent=2)
+                if isinstance(node.node, SearchResultNode):
+                    node.node.set_formatted_search_result(search_result)
+                else:
+                    node.node.text = search_result.to_json(indent=2)
 
         return nodes
 
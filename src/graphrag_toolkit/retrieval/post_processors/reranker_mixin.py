@@ -2,7 +2,9 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
+
+from graphrag_toolkit.retrieval.utils.result_cache import settings_fingerprint
 
 from llama_index.core.postprocessor.types import BaseNodePostprocessor
 from llama_index.core.schema import NodeWithScore, QueryBundle
@@ -17,3 +19,7 @@ class RerankerMixin(ABC):
     @abstractmethod
     def rerank_pairs(self, pairs: List[Tuple[str, str]], batch_size: int = 128) -> List[float]:
         pass
+
+    def cache_fingerprint(self) -> Dict[str, Any]:
+        """Returns the settings that determine this reranker's scores, for use in retriever result cache keys."""
+        return settings_fingerprint(self)
@@ -0,0 +1,123 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Tuple, Optional
+
+from graphrag_toolkit.config import GraphRAGConfig
+from graphrag_toolkit.utils.tracing import trace_span
+from graphrag_toolkit.retrieval.post_processors.sentence_reranker import SentenceReranker
+
+logger = logging.getLogger(__name__)
+
+class _MicroBatcher():
+    """
+    Serializes scoring requests for a single reranker through one worker thread. Pending requests
+    are combined into a single forward pass, which is flushed once `max_batch_size` pairs have
+    accumulated or `max_wait_ms` has elapsed since the first request in the batch arrived.
+    """
+
+    def __init__(self, reranker:SentenceReranker, max_batch_size:int, max_wait_ms:int):
+        self.reranker = reranker
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True, name=f'reranker-{reranker.model}')
+        self._worker.start()
+
+    def submit(self, pairs:List[Tuple[str, str]]) -> Future:
+        future = Future()
+        if not pairs:
+            future.set_result([])
+        else:
+            self._queue.put((pairs, future))
+        return future
+
+    def _next_batch(self):
+
+        batch = [self._queue.get()]
+        num_pairs = len(batch[0][0])
+        deadline = time.monotonic() + (self.max_wait_ms / 1000)
+
+        while num_pairs < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            batch.append(request)
+            num_pairs += len(request[0])
+
+        return batch
+
+    def _run(self):
+        while True:
+
+            batch = self._next_batch()
+            pairs = [pair for (request_pairs, _) in batch for pair in request_pairs]
+
+            try:
+                start = time.time()
+                scores = self.reranker.rerank_pairs(pairs, batch_size=self.max_batch_size)
+                end = time.time()
+                logger.debug(f'Scored reranking batch [model: {self.reranker.model}, num_requests: {len(batch)}, num_pairs: {len(pairs)}, duration: {(end-start) * 1000:.2f}ms]')
+            except Exception as e:
+                for (_, future) in batch:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for (request_pairs, future) in batch:
+                future.set_result([float(score) for score in scores[offset:offset + len(request_pairs)]])
+                offset += len(request_pairs)
+
+
+class _RerankerRegistry():
+    """
+    Process-wide registry of reranking models. Each model is loaded once, and all scoring requests
+    for a model are routed through a shared micro-batching queue, so that concurrent queries share
+    forward passes.
+    """
+
+    def __init__(self):
+        self._batchers:Dict[str, _MicroBatcher] = {}
+        self._lock = threading.Lock()
+
+    def _get_batcher(self, model:str) -> _MicroBatcher:
+        batcher = self._batchers.get(model)
+        if batcher is None:
+            with self._lock:
+                batcher = self._batchers.get(model)
+                if batcher is None:
+                    start = time.time()
+                    reranker = SentenceReranker(model=model, batch_size=GraphRAGConfig.reranking_batch_size)
+                    end = time.time()
+                    logger.debug(f'Loaded reranking model [model: {model}, duration: {(end-start) * 1000:.2f}ms]')
+                    batcher = _MicroBatcher(
+                        reranker,
+                        max_batch_size=GraphRAGConfig.reranking_batch_size,
+                        max_wait_ms=GraphRAGConfig.reranking_max_wait_ms
+                    )
+                    self._batchers[model] = batcher
+        return batcher
+
+    def get_reranker(self, model:Optional[str]=None) -> SentenceReranker:
+        return self._get_batcher(model or GraphRAGConfig.reranking_model).reranker
+
+    def warm(self, model:Optional[str]=None):
+        """Loads the model, and runs a single forward pass to initialize it."""
+        self.score(query='warm', values=['warm'], model=model)
+
+    def score(self, query:str, values:List[str], model:Optional[str]=None) -> List[float]:
+        model = model or GraphRAGConfig.reranking_model
+        with trace_span('rerank', {'rerank.model': model, 'rerank.num_values': len(values)}):
+            batcher = self._get_batcher(model)
+            return batcher.submit([(query, value) for value in values]).result()
+
+RerankerRegistry = _RerankerRegistry()
@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
-from typing import List, Tuple, Optional, Any
+from typing import List, Tuple, Optional, Any, Dict
 
 from graphrag_toolkit.retrieval.post_processors import RerankerMixin
 
@@ -36,6 +36,9 @@ class SentenceReranker(SentenceTransformerRerank, RerankerMixin):
     @property
     def batch_size(self):
         return self.batch_size_internal
+
+    def cache_fingerprint(self) -> Dict[str, Any]:
+        return {'type': type(self).__qualname__, 'model': self.model}
     
     def rerank_pairs(
         self,
@@ -4,27 +4,35 @@
 import logging
 import numpy as np
 import re
+import zlib
 import spacy
-from typing import List, Optional, Any, Callable
+import threading
+from collections import OrderedDict, defaultdict
+from typing import List, Optional, Any, Callable, ClassVar, Dict, Tuple
 from pydantic import Field
 
+from scipy.sparse import csr_matrix
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 from graphrag_toolkit import ModelError
-from graphrag_toolkit.retrieval.model import SearchResult
+from graphrag_toolkit.retrieval.utils.search_result_nodes import internal_formatted_search_result_from
 
+from llama_index.core.bridge.pydantic import PrivateAttr
 from llama_index.core.postprocessor.types import BaseNodePostprocessor
 from llama_index.core.schema import NodeWithScore, QueryBundle, BaseNode
 
 logger = logging.getLogger(__name__)
 
+MINHASH_PRIME = (1 << 61) - 1
+SIMILARITY_BLOCK_SIZE = 1024
+
 def _all_text(node:BaseNode) -> str:
-    return node.text
+    # get_content() serializes search result nodes that have not yet been materialized
+    return node.get_content()
 
 def _topics_and_statements(node:BaseNode) -> str:
     lines = []
-    search_result = SearchResult.model_validate_json(node.text)
+    search_result = internal_formatted_search_result_from(node)
     lines.append(search_result.topic)
     for statement in search_result.statements:
         lines.append(statement)
@@ -32,7 +40,7 @@ def _topics_and_statements(node:BaseNode) -> str:
 
 def _topics(node:BaseNode) -> str:
     lines = []
-    search_result = SearchResult.model_validate_json(node.text)
+    search_result = internal_formatted_search_result_from(node)
     return search_result.topic
 
 ALL_TEXT = _all_text
@@ -41,40 +49,154 @@ TOPICS = _topics
 
 class StatementDiversityPostProcessor(BaseNodePostprocessor):
     """Removes similar statements using TF-IDF similarity."""
+
+    supports_search_result_nodes: ClassVar[bool] = True
     
     similarity_threshold: float = Field(default=0.975)
     nlp: Any = Field(default=None)
     text_fn: Callable[[BaseNode], str] = Field(default=None)
-
-    def __init__(self, similarity_threshold: float = 0.975, text_fn = None):
+    cache_size: int = Field(default=10000)
+    lsh_min_nodes: int = Field(default=2000)
+    num_perm: int = Field(default=64)
+    num_bands: int = Field(default=16)
+
+    _cache: Any = PrivateAttr(default=None)
+    _cache_lock: Any = PrivateAttr(default=None)
+
+    def __init__(self, 
+                 similarity_threshold: float = 0.975, 
+                 text_fn = None, 
+                 cache_size: int = 10000, 
+                 lsh_min_nodes: int = 2000,
+                 num_perm: int = 64,
+                 num_bands: int = 16):
         super().__init__(
             similarity_threshold=similarity_threshold,
-            text_fn = text_fn or ALL_TEXT
+            text_fn = text_fn or ALL_TEXT,
+            cache_size=cache_size,
+            lsh_min_nodes=lsh_min_nodes,
+            num_perm=num_perm,
+            num_bands=num_bands
         )
+        if num_perm % num_bands != 0:
+            raise ValueError(f'num_perm ({num_perm}) must be a multiple of num_bands ({num_bands})')
         try:
             self.nlp = spacy.load("en_core_web_sm", disable=['ner', 'parser'])
             self.nlp.add_pipe('sentencizer')
         except OSError:
             raise ModelError("Please install the spaCy model using: python -m spacy download en_core_web_sm")
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
 
-    def preprocess_texts(self, texts: List[str]) -> List[str]:
-        """Preprocess texts using optimized spaCy configuration."""
-        preprocessed_texts = []
+    def _preprocess_doc(self, doc) -> str:
         float_pattern = re.compile(r'\d+\.\d+')
-        
-        for text in texts:
-            doc = self.nlp(text)
-            tokens = []
-            for token in doc:
-                if token.like_num: 
-                    if float_pattern.match(token.text):
-                        tokens.append(f"FLOAT_{token.text}")
-                    else:
-                        tokens.append(f"NUM_{token.text}")
-                elif not token.is_stop and not token.is_punct:
-                    tokens.append(token.lemma_.lower())
-            preprocessed_texts.append(' '.join(tokens))
-        return preprocessed_texts
+        tokens = []
+        for token in doc:
+            if token.like_num: 
+                if float_pattern.match(token.text):
+                    tokens.append(f"FLOAT_{token.text}")
+                else:
+                    tokens.append(f"NUM_{token.text}")
+            elif not token.is_stop and not token.is_punct:
+                tokens.append(token.lemma_.lower())
+        return ' '.join(tokens)
+
+    def preprocess_texts(self, texts: List[str]) -> List[str]:
+        """Preprocess texts using optimized spaCy configuration, batching texts not already in the cache."""
+        preprocessed = {}
+        missing = []
+
+        with self._cache_lock:
+            for text in texts:
+                if text in self._cache:
+                    self._cache.move_to_end(text)
+                    preprocessed[text] = self._cache[text]
+                elif text not in preprocessed:
+                    preprocessed[text] = None
+                    missing.append(text)
+
+        if missing:
+            processed = [self._preprocess_doc(doc) for doc in self.nlp.pipe(missing, batch_size=256)]
+            with self._cache_lock:
+                for text, preprocessed_text in zip(missing, processed):
+                    preprocessed[text] = preprocessed_text
+                    self._cache[text] = preprocessed_text
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        logger.debug(f'Preprocessed texts [num_texts: {len(texts)}, cache_misses: {len(missing)}]')
+
+        return [preprocessed[text] for text in texts]
+
+    def _exact_similar_pairs(self, tfidf_matrix:csr_matrix) -> Dict[int, List[Tuple[int, float]]]:
+
+        # Rows are L2-normalized, so the dot product is the cosine similarity. Only pairs
+        # (i, j) where j > i are retained, computed a block of rows at a time.
+
+        similar = defaultdict(list)
+        num_rows = tfidf_matrix.shape[0]
+
+        for start in range(0, num_rows, SIMILARITY_BLOCK_SIZE):
+            block = (tfidf_matrix[start:start+SIMILARITY_BLOCK_SIZE] @ tfidf_matrix.T).tocoo()
+            rows = block.row + start
+            mask = (block.col > rows) & (block.data > self.similarity_threshold)
+            for i, j, v in zip(rows[mask], block.col[mask], block.data[mask]):
+                similar[int(i)].append((int(j), float(v)))
+
+        return similar
+
+    def _minhash_signatures(self, preprocessed_texts:List[str]) -> List[Optional[np.ndarray]]:
+
+        rng = np.random.default_rng(42)
+        a = rng.integers(1, MINHASH_PRIME, size=self.num_perm, dtype=np.uint64)
+        b = rng.integers(0, MINHASH_PRIME, size=self.num_perm, dtype=np.uint64)
+
+        signatures = []
+        for text in preprocessed_texts:
+            tokens = set(text.split())
+            if not tokens:
+                signatures.append(None)
+                continue
+            hashes = np.array([zlib.crc32(t.encode('utf-8')) for t in tokens], dtype=np.uint64)
+            # a * hash may overflow and wrap; the result is still a consistent hash function
+            # for each permutation, which is all MinHash requires
+            signatures.append(((a[:, None] * hashes[None, :] + b[:, None]) % MINHASH_PRIME).min(axis=1))
+
+        return signatures
+
+    def _lsh_similar_pairs(self, tfidf_matrix:csr_matrix, preprocessed_texts:List[str]) -> Dict[int, List[Tuple[int, float]]]:
+
+        # MinHash signatures are split into bands; texts that share any band are candidate
+        # pairs, whose TF-IDF similarity is then computed exactly
+
+        rows_per_band = self.num_perm // self.num_bands
+        signatures = self._minhash_signatures(preprocessed_texts)
+
+        candidates = set()
+        for band in range(self.num_bands):
+            buckets = defaultdict(list)
+            for idx, signature in enumerate(signatures):
+                if signature is not None:
+                    buckets[signature[band*rows_per_band:(band+1)*rows_per_band].tobytes()].append(idx)
+            for bucket in buckets.values():
+                for x in range(len(bucket)):
+                    for y in range(x + 1, len(bucket)):
+                        candidates.add((bucket[x], bucket[y]))
+
+        logger.debug(f'LSH candidate pairs [num_texts: {len(preprocessed_texts)}, num_candidates: {len(candidates)}]')
+
+        similar = defaultdict(list)
+
+        if candidates:
+            pairs = np.array(sorted(candidates))
+            similarities = np.asarray(
+                tfidf_matrix[pairs[:, 0]].multiply(tfidf_matrix[pairs[:, 1]]).sum(axis=1)
+            ).ravel()
+            for (i, j), v in zip(pairs, similarities):
+                if v > self.similarity_threshold:
+                    similar[int(i)].append((int(j), float(v)))
+
+        return similar
     
     def _postprocess_nodes(
         self,
@@ -90,8 +212,16 @@ class StatementDiversityPostProcessor(BaseNodePostprocessor):
 
         # Calculate TF-IDF similarity
         vectorizer = TfidfVectorizer()
-        tfidf_matrix = vectorizer.fit_transform(preprocessed_texts)
-        cosine_sim_matrix = cosine_similarity(tfidf_matrix)
+        try:
+            tfidf_matrix = vectorizer.fit_transform(preprocessed_texts).tocsr()
+        except ValueError:
+            # Empty vocabulary
+            return nodes
+
+        if len(nodes) >= self.lsh_min_nodes:
+            similar = self._lsh_similar_pairs(tfidf_matrix, preprocessed_texts)
+        else:
+            similar = self._exact_similar_pairs(tfidf_matrix)
 
         # Track which nodes to keep
         keep_indices = []
@@ -103,11 +233,10 @@ class StatementDiversityPostProcessor(BaseNodePostprocessor):
                 already_selected[idx] = True
 
                 # Find similar statements
-                similar_indices = np.where(cosine_sim_matrix[idx] > self.similarity_threshold)[0]
-                for sim_idx in similar_indices:
+                for sim_idx, similarity in similar.get(idx, []):
                     if not already_selected[sim_idx]:
                         logger.debug(
-                            f"Removing duplicate (similarity: {cosine_sim_matrix[idx][sim_idx]:.4f}):\n"
+                            f"Removing duplicate (similarity: {similarity:.4f}):\n"
                             f"Kept: {texts[idx]}\n"
                             f"Removed: {texts[sim_idx]}"
                         )
@@ -17,6 +17,7 @@ from llama_index.core.async_utils import run_async_tasks
 from graphrag_toolkit import GraphRAGConfig
 from graphrag_toolkit.utils import LLMCache, LLMCacheType
 from graphrag_toolkit.retrieval.prompts import ENHANCE_STATEMENT_SYSTEM_PROMPT, ENHANCE_STATEMENT_USER_PROMPT
+from graphrag_toolkit.utils.query_executor import to_executor, STAGE_LLM
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +61,7 @@ class StatementEnhancementPostProcessor(BaseNodePostprocessor):
                     context=node.node.metadata['chunk']['value'],
                 )
             
-            response = await asyncio.to_thread(blocking_llm_call)
+            response = await to_executor(STAGE_LLM, blocking_llm_call)
             pattern = r'<modified_statement>(.*?)</modified_statement>'
             match = re.search(pattern, response, re.DOTALL)
             
@@ -1,51 +1,95 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Dict
+from typing import Dict, Optional, Union
 
 from graphrag_toolkit.retrieval.processors import ProcessorBase, ProcessorArgs
-from graphrag_toolkit.retrieval.model import SearchResultCollection, SearchResult
+from graphrag_toolkit.retrieval.internal_model import SearchResultCollection, SearchResult, Topic, Statement
 
 from llama_index.core.schema import QueryBundle
 
+class _IndexedTopic():
+    """A topic, with its chunks indexed by chunkId and its statements indexed by statement."""
+
+    __slots__ = ('topic', 'chunk_ids', 'statements')
+
+    def __init__(self, topic:Topic):
+        self.topic = topic
+        self.chunk_ids = {chunk.chunkId for chunk in topic.chunks}
+        self.statements:Dict[str, Statement] = {}
+        for statement in topic.statements:
+            self.statements.setdefault(statement.statement, statement)
+
+    def merge(self, topic:Topic):
+        for chunk in topic.chunks:
+            if chunk.chunkId not in self.chunk_ids:
+                self.chunk_ids.add(chunk.chunkId)
+                self.topic.chunks.append(chunk)
+        for statement in topic.statements:
+            existing_statement = self.statements.get(statement.statement)
+            if existing_statement is None:
+                self.statements[statement.statement] = statement
+                self.topic.statements.append(statement)
+            else:
+                existing_statement.score += statement.score
+
+
+class _IndexedSearchResult():
+    """
+    A search result, with its topics indexed by topic. Indexes are built the first time another result 
+    is merged into the result, and a topic's chunks and statements are indexed the first time another 
+    topic is merged into it, so results and topics that are never merged cost nothing to index.
+    """
+
+    __slots__ = ('search_result', 'topics')
+
+    def __init__(self, search_result:SearchResult):
+        self.search_result = search_result
+        self.topics:Optional[Dict[str, Union[Topic, _IndexedTopic]]] = None
+
+    def merge(self, search_result:SearchResult):
+
+        if self.topics is None:
+            self.topics = {}
+            for topic in self.search_result.topics:
+                self.topics.setdefault(topic.topic, topic)
+
+        for topic in search_result.topics:
+            existing_topic = self.topics.get(topic.topic)
+            if existing_topic is None:
+                self.topics[topic.topic] = topic
+                self.search_result.topics.append(topic)
+            else:
+                if not isinstance(existing_topic, _IndexedTopic):
+                    existing_topic = _IndexedTopic(existing_topic)
+                    self.topics[topic.topic] = existing_topic
+                existing_topic.merge(topic)
+
+
 class DedupResults(ProcessorBase):
     def __init__(self, args:ProcessorArgs):
         super().__init__(args)
 
     def _process_results(self, search_results:SearchResultCollection, query:QueryBundle) -> SearchResultCollection:
-        deduped_results:Dict[str, SearchResult] = {}
+
+        # Merges results from the same source in time linear in the number of topics, chunks 
+        # and statements: topics, chunks and statements are matched using dict lookups
+        deduped_results:Dict[str, _IndexedSearchResult] = {}
 
         for search_result in search_results.results:
             source_id = search_result.source.sourceId
-
-            if source_id not in deduped_results:
-                deduped_results[source_id] = search_result
-                continue
+            deduped_result = deduped_results.get(source_id)
+            if deduped_result is None:
+                deduped_results[source_id] = _IndexedSearchResult(search_result)
             else:
-                deduped_result = deduped_results[source_id]
-                for topic in search_result.topics:
-                    existing_topic = next((x for x in deduped_result.topics if x.topic == topic.topic), None)
-                    if not existing_topic:
-                        deduped_result.topics.append(topic)
-                        continue
-                    else:
-                        for chunk in topic.chunks:
-                            existing_chunk = next((x for x in existing_topic.chunks if x.chunkId == chunk.chunkId), None)
-                            if not existing_chunk:
-                                existing_topic.chunks.append(chunk)
-                        for statement in topic.statements:
-                            existing_statement = next((x for x in existing_topic.statements if x.statement == statement.statement), None)
-                            if not existing_statement:
-                                existing_topic.statements.append(statement)
-                            else:
-                                existing_statement.score += statement.score
+                deduped_result.merge(search_result)
+
+        results = [deduped_result.search_result for deduped_result in deduped_results.values()]
                         
-        for search_result in search_results.results:
+        for search_result in results:
             for topic in search_result.topics:
                 topic.statements = sorted(topic.statements, key=lambda x: x.score, reverse=True)
 
-        search_results = search_results.with_new_results(results=[r for r in deduped_results.values()])
+        search_results = search_results.with_new_results(results=results)
         
         return search_results
-
-
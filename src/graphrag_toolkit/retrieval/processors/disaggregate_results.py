@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from graphrag_toolkit.retrieval.processors import ProcessorBase, ProcessorArgs
-from graphrag_toolkit.retrieval.model import SearchResultCollection, SearchResult
+from graphrag_toolkit.retrieval.internal_model import SearchResultCollection, SearchResult
 
 from llama_index.core.schema import QueryBundle
 
@@ -16,7 +16,7 @@ class DisaggregateResults(ProcessorBase):
         for search_result in search_results.results:
             for topic in search_result.topics:
                 score = max([s.score for s in topic.statements])
-                disaggregated_results.append(SearchResult(topics=[topic], source=search_result.source, score=score))
+                disaggregated_results.append(type(search_result)(topics=[topic], source=search_result.source, score=score))
                 
         search_results = search_results.with_new_results(results=disaggregated_results)
         
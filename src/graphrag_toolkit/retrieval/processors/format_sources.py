@@ -6,7 +6,7 @@ from typing import Dict, Callable, Union, List, Any
 from string import Template
 
 from graphrag_toolkit.retrieval.processors import ProcessorBase, ProcessorArgs
-from graphrag_toolkit.retrieval.model import SearchResultCollection, SearchResult, Source
+from graphrag_toolkit.retrieval.internal_model import SearchResultCollection, SearchResult, Source
 
 from llama_index.core.schema import QueryBundle
 
@@ -11,6 +11,7 @@ class ProcessorArgs():
         self.derive_subqueries = kwargs.get('derive_subqueries', False)
         self.debug_results = kwargs.get('debug_results', [])
         self.reranker = kwargs.get('reranker', 'tfidf')
+        self.statement_index_path = kwargs.get('statement_index_path', None)
         self.max_statements = kwargs.get('max_statements', 100)
         self.max_search_results = kwargs.get('max_search_results', 5)
         self.max_statements_per_topic = kwargs.get('max_statements_per_topic', 10)
@@ -29,6 +30,12 @@ class ProcessorArgs():
         self.ecs_min_score_factor = kwargs.get('ecs_min_score_factor', 0.25)
         self.ecs_max_contexts = kwargs.get('ecs_max_contexts', 4)
         self.ec2_max_entities_per_context = kwargs.get('ec2_max_entities_per_context', 5)
+        self.serialize_results = kwargs.get('serialize_results', True)
+        self.keyword_cache = kwargs.get('keyword_cache', None)
+        self.entity_dictionary = kwargs.get('entity_dictionary', None)
+        self.query_context = kwargs.get('query_context', None)
+        self.result_cache = kwargs.get('result_cache', None)
+        self.index_generation = kwargs.get('index_generation', None)
 
   
     def to_dict(self, new_args:Dict[str, Any]={}):
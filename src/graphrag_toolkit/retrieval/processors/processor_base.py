@@ -5,8 +5,9 @@ import logging
 import abc
 from typing import Callable
 
-from graphrag_toolkit.retrieval.model import SearchResultCollection, SearchResult, Topic
+from graphrag_toolkit.retrieval.internal_model import SearchResultCollection, SearchResult, Topic
 from graphrag_toolkit.retrieval.processors import ProcessorArgs
+from graphrag_toolkit.utils.tracing import trace_span
 
 from llama_index.core.schema import QueryBundle
 
@@ -20,13 +21,7 @@ class ProcessorBase(object):
     def _log_results(self, retriever_name:str, title:str, search_results:SearchResultCollection):
         processor_name = type(self).__name__
         if processor_name in self.args.debug_results and logger.isEnabledFor(logging.DEBUG):
-            logger.debug(f'''Intermediate results [{retriever_name}.{processor_name}] {title}: {search_results.model_dump_json(
-                indent=2, 
-                exclude_unset=True, 
-                exclude_defaults=True, 
-                exclude_none=True, 
-                warnings=False)
-            }''')
+            logger.debug(f'Intermediate results [{retriever_name}.{processor_name}] {title}: {search_results.to_json()}')
 
     def _apply_to_search_results(self, 
                                  search_results:SearchResultCollection, 
@@ -80,7 +75,8 @@ class ProcessorBase(object):
     def process_results(self, search_results:SearchResultCollection, query:QueryBundle, retriever_name:str) -> SearchResultCollection:
         self._log_counts(retriever_name, 'Before', search_results)
         self._log_results(retriever_name, 'Before', search_results)
-        search_results = self._process_results(search_results, query)
+        with trace_span('processor', {'processor': type(self).__name__, 'retriever': retriever_name}):
+            search_results = self._process_results(search_results, query)
         self._log_counts(retriever_name, 'After', search_results)
         self._log_results(retriever_name, 'After', search_results)
         return search_results
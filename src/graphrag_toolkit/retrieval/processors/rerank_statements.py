@@ -8,12 +8,13 @@ from typing import List, Dict
 from dateutil.parser import parse
 
 from graphrag_toolkit import GraphRAGConfig
-from graphrag_toolkit.retrieval.model import Source
 from graphrag_toolkit.retrieval.processors import ProcessorBase, ProcessorArgs
-from graphrag_toolkit.retrieval.post_processors import SentenceReranker
-from graphrag_toolkit.retrieval.model import SearchResultCollection, SearchResult, Topic, ScoredEntity
+from graphrag_toolkit.retrieval.post_processors import RerankerRegistry
+from graphrag_toolkit.retrieval.model import ScoredEntity
+from graphrag_toolkit.retrieval.internal_model import SearchResultCollection, SearchResult, Topic, Statement, Source
+from graphrag_toolkit.storage.statement_lexical_index import StatementLexicalIndex
 
-from llama_index.core.schema import QueryBundle, NodeWithScore, TextNode
+from llama_index.core.schema import QueryBundle
 from llama_index.core.node_parser import TokenTextSplitter
 
 logger = logging.getLogger(__name__)
@@ -36,9 +37,7 @@ class RerankStatements(ProcessorBase):
         super().__init__(args)
         self.reranking_source_metadata_fn = self.args.reranking_source_metadata_fn or default_reranking_source_metadata_fn
 
-    def _score_values_with_tfidf(self, values:List[str], query:QueryBundle, entities:List[ScoredEntity]):
-
-        logger.debug('Reranking with tfidf')
+    def _get_match_values(self, query:QueryBundle, entities:List[ScoredEntity]) -> List[str]:
 
         splitter = TokenTextSplitter(chunk_size=25, chunk_overlap=5)
         match_values = splitter.split_text(query.query_str)
@@ -51,6 +50,14 @@ class RerankStatements(ProcessorBase):
         if extras:
             match_values.append(', '.join(extras))
 
+        return match_values
+
+    def _score_values_with_tfidf(self, values:List[str], query:QueryBundle, entities:List[ScoredEntity]):
+
+        logger.debug('Reranking with tfidf')
+
+        match_values = self._get_match_values(query, entities)
+
         logger.debug(f'Match values: {match_values}')
  
         values_to_score = values.copy()
@@ -81,11 +88,37 @@ class RerankStatements(ProcessorBase):
         
         return sorted_scored_values
 
+    def _score_values_with_index(self, values:List[str], statements:List[Statement], query:QueryBundle, entities:List[ScoredEntity]):
+
+        logger.debug('Reranking with statement lexical index')
+
+        match_values = self._get_match_values(query, entities)
+
+        logger.debug(f'Match values: {match_values}')
+
+        statement_index = StatementLexicalIndex.for_path(self.args.statement_index_path)
+        scores = statement_index.score(
+            match_values, 
+            [(statement.statementId, statement.statement) for statement in statements]
+        )
+
+        limit = len(values)
+        if self.args.max_statements:
+            limit = min(self.args.max_statements, limit)
+
+        scored_values = {}
+        for value, score in zip(values, scores):
+            scored_values[value] = max(score, scored_values.get(value, 0.0))
+
+        sorted_scored_values = dict(sorted(scored_values.items(), key=lambda item: item[1], reverse=True)[:limit])
+
+        return sorted_scored_values
+
     def _score_values(self, values:List[str], query:QueryBundle, entities:List[ScoredEntity]) -> Dict[str, float]:
             
         logger.debug('Reranking with SentenceReranker')
 
-        reranker = SentenceReranker(model=self.reranking_model, top_n=self.args.max_statements or len(values))
+        top_n = self.args.max_statements or len(values)
 
         rank_query = (
             query 
@@ -93,17 +126,13 @@ class RerankStatements(ProcessorBase):
             else QueryBundle(query_str=f'{query.query_str} (keywords: {", ".join(set([entity.entity.value for entity in entities]))})')
         )
 
-        reranked_values = reranker.postprocess_nodes(
-            [
-                NodeWithScore(node=TextNode(text=value), score=0.0)
-                for value in values
-            ],
-            rank_query
-        )
+        scores = RerankerRegistry.score(rank_query.query_str, values, model=self.reranking_model)
+
+        reranked_values = sorted(zip(values, scores), key=lambda item: item[1], reverse=True)[:top_n]
 
         return {
-            reranked_value.text : reranked_value.score
-            for reranked_value in reranked_values
+            value : score
+            for (value, score) in reranked_values
         }
 
     def _process_results(self, search_results:SearchResultCollection, query:QueryBundle) -> SearchResultCollection:
@@ -112,6 +141,7 @@ class RerankStatements(ProcessorBase):
             return search_results
        
         values_to_score = []
+        statements_to_score = []
         
         for search_result in search_results.results:
             source_str = self.reranking_source_metadata_fn(search_result.source)
@@ -120,12 +150,15 @@ class RerankStatements(ProcessorBase):
                 for statement in topic.statements:
                     statement_str = statement.statement_str
                     values_to_score.append(self._format_statement_context(source_str, topic_str, statement_str))
+                    statements_to_score.append(statement)
         
         start = time.time()
 
         scored_values = None
         if self.args.reranker.lower() == 'model':
             scored_values = self._score_values(values_to_score, query, search_results.entities)
+        elif self.args.statement_index_path:
+            scored_values = self._score_values_with_index(values_to_score, statements_to_score, query, search_results.entities)
         else:
             scored_values = self._score_values_with_tfidf(values_to_score, query, search_results.entities)
 
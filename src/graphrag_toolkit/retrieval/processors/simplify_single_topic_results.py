@@ -5,7 +5,7 @@ import statistics
 from typing import List, Dict
 
 from graphrag_toolkit.retrieval.processors import ProcessorBase, ProcessorArgs
-from graphrag_toolkit.retrieval.model import SearchResultCollection, SearchResult
+from graphrag_toolkit.retrieval.internal_model import SearchResultCollection, SearchResult
 
 from llama_index.core.schema import QueryBundle
 
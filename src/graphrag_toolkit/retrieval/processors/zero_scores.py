@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from graphrag_toolkit.retrieval.processors import ProcessorBase, ProcessorArgs
-from graphrag_toolkit.retrieval.model import SearchResultCollection, SearchResult, Topic
+from graphrag_toolkit.retrieval.internal_model import SearchResultCollection, SearchResult, Topic
 
 from llama_index.core.schema import QueryBundle
 
@@ -89,6 +89,19 @@ Put the questions on separate lines. Do not provide any other explanatory text.
 """
 
 
+DECOMPOSE_QUERY_PROMPT = """
+Can the following question potentially be answered with details of a single entity? If, in the simplest case, a single entity might suffice, respond with the word SINGLE.
+
+Otherwise, decompose the question into at most {max_subqueries} simpler, standalone questions - fewer, if possible. Each question must be self-contained, and MUST NOT depend on the answer to any of the other questions. Avoid generalized questions that do not preserve relevant details from the original question. If the original question cannot be broken down into anything simpler, respond with the word SINGLE.
+
+Here is the question:
+
+{question}
+
+Either respond with the word SINGLE, or put the questions on separate lines. Do not number the questions. Do not provide any other explanatory text. Do not surround the output with tags.
+"""
+
+
 EXTRACT_KEYWORDS_PROMPT = """
 You are an expert AI assistant specialising in entity extraction. Your task is to identify the most relevant keywords from a text supplied by the user, up to {max_keywords} in total.
 
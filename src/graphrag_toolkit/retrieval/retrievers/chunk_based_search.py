@@ -2,15 +2,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
-import concurrent.futures
 from typing import List, Optional, Type
 
-from graphrag_toolkit.retrieval.model import SearchResultCollection
+from graphrag_toolkit.retrieval.internal_model import SearchResultCollection
 from graphrag_toolkit.storage.vector_store import VectorStore
 from graphrag_toolkit.storage.graph_store import GraphStore
 from graphrag_toolkit.retrieval.processors import ProcessorBase, ProcessorArgs
 from graphrag_toolkit.retrieval.retrievers.traversal_based_base_retriever import TraversalBasedBaseRetriever
-from graphrag_toolkit.retrieval.utils.vector_utils import get_diverse_vss_elements
+from graphrag_toolkit.retrieval.utils.vector_utils import get_diverse_vss_elements, aget_diverse_vss_elements
+from graphrag_toolkit.retrieval.utils.query_context import memoize, amemoize, graph_query_key
 
 from llama_index.core.schema import QueryBundle
 
@@ -32,22 +32,51 @@ class ChunkBasedSearch(TraversalBasedBaseRetriever):
             **kwargs
         )
     
-    def chunk_based_graph_search(self, chunk_id):
+    def _chunk_based_graph_search_query(self, chunk_ids):
 
+        # One query for all start chunks: statement and result limits are applied per chunk
         cypher = self.create_cypher_query(f'''
-        // chunk-based graph search                                  
+        // chunk-based graph search
+        UNWIND $chunkIds AS chunkId
         MATCH (l:`__Statement__`)-[:`__PREVIOUS__`*0..1]-(:`__Statement__`)-[:`__BELONGS_TO__`]->(t:`__Topic__`)-[:`__MENTIONED_IN__`]->(c:`__Chunk__`)
-        WHERE {self.graph_store.node_id("c.chunkId")} = $chunkId
-        ''')
+        WHERE {self.graph_store.node_id("c.chunkId")} = chunkId
+        ''', group_by='chunkId')
                                           
         properties = {
-            'chunkId': chunk_id,
+            'chunkIds': chunk_ids,
             'limit': self.args.query_limit,
             'statementLimit': self.args.intermediate_limit
         }
                                           
-        return self.graph_store.execute_query(cypher, properties)
+        return (cypher, properties)
+
+    def batch_chunk_based_graph_search(self, chunk_ids:List[str]):
+        if not chunk_ids:
+            return []
+        (cypher, properties) = self._chunk_based_graph_search_query(chunk_ids)
+        results = memoize(
+            self.args.query_context,
+            graph_query_key(cypher, properties),
+            lambda: self.graph_store.execute_query(cypher, properties)
+        )
+        return self.ungroup_search_results(chunk_ids, results)
+
+    async def abatch_chunk_based_graph_search(self, chunk_ids:List[str]):
+        if not chunk_ids:
+            return []
+        (cypher, properties) = self._chunk_based_graph_search_query(chunk_ids)
+        results = await amemoize(
+            self.args.query_context,
+            graph_query_key(cypher, properties),
+            lambda: self.graph_store.aexecute_query(cypher, properties)
+        )
+        return self.ungroup_search_results(chunk_ids, results)
+
+    def chunk_based_graph_search(self, chunk_id):
+        return self.batch_chunk_based_graph_search([chunk_id])
 
+    async def achunk_based_graph_search(self, chunk_id):
+        return await self.abatch_chunk_based_graph_search([chunk_id])
 
     def get_start_node_ids(self, query_bundle: QueryBundle) -> List[str]:
 
@@ -56,40 +85,38 @@ class ChunkBasedSearch(TraversalBasedBaseRetriever):
         chunks = get_diverse_vss_elements('chunk', query_bundle, self.vector_store, self.args)
         
         return [chunk['chunk']['chunkId'] for chunk in chunks]
+
+    async def aget_start_node_ids(self, query_bundle: QueryBundle) -> List[str]:
+
+        logger.debug('Getting start node ids for chunk-based search...')
+
+        chunks = await aget_diverse_vss_elements('chunk', query_bundle, self.vector_store, self.args)
+        
+        return [chunk['chunk']['chunkId'] for chunk in chunks]
     
     def do_graph_search(self, query_bundle: QueryBundle, start_node_ids:List[str]) -> SearchResultCollection:
-        
-        chunk_ids = start_node_ids
 
         logger.debug('Running chunk-based search...')
-        
-        search_results = []
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.args.num_workers) as executor:
-
-            futures = [
-                executor.submit(self.chunk_based_graph_search, chunk_id)
-                for chunk_id in chunk_ids
-            ]
-            
-            executor.shutdown()
-
-            for future in futures:
-                for result in future.result():
-                    search_results.append(result)
+
+        search_results = self.batch_chunk_based_graph_search(start_node_ids)
                     
+        return self._to_logged_search_results_collection(search_results)
+
+    async def ado_graph_search(self, query_bundle: QueryBundle, start_node_ids:List[str]) -> SearchResultCollection:
+
+        logger.debug('Running chunk-based search...')
+
+        search_results = await self.abatch_chunk_based_graph_search(start_node_ids)
+
+        return self._to_logged_search_results_collection(search_results)
+
+    def _to_logged_search_results_collection(self, search_results) -> SearchResultCollection:
+
         search_results_collection = self._to_search_results_collection(search_results) 
         
         retriever_name = type(self).__name__
         if retriever_name in self.args.debug_results and logger.isEnabledFor(logging.DEBUG):
-            logger.debug(f'''Chunk-based results: {search_results_collection.model_dump_json(
-                    indent=2, 
-                    exclude_unset=True, 
-                    exclude_defaults=True, 
-                    exclude_none=True, 
-                    warnings=False)
-                }''')
+            logger.debug(f'''Chunk-based results: {search_results_collection.to_json()}''')
                    
         
         return search_results_collection
-    
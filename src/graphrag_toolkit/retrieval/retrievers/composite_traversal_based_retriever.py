@@ -3,19 +3,22 @@
 
 import logging
 import math
-import concurrent.futures
+import asyncio
 from dataclasses import dataclass
-from typing import List, Type, Optional, Union
+from typing import Any, Dict, List, Type, Optional, Union
 
 from graphrag_toolkit.storage.graph_store import GraphStore
 from graphrag_toolkit.storage.vector_store import VectorStore
 from graphrag_toolkit.retrieval.retrievers.traversal_based_base_retriever import TraversalBasedBaseRetriever
 from graphrag_toolkit.retrieval.utils.query_decomposition import QueryDecomposition
+from graphrag_toolkit.retrieval.utils.query_context import QueryContext
+from graphrag_toolkit.retrieval.utils.search_result_nodes import internal_formatted_search_result_from
 from graphrag_toolkit.retrieval.retrievers.entity_context_search import EntityContextSearch
 from graphrag_toolkit.retrieval.retrievers.chunk_based_search import ChunkBasedSearch
 from graphrag_toolkit.retrieval.retrievers.keyword_entity_search import KeywordEntitySearch
 from graphrag_toolkit.retrieval.processors import *
-from graphrag_toolkit.retrieval.model import SearchResultCollection, SearchResult, ScoredEntity, Entity
+from graphrag_toolkit.retrieval.model import ScoredEntity, Entity
+from graphrag_toolkit.retrieval.internal_model import SearchResultCollection
 
 from llama_index.core.schema import QueryBundle
 from llama_index.core.async_utils import run_async_tasks
@@ -56,8 +59,18 @@ class CompositeTraversalBasedRetriever(TraversalBasedBaseRetriever):
 
     def get_start_node_ids(self, query_bundle: QueryBundle) -> List[str]:
         return []
+
+    def _result_cache_args(self) -> Dict[str, Any]:
+        retrievers = []
+        for wr in self.weighted_retrievers:
+            (retriever, weight) = (wr.retriever, wr.weight) if isinstance(wr, WeightedTraversalBasedRetriever) else (wr, 1.0)
+            retrievers.append([retriever.__name__ if isinstance(retriever, type) else type(retriever).__name__, weight])
+        return super()._result_cache_args() | {
+            'retrievers': retrievers,
+            'query_decomposition': type(self.query_decomposition).__name__
+        }
     
-    async def _get_search_results_for_query(self, query_bundle: QueryBundle) -> SearchResultCollection:
+    async def _get_search_results_for_query(self, query_bundle: QueryBundle, query_context:QueryContext) -> SearchResultCollection:
 
         def weighted_arg(v, weight, factor):
             multiplier = min(1, weight * factor)
@@ -69,10 +82,13 @@ class CompositeTraversalBasedRetriever(TraversalBasedBaseRetriever):
         keyword_entity_search = KeywordEntitySearch(
             graph_store=self.graph_store, 
             max_keywords=self.args.max_keywords,
-            expand_entities=self.args.expand_entities
+            expand_entities=self.args.expand_entities,
+            keyword_cache=self.args.keyword_cache,
+            entity_dictionary=self.args.entity_dictionary,
+            query_context=query_context
         )
 
-        entity_search_results = keyword_entity_search.retrieve(query_bundle)
+        entity_search_results = await keyword_entity_search.aretrieve(query_bundle)
 
         entities = [
             ScoredEntity(
@@ -91,6 +107,9 @@ class CompositeTraversalBasedRetriever(TraversalBasedBaseRetriever):
 
             sub_args['intermediate_limit'] = weighted_arg(self.args.intermediate_limit, wr.weight, 2)
             sub_args['limit_per_query'] = weighted_arg(self.args.query_limit, wr.weight, 1)
+            sub_args['serialize_results'] = False
+            sub_args['query_context'] = query_context
+            sub_args['result_cache'] = None
 
             retriever = (wr.retriever if isinstance(wr.retriever, TraversalBasedBaseRetriever) 
                          else wr.retriever(
@@ -108,27 +127,27 @@ class CompositeTraversalBasedRetriever(TraversalBasedBaseRetriever):
 
             retrievers.append(retriever)
 
-        search_results = []
+        all_results = await asyncio.gather(*[
+            r.aretrieve(query_bundle)
+            for r in retrievers
+        ])
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.args.num_workers) as executor:
-            
-            futures = [
-                executor.submit(r.aretrieve, query_bundle)
-                for r in retrievers
-            ]
-            
-            executor.shutdown()
-
-            for future in futures:
-                for scored_node in await future.result():
-                    search_results.append(SearchResult.model_validate_json(scored_node.node.text))
+        search_results = [
+            internal_formatted_search_result_from(scored_node.node)
+            for results in all_results
+            for scored_node in results
+        ]
         
         return SearchResultCollection(results=search_results, entities=entities)
             
     
+    def _get_query_context(self) -> QueryContext:
+        # One context per question, shared by the subqueries and sub-retrievers that answer it
+        return self.args.query_context or QueryContext()
+
     def do_graph_search(self, query_bundle: QueryBundle, start_node_ids:List[str]) -> SearchResultCollection:
-        
-        search_results = SearchResultCollection()
+
+        query_context = self._get_query_context()
 
         subqueries = (self.query_decomposition.decompose_query(query_bundle) 
             if self.args.derive_subqueries 
@@ -136,17 +155,41 @@ class CompositeTraversalBasedRetriever(TraversalBasedBaseRetriever):
         )
 
         tasks = [
-            self._get_search_results_for_query(subquery) 
+            self._get_search_results_for_query(subquery, query_context) 
             for subquery in subqueries
         ]
             
         task_results:List[SearchResultCollection] = run_async_tasks(tasks)
 
+        logger.debug(f'Query context: {query_context.stats()}')
+
+        return self._merge_search_results(task_results)
+
+    async def ado_graph_search(self, query_bundle: QueryBundle, start_node_ids:List[str]) -> SearchResultCollection:
+
+        query_context = self._get_query_context()
+
+        subqueries = (await self.query_decomposition.adecompose_query(query_bundle) 
+            if self.args.derive_subqueries 
+            else [query_bundle]
+        )
+
+        task_results:List[SearchResultCollection] = await asyncio.gather(*[
+            self._get_search_results_for_query(subquery, query_context) 
+            for subquery in subqueries
+        ])
+
+        logger.debug(f'Query context: {query_context.stats()}')
+
+        return self._merge_search_results(task_results)
+
+    def _merge_search_results(self, task_results:List[SearchResultCollection]) -> SearchResultCollection:
+
+        search_results = SearchResultCollection()
+
         for task_result in task_results:
             for search_result in task_result.results:
                 search_results.add_search_result(search_result) 
-            for entity in task_result.entities:
-                search_results.add_entity(entity)
+            search_results.add_entities(task_result.entities)
         
         return search_results
-        
\ No newline at end of file
@@ -2,16 +2,18 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
-import concurrent.futures
 from typing import List, Generator, Tuple, Any, Optional, Type
 
-from graphrag_toolkit.retrieval.model import SearchResultCollection, ScoredEntity, Entity
+from graphrag_toolkit.retrieval.model import ScoredEntity, Entity
+from graphrag_toolkit.retrieval.internal_model import SearchResultCollection
 from graphrag_toolkit.storage.graph_store import GraphStore
 from graphrag_toolkit.storage.vector_store import VectorStore
 from graphrag_toolkit.storage.graph_utils import node_result, search_string_from
 from graphrag_toolkit.retrieval.retrievers.keyword_entity_search import KeywordEntitySearch
 from graphrag_toolkit.retrieval.processors import ProcessorBase, ProcessorArgs
 from graphrag_toolkit.retrieval.retrievers.traversal_based_base_retriever import TraversalBasedBaseRetriever
+from graphrag_toolkit.retrieval.utils.async_utils import gather_with_concurrency
+from graphrag_toolkit.utils.query_executor import current_query_executor, STAGE_GRAPH
 
 from llama_index.core.schema import QueryBundle
 
@@ -33,20 +35,17 @@ class EntityBasedSearch(TraversalBasedBaseRetriever):
             **kwargs
         )
 
-    def get_start_node_ids(self, query_bundle: QueryBundle) -> List[str]:
-
-        logger.debug('Getting start node ids for entity-based search...')
-
-        if self.entities:
-            return [entity.entity.entityId for entity in self.entities]
-        
-        keyword_entity_search = KeywordEntitySearch(
+    def _get_keyword_entity_search(self):
+        return KeywordEntitySearch(
             graph_store=self.graph_store, 
             max_keywords=self.args.max_keywords,
-            expand_entities=self.args.expand_entities
+            expand_entities=self.args.expand_entities,
+            keyword_cache=self.args.keyword_cache,
+            entity_dictionary=self.args.entity_dictionary,
+            query_context=self.args.query_context
         )
 
-        entity_search_results = keyword_entity_search.retrieve(query_bundle)
+    def _to_entity_ids(self, entity_search_results) -> List[str]:
 
         entities = [
             ScoredEntity(
@@ -57,6 +56,24 @@ class EntityBasedSearch(TraversalBasedBaseRetriever):
         ]
 
         return [entity.entity.entityId for entity in entities]
+
+    def get_start_node_ids(self, query_bundle: QueryBundle) -> List[str]:
+
+        logger.debug('Getting start node ids for entity-based search...')
+
+        if self.entities:
+            return [entity.entity.entityId for entity in self.entities]
+
+        return self._to_entity_ids(self._get_keyword_entity_search().retrieve(query_bundle))
+
+    async def aget_start_node_ids(self, query_bundle: QueryBundle) -> List[str]:
+
+        logger.debug('Getting start node ids for entity-based search...')
+
+        if self.entities:
+            return [entity.entity.entityId for entity in self.entities]
+
+        return self._to_entity_ids(await self._get_keyword_entity_search().aretrieve(query_bundle))
     
     def _for_each_disjoint(self, values:List[Any], others:Optional[List[Any]]=None) -> Generator[Tuple[Any, List[Any]], None, None]:
         values_as_set = set(values)
@@ -70,7 +87,7 @@ class EntityBasedSearch(TraversalBasedBaseRetriever):
             yield (value, other_values)
 
     
-    def _multiple_entity_based_graph_search(self, start_id, end_ids, query:QueryBundle):
+    def _multiple_entity_based_graph_search_query(self, start_id, end_ids, query:QueryBundle):
 
         logger.debug(f'Starting multiple-entity-based searches for [start_id: {start_id}, end_ids: {end_ids}]')
         
@@ -94,10 +111,18 @@ class EntityBasedSearch(TraversalBasedBaseRetriever):
             'limit': self.args.query_limit
         }
             
+        return (cypher, properties)
+
+    def _multiple_entity_based_graph_search(self, start_id, end_ids, query:QueryBundle):
+        (cypher, properties) = self._multiple_entity_based_graph_search_query(start_id, end_ids, query)
         return self.graph_store.execute_query(cypher, properties)
+
+    async def _amultiple_entity_based_graph_search(self, start_id, end_ids, query:QueryBundle):
+        (cypher, properties) = self._multiple_entity_based_graph_search_query(start_id, end_ids, query)
+        return await self.graph_store.aexecute_query(cypher, properties)
            
 
-    def _single_entity_based_graph_search(self, entity_id, query:QueryBundle):
+    def _single_entity_based_graph_search_query(self, entity_id, query:QueryBundle):
 
         logger.debug(f'Starting single-entity-based search for [entity_id: {entity_id}]')
             
@@ -115,7 +140,15 @@ class EntityBasedSearch(TraversalBasedBaseRetriever):
             'limit': self.args.query_limit
         }
             
+        return (cypher, properties)
+
+    def _single_entity_based_graph_search(self, entity_id, query:QueryBundle):
+        (cypher, properties) = self._single_entity_based_graph_search_query(entity_id, query)
         return self.graph_store.execute_query(cypher, properties)
+
+    async def _asingle_entity_based_graph_search(self, entity_id, query:QueryBundle):
+        (cypher, properties) = self._single_entity_based_graph_search_query(entity_id, query)
+        return await self.graph_store.aexecute_query(cypher, properties)
             
     
     def do_graph_search(self, query_bundle:QueryBundle, start_node_ids:List[str]) -> SearchResultCollection:
@@ -123,37 +156,52 @@ class EntityBasedSearch(TraversalBasedBaseRetriever):
         logger.debug('Running entity-based search...')
         
         search_results = []
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.args.num_workers) as executor:
-            
-            futures = [
-                executor.submit(self._multiple_entity_based_graph_search, start_id, end_ids, query_bundle)
-                for (start_id, end_ids) in self._for_each_disjoint(start_node_ids)
-            ]
-            
-            futures.extend([
-                executor.submit(self._single_entity_based_graph_search, entity_id, query_bundle)
-                for entity_id in start_node_ids
-            ])
-            
-            executor.shutdown()
 
-            for future in futures:
-                for result in future.result():
-                    search_results.append(result)
-                    
+        executor = current_query_executor()
+            
+        futures = [
+            executor.submit(STAGE_GRAPH, self._multiple_entity_based_graph_search, start_id, end_ids, query_bundle)
+            for (start_id, end_ids) in self._for_each_disjoint(start_node_ids)
+        ]
+        
+        futures.extend([
+            executor.submit(STAGE_GRAPH, self._single_entity_based_graph_search, entity_id, query_bundle)
+            for entity_id in start_node_ids
+        ])
+
+        for future in futures:
+            for result in future.result():
+                search_results.append(result)
                 
+        return self._to_logged_search_results_collection(search_results)
+
+    async def ado_graph_search(self, query_bundle:QueryBundle, start_node_ids:List[str]) -> SearchResultCollection:
+
+        logger.debug('Running entity-based search...')
+
+        tasks = [
+            self._amultiple_entity_based_graph_search(start_id, end_ids, query_bundle)
+            for (start_id, end_ids) in self._for_each_disjoint(start_node_ids)
+        ]
+
+        tasks.extend([
+            self._asingle_entity_based_graph_search(entity_id, query_bundle)
+            for entity_id in start_node_ids
+        ])
+
+        results = await gather_with_concurrency(self.args.num_workers, *tasks)
+
+        search_results = [result for r in results for result in r]
+
+        return self._to_logged_search_results_collection(search_results)
+
+    def _to_logged_search_results_collection(self, search_results) -> SearchResultCollection:
+
         search_results_collection = self._to_search_results_collection(search_results) 
         
         retriever_name = type(self).__name__
         if retriever_name in self.args.debug_results and logger.isEnabledFor(logging.DEBUG):
-            logger.debug(f'''Entity-based results: {search_results_collection.model_dump_json(
-                    indent=2, 
-                    exclude_unset=True, 
-                    exclude_defaults=True, 
-                    exclude_none=True, 
-                    warnings=False)
-                }''')
+            logger.debug(f'''Entity-based results: {search_results_collection.to_json()}''')
                    
         
-        return search_results_collection
\ No newline at end of file
+        return search_results_collection
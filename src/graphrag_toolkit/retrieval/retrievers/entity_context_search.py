@@ -2,9 +2,11 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+import asyncio
 from typing import List, Optional, Type, Union
 
-from graphrag_toolkit.retrieval.model import SearchResultCollection, ScoredEntity, Entity, SearchResult
+from graphrag_toolkit.retrieval.model import ScoredEntity, Entity
+from graphrag_toolkit.retrieval.internal_model import SearchResultCollection
 from graphrag_toolkit.storage.graph_store import GraphStore
 from graphrag_toolkit.storage.vector_store import VectorStore
 from graphrag_toolkit.retrieval.retrievers.keyword_entity_search import KeywordEntitySearch
@@ -12,6 +14,8 @@ from graphrag_toolkit.retrieval.retrievers.chunk_based_search import ChunkBasedS
 from graphrag_toolkit.retrieval.retrievers.topic_based_search import TopicBasedSearch
 from graphrag_toolkit.retrieval.processors import ProcessorBase, ProcessorArgs
 from graphrag_toolkit.retrieval.retrievers.traversal_based_base_retriever import TraversalBasedBaseRetriever
+from graphrag_toolkit.retrieval.utils.search_result_nodes import internal_search_result_from
+from graphrag_toolkit.utils.query_executor import to_executor, STAGE_GRAPH
 
 from llama_index.core.schema import QueryBundle
 
@@ -38,17 +42,29 @@ class EntityContextSearch(TraversalBasedBaseRetriever):
             **kwargs
         )
 
-    def get_start_node_ids(self, query_bundle: QueryBundle) -> List[str]:
-
-        logger.debug('Getting start node ids for entity context search...')
-        
-        keyword_entity_search = KeywordEntitySearch(
+    def _get_keyword_entity_search(self):
+        return KeywordEntitySearch(
             graph_store=self.graph_store, 
             max_keywords=self.args.max_keywords,
-            expand_entities=False
+            expand_entities=False,
+            keyword_cache=self.args.keyword_cache,
+            entity_dictionary=self.args.entity_dictionary,
+            query_context=self.args.query_context
         )
 
-        entity_search_results = keyword_entity_search.retrieve(query_bundle)
+    def get_start_node_ids(self, query_bundle: QueryBundle) -> List[str]:
+
+        logger.debug('Getting start node ids for entity context search...')
+
+        return self._to_entity_ids(self._get_keyword_entity_search().retrieve(query_bundle))
+
+    async def aget_start_node_ids(self, query_bundle: QueryBundle) -> List[str]:
+
+        logger.debug('Getting start node ids for entity context search...')
+
+        return self._to_entity_ids(await self._get_keyword_entity_search().aretrieve(query_bundle))
+
+    def _to_entity_ids(self, entity_search_results) -> List[str]:
 
         entities = [
             ScoredEntity(
@@ -164,7 +180,9 @@ class EntityContextSearch(TraversalBasedBaseRetriever):
                             vss_top_k=2,
                             max_search_results=2,
                             vss_diversity_factor=self.args.vss_diversity_factor,
-                            include_facts=self.args.include_facts
+                            include_facts=self.args.include_facts,
+                            serialize_results=False,
+                            query_context=self.args.query_context
                         ))
         logger.debug(f'sub_retriever: {type(sub_retriever).__name__}')
         return sub_retriever
@@ -182,20 +200,39 @@ class EntityContextSearch(TraversalBasedBaseRetriever):
             if entity_context:
                 results = sub_retriever.retrieve(QueryBundle(query_str=', '.join(entity_context)))
                 for result in results:
-                    search_results.append(SearchResult.model_validate(result.metadata))
+                    search_results.append(internal_search_result_from(result.node))
                     
                 
+        return self._to_logged_search_results_collection(search_results)
+
+    async def ado_graph_search(self, query_bundle:QueryBundle, start_node_ids:List[str]) -> SearchResultCollection:
+
+        logger.debug('Running entity-context-based search...')
+
+        sub_retriever = self._get_sub_retriever()
+        entity_contexts = await to_executor(STAGE_GRAPH, self._get_entity_contexts, start_node_ids)
+
+        all_results = await asyncio.gather(*[
+            sub_retriever.aretrieve(QueryBundle(query_str=', '.join(entity_context)))
+            for entity_context in entity_contexts
+            if entity_context
+        ])
+
+        search_results = [
+            internal_search_result_from(result.node)
+            for results in all_results
+            for result in results
+        ]
+
+        return self._to_logged_search_results_collection(search_results)
+
+    def _to_logged_search_results_collection(self, search_results) -> SearchResultCollection:
+
         search_results_collection = SearchResultCollection(results=search_results) 
         
         retriever_name = type(self).__name__
         
         if retriever_name in self.args.debug_results and logger.isEnabledFor(logging.DEBUG):
-            logger.debug(f'''Entity context results: {search_results_collection.model_dump_json(
-                    indent=2, 
-                    exclude_unset=True, 
-                    exclude_defaults=True, 
-                    exclude_none=True, 
-                    warnings=False)
-                }''')
+            logger.debug(f'''Entity context results: {search_results_collection.to_json()}''')
         
         return search_results_collection
\ No newline at end of file
@@ -3,14 +3,19 @@
 
 import logging
 import asyncio
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from graphrag_toolkit.config import GraphRAGConfig
 from graphrag_toolkit.storage.graph_store import GraphStore
+from graphrag_toolkit.storage.entity_dictionary import EntityDictionary
 from graphrag_toolkit.storage.graph_utils import node_result, search_string_from
 from graphrag_toolkit.utils import LLMCache, LLMCacheType
-from graphrag_toolkit.retrieval.model import ScoredEntity
+from graphrag_toolkit.utils.tracing import traced
+from graphrag_toolkit.retrieval.model import Entity, ScoredEntity
 from graphrag_toolkit.retrieval.prompts import SIMPLE_EXTRACT_KEYWORDS_PROMPT, EXTENDED_EXTRACT_KEYWORDS_PROMPT
+from graphrag_toolkit.retrieval.utils.keyword_cache import KeywordCache, DEFAULT_KEYWORD_CACHE, keyword_cache_namespace
+from graphrag_toolkit.retrieval.utils.query_context import QueryContext, memoize, amemoize
+from graphrag_toolkit.utils.query_executor import to_executor, STAGE_GRAPH
 
 from llama_index.core.base.base_retriever import BaseRetriever
 from llama_index.core.prompts import PromptTemplate
@@ -26,7 +31,10 @@ class KeywordEntitySearch(BaseRetriever):
                  simple_extract_keywords_template=SIMPLE_EXTRACT_KEYWORDS_PROMPT,
                  extended_extract_keywords_template=EXTENDED_EXTRACT_KEYWORDS_PROMPT,
                  max_keywords=10,
-                 expand_entities=False):
+                 expand_entities=False,
+                 keyword_cache:Optional[KeywordCache]=None,
+                 entity_dictionary:Optional[EntityDictionary]=None,
+                 query_context:Optional[QueryContext]=None):
         
         self.graph_store = graph_store
         self.llm = llm if llm and isinstance(llm, LLMCache) else LLMCache(
@@ -37,8 +45,13 @@ class KeywordEntitySearch(BaseRetriever):
         self.extended_extract_keywords_template=extended_extract_keywords_template
         self.max_keywords = max_keywords
         self.expand_entities = expand_entities
+        self.keyword_cache = keyword_cache if keyword_cache is not None else DEFAULT_KEYWORD_CACHE
+        self._keyword_cache_namespace = None
+        self.entity_dictionary = entity_dictionary
+        self.query_context = query_context
 
     
+    @traced('entity_expansion')
     def _expand_entities(self, scored_entities:List[ScoredEntity]):
         
         if not scored_entities or len(scored_entities) >= self.max_keywords:
@@ -127,64 +140,102 @@ class KeywordEntitySearch(BaseRetriever):
 
         return scored_entities
         
-    async def _get_entities_for_keyword(self, keyword:str) -> List[ScoredEntity]:
+    def _to_keyword_params(self, keywords:List[str]) -> List[Dict[str, Optional[str]]]:
 
-        def blocking_query():
+        keyword_params = []
 
+        for keyword in keywords:
+            if not keyword:
+                continue
             parts = keyword.split('|')
+            keyword_params.append({
+                'search_str': search_string_from(parts[0]),
+                'classification': parts[1] if len(parts) > 1 else None
+            })
 
-            if len(parts) > 1:
-
-                cypher = f"""
-                // get entities for keywords
-                MATCH (entity:`__Entity__`)-[r:`__SUBJECT__`|`__OBJECT__`]->(:`__Fact__`)
-                WHERE entity.search_str = $keyword and entity.class STARTS WITH $classification
-                WITH entity, count(r) AS score ORDER BY score DESC
-                RETURN {{
-                    {node_result('entity', self.graph_store.node_id('entity.entityId'), properties=['value', 'class'])},
-                    score: score
-                }} AS result"""
-
-                params = {
-                    'keyword': search_string_from(parts[0]),
-                    'classification': parts[1]
-                }
-            else:
-                cypher = f"""
-                // get entities for keywords
-                MATCH (entity:`__Entity__`)-[r:`__SUBJECT__`|`__OBJECT__`]->(:`__Fact__`)
-                WHERE entity.search_str = $keyword
-                WITH entity, count(r) AS score ORDER BY score DESC
-                RETURN {{
-                    {node_result('entity', self.graph_store.node_id('entity.entityId'), properties=['value', 'class'])},
-                    score: score
-                }} AS result"""
-
-                params = {
-                    'keyword': search_string_from(parts[0])
-                }
+        return keyword_params
 
-            results = self.graph_store.execute_query(cypher, params)
+    def _lookup_entities(self, keyword_params:List[Dict[str, Optional[str]]]) -> Tuple[List[List[ScoredEntity]], List[Dict[str, Optional[str]]]]:
+        """
+        Resolves keywords against the entity dictionary, if there is one. Returns the entities for the
+        resolved keywords, and the keywords that must still be resolved against the graph.
+        """
 
-            return [
-                ScoredEntity.model_validate(result['result'])
-                for result in results
-                if result['result']['score'] != 0
-            ]
+        if self.entity_dictionary is None or not self.entity_dictionary.is_loaded:
+            return [], keyword_params
+
+        task_results = []
+        unresolved_keyword_params = []
 
-        coro = asyncio.to_thread(blocking_query)
+        for params in keyword_params:
+            entries = self.entity_dictionary.lookup(params['search_str'], params['classification'])
+            if entries is None:
+                unresolved_keyword_params.append(params)
+            elif entries:
+                task_results.append([
+                    ScoredEntity(
+                        entity=Entity.model_validate({'entityId': e.entityId, 'value': e.value, 'class': e.classification}),
+                        score=float(e.degree)
+                    )
+                    for e in entries
+                ])
+
+        logger.debug(f'Entity dictionary lookup [num_keywords: {len(keyword_params)}, num_resolved: {len(keyword_params) - len(unresolved_keyword_params)}]')
+
+        return task_results, unresolved_keyword_params
+
+    def _get_entities_for_keywords_query(self, keyword_params:List[Dict[str, Optional[str]]]):
         
-        return await coro
-                        
+        cypher = f"""
+        // get entities for keywords
+        UNWIND $keywords AS keyword
+        MATCH (entity:`__Entity__`)-[r:`__SUBJECT__`|`__OBJECT__`]->(:`__Fact__`)
+        WHERE entity.search_str = keyword.search_str 
+        AND (keyword.classification IS NULL OR entity.class STARTS WITH keyword.classification)
+        WITH keyword, entity, count(r) AS score ORDER BY score DESC
+        RETURN {{
+            {node_result('entity', self.graph_store.node_id('entity.entityId'), properties=['value', 'class'])},
+            score: score
+        }} AS result"""
+
+        params = {
+            'keywords': keyword_params
+        }
+
+        return cypher, params
+
+    def _to_scored_entities(self, results) -> List[ScoredEntity]:
+        return [
+            ScoredEntity.model_validate(result['result'])
+            for result in results
+            if result['result']['score'] != 0
+        ]
+
+    @traced('entity_lookup', lambda self, keywords: {'entity_lookup.num_keywords': len(keywords)})
     def _get_entities_for_keywords(self, keywords:List[str])  -> List[ScoredEntity]:
         
-        tasks = [
-            self._get_entities_for_keyword(keyword)
-            for keyword in keywords
-            if keyword
-        ]
+        task_results, keyword_params = self._lookup_entities(self._to_keyword_params(keywords))
+
+        if keyword_params:
+            cypher, params = self._get_entities_for_keywords_query(keyword_params)
+            results = self.graph_store.execute_query(cypher, params)
+            task_results.append(self._to_scored_entities(results))
+
+        return self._merge_scored_entities(task_results)
+
+    @traced('entity_lookup', lambda self, keywords: {'entity_lookup.num_keywords': len(keywords)})
+    async def _aget_entities_for_keywords(self, keywords:List[str])  -> List[ScoredEntity]:
+        
+        task_results, keyword_params = self._lookup_entities(self._to_keyword_params(keywords))
 
-        task_results:List[List[ScoredEntity]] = run_async_tasks(tasks)
+        if keyword_params:
+            cypher, params = self._get_entities_for_keywords_query(keyword_params)
+            results = await self.graph_store.aexecute_query(cypher, params)
+            task_results.append(self._to_scored_entities(results))
+
+        return self._merge_scored_entities(task_results)
+
+    def _merge_scored_entities(self, task_results:List[List[ScoredEntity]]) -> List[ScoredEntity]:
 
         scored_entity_mappings = {}
 
@@ -208,18 +259,14 @@ class KeywordEntitySearch(BaseRetriever):
         return scored_entities
 
         
+    @traced('keyword_extraction', lambda self, s, num_keywords, prompt_template: {'keywords.max_keywords': num_keywords})
     async def _extract_keywords(self, s:str, num_keywords:int, prompt_template:str):
 
-        def blocking_llm_call():
-            return self.llm.predict(
-                PromptTemplate(template=prompt_template),
-                text=s,
-                max_keywords=num_keywords
-            )
-        
-        coro = asyncio.to_thread(blocking_llm_call)
-        
-        results = await coro
+        results = await self.llm.apredict(
+            PromptTemplate(template=prompt_template),
+            text=s,
+            max_keywords=num_keywords
+        )
 
         keywords = results.split('^')
 
@@ -235,22 +282,30 @@ class KeywordEntitySearch(BaseRetriever):
         logger.debug(f'Enriched keywords: {enriched_keywords}')
         return enriched_keywords
 
-    def _get_keywords(self, query, max_keywords):
-        
-        def add_keyword(k):
-            if k not in keywords:
-                keywords.append(k)
-        
-        keywords = [] 
+    def _get_keyword_tasks(self, query, max_keywords):
 
         num_keywords = max(int(max_keywords/2), 1)
 
-        tasks = [
+        return [
             self._get_simple_keywords(query, num_keywords),
             self._get_enriched_keywords(query, num_keywords),
         ]
 
-        task_results = run_async_tasks(tasks)
+    def _get_keywords(self, query, max_keywords):
+        task_results = run_async_tasks(self._get_keyword_tasks(query, max_keywords))
+        return self._merge_keywords(task_results)
+
+    async def _aget_keywords(self, query, max_keywords):
+        task_results = await asyncio.gather(*self._get_keyword_tasks(query, max_keywords))
+        return self._merge_keywords(task_results)
+
+    def _merge_keywords(self, task_results):
+        
+        def add_keyword(k):
+            if k not in keywords:
+                keywords.append(k)
+        
+        keywords = [] 
 
         for result in task_results:
             for keyword in result:
@@ -260,16 +315,90 @@ class KeywordEntitySearch(BaseRetriever):
         
         return keywords
 
+    @property
+    def keyword_cache_namespace(self) -> str:
+        if self._keyword_cache_namespace is None:
+            self._keyword_cache_namespace = keyword_cache_namespace(
+                type(self).__name__,
+                self.llm.llm.to_json(),
+                self.simple_extract_keywords_template,
+                self.extended_extract_keywords_template,
+                self.max_keywords
+            )
+        return self._keyword_cache_namespace
+
+    def _get_cached_keywords(self, query_bundle: QueryBundle):
+        if not self.keyword_cache.enabled:
+            return None
+        return self.keyword_cache.get(self.keyword_cache_namespace, query_bundle.query_str, query_bundle.embedding)
+
+    def _cache_keywords(self, query_bundle: QueryBundle, keywords):
+        if self.keyword_cache.enabled:
+            self.keyword_cache.put(self.keyword_cache_namespace, query_bundle.query_str, keywords, query_bundle.embedding)
+
+    def _get_keywords_for_query(self, query_bundle: QueryBundle):
+        keywords = self._get_cached_keywords(query_bundle)
+        if keywords is None:
+            keywords = self._get_keywords(query_bundle.query_str, self.max_keywords)
+            self._cache_keywords(query_bundle, keywords)
+        return keywords
+
+    async def _aget_keywords_for_query(self, query_bundle: QueryBundle):
+        keywords = self._get_cached_keywords(query_bundle)
+        if keywords is None:
+            keywords = await self._aget_keywords(query_bundle.query_str, self.max_keywords)
+            self._cache_keywords(query_bundle, keywords)
+        return keywords
+
+    # Keywords and entities are memoized in the query context (if any), so that retrievers answering
+    # the same question share a single keyword extraction and entity lookup per query string. The
+    # memoized entity list is copied, because entity expansion extends it.
+
+    def _keywords_key(self, query_bundle: QueryBundle):
+        return ('keywords', self.keyword_cache_namespace, query_bundle.query_str)
+
+    def _entities_key(self, keywords:List[str]):
+        return ('entities_for_keywords', tuple(keywords))
+
     def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
         
-        query = query_bundle.query_str
-        
-        keywords = self._get_keywords(query, self.max_keywords)
-        scored_entities:List[ScoredEntity] = self._get_entities_for_keywords(keywords)
+        keywords = memoize(
+            self.query_context, 
+            self._keywords_key(query_bundle), 
+            lambda: self._get_keywords_for_query(query_bundle)
+        )
+
+        scored_entities:List[ScoredEntity] = list(memoize(
+            self.query_context, 
+            self._entities_key(keywords), 
+            lambda: self._get_entities_for_keywords(keywords)
+        ))
 
         if self.expand_entities:
             scored_entities = self._expand_entities(scored_entities)
 
+        return self._to_nodes(scored_entities)
+
+    async def _aretrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        
+        keywords = await amemoize(
+            self.query_context, 
+            self._keywords_key(query_bundle), 
+            lambda: self._aget_keywords_for_query(query_bundle)
+        )
+
+        scored_entities:List[ScoredEntity] = list(await amemoize(
+            self.query_context, 
+            self._entities_key(keywords), 
+            lambda: self._aget_entities_for_keywords(keywords)
+        ))
+
+        if self.expand_entities:
+            scored_entities = await to_executor(STAGE_GRAPH, self._expand_entities, scored_entities)
+
+        return self._to_nodes(scored_entities)
+
+    def _to_nodes(self, scored_entities:List[ScoredEntity]) -> List[NodeWithScore]:
         return [
             NodeWithScore(
                 node=TextNode(text=scored_entity.entity.model_dump_json(exclude_none=True, exclude_defaults=True, indent=2)),
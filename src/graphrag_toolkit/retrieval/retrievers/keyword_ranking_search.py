@@ -1,7 +1,6 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-import asyncio
 import logging
 from typing import List, Dict, Set, Any, Optional, Tuple
 
@@ -9,9 +8,12 @@ from graphrag_toolkit import GraphRAGConfig
 from graphrag_toolkit.utils import LLMCache, LLMCacheType
 from graphrag_toolkit.storage import GraphStore
 from graphrag_toolkit.storage import VectorStore
+from graphrag_toolkit.storage.graph_utils import search_string_from
 from graphrag_toolkit.retrieval.utils.statement_utils import get_top_k, SharedEmbeddingCache
+from graphrag_toolkit.retrieval.utils.keyword_cache import KeywordCache, DEFAULT_KEYWORD_CACHE, keyword_cache_namespace
 from graphrag_toolkit.retrieval.prompts import EXTRACT_KEYWORDS_PROMPT, EXTRACT_SYNONYMS_PROMPT
 from graphrag_toolkit.retrieval.retrievers.semantic_guided_base_retriever import SemanticGuidedBaseRetriever
+from graphrag_toolkit.utils.query_executor import to_executor, STAGE_LLM
 
 from llama_index.core.base.base_retriever import BaseRetriever
 from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
@@ -31,6 +33,7 @@ class KeywordRankingSearch(SemanticGuidedBaseRetriever):
         llm:LLMCacheType = None,
         max_keywords: int = 10,
         top_k: int = 100,
+        keyword_cache: Optional[KeywordCache] = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(vector_store, graph_store, **kwargs)
@@ -43,12 +46,43 @@ class KeywordRankingSearch(SemanticGuidedBaseRetriever):
         self.keywords_prompt = keywords_prompt
         self.synonyms_prompt = synonyms_prompt
         self.top_k = top_k
+        self.keyword_cache = keyword_cache if keyword_cache is not None else DEFAULT_KEYWORD_CACHE
+        self._keyword_cache_namespace = None
+
+    @property
+    def keyword_cache_namespace(self) -> str:
+        if self._keyword_cache_namespace is None:
+            self._keyword_cache_namespace = keyword_cache_namespace(
+                type(self).__name__,
+                self.llm.llm.to_json(),
+                self.keywords_prompt,
+                self.synonyms_prompt,
+                self.max_keywords
+            )
+        return self._keyword_cache_namespace
+
+    def cache_fingerprint(self) -> Dict[str, Any]:
+        return {
+            'type': type(self).__qualname__,
+            'llm': self.llm.llm.to_json(),
+            'keywords_prompt': self.keywords_prompt,
+            'synonyms_prompt': self.synonyms_prompt,
+            'max_keywords': self.max_keywords,
+            'top_k': self.top_k
+        }
 
     def get_keywords(self, query_bundle: QueryBundle) -> Set[str]:
         """Get keywords and synonyms for the query."""
+
+        if self.keyword_cache.enabled:
+            keywords = self.keyword_cache.get(self.keyword_cache_namespace, query_bundle.query_str, query_bundle.embedding)
+            if keywords is not None:
+                return set(keywords)
+
         try:
             async def extract(prompt):
-                result = await asyncio.to_thread(
+                result = await to_executor(
+                    STAGE_LLM,
                     self.llm.predict,
                     PromptTemplate(template=prompt),
                     text=query_bundle.query_str,
@@ -66,6 +100,10 @@ class KeywordRankingSearch(SemanticGuidedBaseRetriever):
                 all_keywords.update(result)
 
             logger.debug(f"Extracted keywords: {all_keywords}")
+
+            if self.keyword_cache.enabled:
+                self.keyword_cache.put(self.keyword_cache_namespace, query_bundle.query_str, sorted(all_keywords), query_bundle.embedding)
+
             return all_keywords
             
         except Exception as e:
@@ -84,10 +122,10 @@ class KeywordRankingSearch(SemanticGuidedBaseRetriever):
             cypher = f"""
             UNWIND $keywords AS keyword
             MATCH (e:`__Entity__`)
-            WHERE toLower(e.value) = toLower(keyword)
+            WHERE e.search_str = keyword.search_str
             WITH e, keyword
             MATCH (e)-[:`__SUBJECT__`|`__OBJECT__`]->(:`__Fact__`)-[:`__SUPPORTS__`]->(statement:`__Statement__`)
-            WITH statement, COLLECT(DISTINCT keyword) as matched_keywords
+            WITH statement, COLLECT(DISTINCT keyword.keyword) as matched_keywords
             RETURN {{
                 statement: {{
                     statementId: {self.graph_store.node_id("statement.statementId")}
@@ -96,7 +134,14 @@ class KeywordRankingSearch(SemanticGuidedBaseRetriever):
             }} AS result
             """
             
-            results = self.graph_store.execute_query(cypher, {'keywords': list(keywords)})
+            # Match on the normalized search_str property written by the build stage (which
+            # can be indexed), rather than on a case-insensitive comparison of entity values
+            keyword_params = [
+                {'keyword': keyword, 'search_str': search_string_from(keyword)}
+                for keyword in keywords
+            ]
+            
+            results = self.graph_store.execute_query(cypher, {'keywords': keyword_params})
             if not results:
                 logger.debug("No statements found matching keywords")
                 return []
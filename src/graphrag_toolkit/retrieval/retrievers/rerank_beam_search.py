@@ -32,7 +32,7 @@ class RerankingBeamGraphSearch(SemanticGuidedBaseRetriever):
         self.max_depth = max_depth
         self.beam_width = beam_width
         self.shared_nodes = shared_nodes
-        self.score_cache = {}
+        self.score_cache = {} # keyed by (query, statement text)
         self.statement_cache = {} 
 
         # Initialize initial retrievers if provided
@@ -47,6 +47,15 @@ class RerankingBeamGraphSearch(SemanticGuidedBaseRetriever):
                     self.initial_retrievers.append(retriever)
 
 
+    def cache_fingerprint(self) -> Dict[str, Any]:
+        return {
+            'type': type(self).__qualname__,
+            'reranker': self.reranker.cache_fingerprint(),
+            'initial_retrievers': [r.cache_fingerprint() for r in self.initial_retrievers],
+            'max_depth': self.max_depth,
+            'beam_width': self.beam_width
+        }
+
     def get_statements(self, statement_ids: List[str]) -> Dict[str, Dict]:
         """Fetch statements, using cache when possible."""
         uncached_ids = [sid for sid in statement_ids if sid not in self.statement_cache]
@@ -82,7 +91,7 @@ class RerankingBeamGraphSearch(SemanticGuidedBaseRetriever):
         statement_texts: Dict[str, str]
     ) -> List[Tuple[float, str]]:
         """Rerank statements using the provided reranker."""
-        uncached_statements = [statement_texts[sid] for sid in statement_ids if statement_texts[sid] not in self.score_cache]
+        uncached_statements = [statement_texts[sid] for sid in statement_ids if (query, statement_texts[sid]) not in self.score_cache]
         
         if uncached_statements:
             pairs = [
@@ -96,11 +105,11 @@ class RerankingBeamGraphSearch(SemanticGuidedBaseRetriever):
             )
 
             for statement_text, score in zip(uncached_statements, scores):
-                self.score_cache[statement_text] = score
+                self.score_cache[(query, statement_text)] = score
             
         scored_pairs = []
         for sid in statement_ids:
-            score = self.score_cache[statement_texts[sid]]
+            score = self.score_cache[(query, statement_texts[sid])]
             scored_pairs.append(
                 (score, sid)
             )
@@ -173,13 +182,16 @@ class RerankingBeamGraphSearch(SemanticGuidedBaseRetriever):
     
     def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
         """Retrieve statements using beam search."""
+        return self._retrieve_with_seeds(query_bundle, self.shared_nodes)
+
+    def _retrieve_with_seeds(self, query_bundle: QueryBundle, shared_nodes:Optional[List[NodeWithScore]]) -> List[NodeWithScore]:
         try:
             # Get initial nodes (either shared or from initial retrievers)
             initial_statement_ids = set()
             
-            if self.shared_nodes is not None:
+            if shared_nodes is not None:
                 # Use shared nodes if available
-                for node in self.shared_nodes:
+                for node in shared_nodes:
                     initial_statement_ids.add(
                         node.node.metadata['statement']['statementId']
                     )
@@ -243,7 +255,7 @@ class RerankingBeamGraphSearch(SemanticGuidedBaseRetriever):
                             'path': path
                         }
                     )
-                    score = self.score_cache.get(statement_data['statement']['value'], 0.0)
+                    score = self.score_cache.get((query_bundle.query_str, statement_data['statement']['value']), 0.0)
                     nodes.append(NodeWithScore(node=node, score=score))
                 else:
                     logger.warning(f"Statement data not found in cache for ID: {statement_id}")
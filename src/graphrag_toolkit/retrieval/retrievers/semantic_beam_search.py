@@ -101,13 +101,16 @@ class SemanticBeamGraphSearch(SemanticGuidedBaseRetriever):
         return results
 
     def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        return self._retrieve_with_seeds(query_bundle, self.shared_nodes)
+
+    def _retrieve_with_seeds(self, query_bundle: QueryBundle, shared_nodes:Optional[List[NodeWithScore]]) -> List[NodeWithScore]:
         try:
             # 1. Get initial nodes (either shared or fallback)
             initial_statement_ids = []
-            if self.shared_nodes:
+            if shared_nodes:
                 initial_statement_ids = [
                     n.node.metadata['statement']['statementId'] 
-                    for n in self.shared_nodes
+                    for n in shared_nodes
                 ]
             else:
                 # Fallback to vector similarity
@@ -2,10 +2,12 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from abc import abstractmethod
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from graphrag_toolkit.storage.graph_store import GraphStore
 from graphrag_toolkit.storage.vector_store import VectorStore
+from graphrag_toolkit.utils.query_executor import to_executor, STAGE_RETRIEVAL
+from graphrag_toolkit.retrieval.utils.result_cache import settings_fingerprint
 
 from llama_index.core.base.base_retriever import BaseRetriever
 from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
@@ -20,6 +22,28 @@ class SemanticGuidedBaseRetriever(BaseRetriever):
         self.graph_store = graph_store
         self.vector_store = vector_store
 
+    def cache_fingerprint(self) -> Dict[str, Any]:
+        """
+        Returns the settings that determine this retriever's results, for use in result cache keys. By default,
+        the retriever's type and its public str, number and bool attributes. Retrievers that hold LLMs, rerankers
+        or prompts override this to describe them.
+        """
+        return settings_fingerprint(self)
+
     @abstractmethod
     def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
-        raise NotImplementedError()
\ No newline at end of file
+        raise NotImplementedError()
+
+    async def _aretrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        return await to_executor(STAGE_RETRIEVAL, self._retrieve, query_bundle)
+
+    def _retrieve_with_seeds(self, query_bundle: QueryBundle, shared_nodes:Optional[List[NodeWithScore]]) -> List[NodeWithScore]:
+        """
+        Retrieves results starting from the supplied seed nodes. Seeds are passed per call, rather than
+        set on the retriever, because retrievers are shared by concurrent queries. Retrievers that do
+        not start from seed nodes ignore them.
+        """
+        return self._retrieve(query_bundle)
+
+    async def _aretrieve_with_seeds(self, query_bundle: QueryBundle, shared_nodes:Optional[List[NodeWithScore]]) -> List[NodeWithScore]:
+        return await to_executor(STAGE_RETRIEVAL, self._retrieve_with_seeds, query_bundle, shared_nodes)
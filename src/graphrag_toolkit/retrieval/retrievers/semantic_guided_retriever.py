@@ -2,8 +2,9 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+import asyncio
 from collections import defaultdict
-from typing import List, Optional, Any, Union, Type
+from typing import Dict, List, Optional, Any, Union, Type
 
 from llama_index.core.base.base_retriever import BaseRetriever
 from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
@@ -11,6 +12,7 @@ from llama_index.core.async_utils import run_async_tasks
 
 from graphrag_toolkit.storage.graph_store import GraphStore
 from graphrag_toolkit.storage import VectorStore
+from graphrag_toolkit.storage.embedding_snapshot import EmbeddingSnapshotType, load_embedding_snapshot
 
 from graphrag_toolkit.retrieval.retrievers.semantic_guided_base_retriever import SemanticGuidedBaseRetriever
 from graphrag_toolkit.retrieval.retrievers.keyword_ranking_search import KeywordRankingSearch
@@ -18,6 +20,8 @@ from graphrag_toolkit.retrieval.retrievers.statement_cosine_seach import Stateme
 from graphrag_toolkit.retrieval.retrievers.semantic_beam_search import SemanticBeamGraphSearch
 from graphrag_toolkit.retrieval.retrievers.rerank_beam_search import RerankingBeamGraphSearch
 from graphrag_toolkit.retrieval.utils.statement_utils import get_statements_query, SharedEmbeddingCache
+from graphrag_toolkit.retrieval.utils.result_cache import resolve_index_generation
+from graphrag_toolkit.utils.query_executor import to_executor, STAGE_GRAPH, STAGE_RETRIEVAL
 
 logger = logging.getLogger(__name__)
 
@@ -30,13 +34,20 @@ class SemanticGuidedRetriever(SemanticGuidedBaseRetriever):
         graph_store: GraphStore,
         retrievers: Optional[List[Union[SemanticGuidedBaseRetriever, Type[SemanticGuidedBaseRetriever]]]] = None,
         share_results: bool = True,
+        embedding_snapshot: Optional[EmbeddingSnapshotType] = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(vector_store, graph_store, **kwargs)
         self.share_results = share_results
+        self.result_cache = kwargs.get('result_cache', None)
+        self.index_generation = kwargs.get('index_generation', None)
+        self.retriever_args = kwargs
         
-        # Create shared embedding cache
-        self.shared_embedding_cache = SharedEmbeddingCache(vector_store)
+        # Create shared embedding cache, warm-started from snapshot if supplied
+        self.shared_embedding_cache = SharedEmbeddingCache(
+            vector_store,
+            snapshot=load_embedding_snapshot(embedding_snapshot, graph_store)
+        )
 
         self.initial_retrievers = []
         self.graph_retrievers = []
@@ -78,21 +89,102 @@ class SemanticGuidedRetriever(SemanticGuidedBaseRetriever):
                 )
             ]
 
+    def _result_cache_args(self) -> Dict[str, Any]:
+        return self.retriever_args | {
+            'share_results': self.share_results,
+            'retrievers': [r.cache_fingerprint() for r in self.initial_retrievers + self.graph_retrievers]
+        }
+
+    def _result_cache_key(self, query_bundle:QueryBundle):
+        if self.result_cache is None:
+            return None
+        return self.result_cache.key_for(
+            query_bundle.query_str,
+            type(self).__name__,
+            self._result_cache_args(),
+            resolve_index_generation(self.index_generation, self.graph_store),
+            self.graph_store,
+            self.vector_store
+        )
+
+    def _get_cached_results(self, result_cache_key) -> Optional[List[NodeWithScore]]:
+        return self.result_cache.get(result_cache_key) if result_cache_key is not None else None
+
+    def _cache_results(self, result_cache_key, results:List[NodeWithScore]):
+        if result_cache_key is not None:
+            self.result_cache.put(result_cache_key, results)
+
+    def _collect_unique_nodes(self, results:List[List[NodeWithScore]], seen_statement_ids:set) -> List[NodeWithScore]:
+        unique_nodes = []
+        for nodes in results:
+            for node in nodes:
+                statement_id = node.node.metadata['statement']['statementId']
+                if statement_id not in seen_statement_ids:
+                    seen_statement_ids.add(statement_id)
+                    unique_nodes.append(node)
+        return unique_nodes
+
+    def _to_final_nodes(self, all_nodes:List[NodeWithScore], statements) -> List[NodeWithScore]:
+
+        # 5. Create final nodes with full data
+        final_nodes = []
+        statements_map = {
+            s['result']['statement']['statementId']: s['result'] 
+            for s in statements
+        }
+        
+        for node in all_nodes:
+            statement_id = node.node.metadata['statement']['statementId']
+            if statement_id in statements_map:
+                result = statements_map[statement_id]
+                new_node = TextNode(
+                    text=result['statement']['value'],
+                    metadata={
+                        **node.node.metadata,  # Preserve retriever metadata
+                        'statement': result['statement'],
+                        'chunk': result['chunk'],
+                        'source': result['source']                     
+                    }
+                )
+                final_nodes.append(NodeWithScore(
+                    node=new_node,
+                    score=node.score
+                ))
+
+        # 6. Group by source for better context
+        source_nodes = defaultdict(list)
+        for node in final_nodes:
+            source_id = node.node.metadata['source']['sourceId']
+            source_nodes[source_id].append(node)
+
+        # 7. Create final ordered list
+        ordered_nodes = []
+        for source_id, nodes in source_nodes.items():
+            nodes.sort(key=lambda x: x.score or 0.0, reverse=True)
+            ordered_nodes.extend(nodes)
+
+        return ordered_nodes
+
+    def _statement_ids_for(self, all_nodes:List[NodeWithScore]) -> List[str]:
+        return [
+            node.node.metadata['statement']['statementId'] 
+            for node in all_nodes
+        ]
+
     def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
         try:
+            result_cache_key = self._result_cache_key(query_bundle)
+            cached_results = self._get_cached_results(result_cache_key)
+            if cached_results is not None:
+                return cached_results
+
             # 1. Get initial results in parallel
             tasks = [r.aretrieve(query_bundle) for r in self.initial_retrievers]
             initial_results = run_async_tasks(tasks)
 
             # 2. Collect unique initial nodes
             seen_statement_ids = set()
-            initial_nodes = []
-            for nodes in initial_results:
-                for node in nodes:
-                    statement_id = node.node.metadata['statement']['statementId']
-                    if statement_id not in seen_statement_ids:
-                        seen_statement_ids.add(statement_id)
-                        initial_nodes.append(node)
+            initial_nodes = self._collect_unique_nodes(initial_results, seen_statement_ids)
 
             all_nodes = initial_nodes.copy()
 
@@ -100,13 +192,8 @@ class SemanticGuidedRetriever(SemanticGuidedBaseRetriever):
             if self.share_results and initial_nodes:
                 for retriever in self.graph_retrievers:
                     try:
-                        retriever.shared_nodes = initial_nodes
-                        graph_nodes = retriever.retrieve(query_bundle)
-                        for node in graph_nodes:
-                            statement_id = node.node.metadata['statement']['statementId']
-                            if statement_id not in seen_statement_ids:
-                                seen_statement_ids.add(statement_id)
-                                all_nodes.append(node)
+                        graph_nodes = retriever._retrieve_with_seeds(query_bundle, initial_nodes)
+                        all_nodes.extend(self._collect_unique_nodes([graph_nodes], seen_statement_ids))
                     except Exception as e:
                         logger.error(f"Error in graph retriever {retriever.__class__.__name__}: {e}")
                         continue
@@ -115,51 +202,58 @@ class SemanticGuidedRetriever(SemanticGuidedBaseRetriever):
             if not all_nodes:
                 return []
 
-            statement_ids = [
-                node.node.metadata['statement']['statementId'] 
-                for node in all_nodes
-            ]
-            statements = get_statements_query(self.graph_store, statement_ids)
-
-            # 5. Create final nodes with full data
-            final_nodes = []
-            statements_map = {
-                s['result']['statement']['statementId']: s['result'] 
-                for s in statements
-            }
-            
-            for node in all_nodes:
-                statement_id = node.node.metadata['statement']['statementId']
-                if statement_id in statements_map:
-                    result = statements_map[statement_id]
-                    new_node = TextNode(
-                        text=result['statement']['value'],
-                        metadata={
-                            **node.node.metadata,  # Preserve retriever metadata
-                            'statement': result['statement'],
-                            'chunk': result['chunk'],
-                            'source': result['source']                     
-                        }
-                    )
-                    final_nodes.append(NodeWithScore(
-                        node=new_node,
-                        score=node.score
-                    ))
+            statements = get_statements_query(self.graph_store, self._statement_ids_for(all_nodes))
+
+            results = self._to_final_nodes(all_nodes, statements)
+            self._cache_results(result_cache_key, results)
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error in StatementGraphRetriever: {e}")
+            return []
+
+    async def _aretrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        try:
+            result_cache_key = None
+            if self.result_cache is not None:
+                # Reading the index generation, or the disk tier, may block
+                result_cache_key = await to_executor(STAGE_RETRIEVAL, self._result_cache_key, query_bundle)
+                cached_results = await to_executor(STAGE_RETRIEVAL, self._get_cached_results, result_cache_key)
+                if cached_results is not None:
+                    return cached_results
+
+            # 1. Get initial results concurrently
+            initial_results = await asyncio.gather(*[r.aretrieve(query_bundle) for r in self.initial_retrievers])
+
+            # 2. Collect unique initial nodes
+            seen_statement_ids = set()
+            initial_nodes = self._collect_unique_nodes(initial_results, seen_statement_ids)
+
+            all_nodes = initial_nodes.copy()
+
+            # 3. Graph expansion if enabled - seed nodes are passed per call, as retrievers are shared by concurrent queries
+            if self.share_results and initial_nodes:
+                for retriever in self.graph_retrievers:
+                    try:
+                        graph_nodes = await retriever._aretrieve_with_seeds(query_bundle, initial_nodes)
+                        all_nodes.extend(self._collect_unique_nodes([graph_nodes], seen_statement_ids))
+                    except Exception as e:
+                        logger.error(f"Error in graph retriever {retriever.__class__.__name__}: {e}")
+                        continue
+
+            # 4. Fetch statements once
+            if not all_nodes:
+                return []
 
-            # 6. Group by source for better context
-            source_nodes = defaultdict(list)
-            for node in final_nodes:
-                source_id = node.node.metadata['source']['sourceId']
-                source_nodes[source_id].append(node)
+            statements = await to_executor(STAGE_GRAPH, get_statements_query, self.graph_store, self._statement_ids_for(all_nodes))
 
-            # 7. Create final ordered list
-            ordered_nodes = []
-            for source_id, nodes in source_nodes.items():
-                nodes.sort(key=lambda x: x.score or 0.0, reverse=True)
-                ordered_nodes.extend(nodes)
+            results = self._to_final_nodes(all_nodes, statements)
+            if result_cache_key is not None:
+                await to_executor(STAGE_RETRIEVAL, self._cache_results, result_cache_key, results)
 
-            return ordered_nodes
+            return results
 
         except Exception as e:
             logger.error(f"Error in StatementGraphRetriever: {e}")
-            return []
\ No newline at end of file
+            return []
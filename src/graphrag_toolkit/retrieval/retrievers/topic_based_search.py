@@ -2,15 +2,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
-import concurrent.futures
 from typing import List, Optional, Type
 
-from graphrag_toolkit.retrieval.model import SearchResultCollection
+from graphrag_toolkit.retrieval.internal_model import SearchResultCollection
 from graphrag_toolkit.storage.vector_store import VectorStore
 from graphrag_toolkit.storage.graph_store import GraphStore
 from graphrag_toolkit.retrieval.processors import ProcessorBase, ProcessorArgs
 from graphrag_toolkit.retrieval.retrievers.traversal_based_base_retriever import TraversalBasedBaseRetriever
-from graphrag_toolkit.retrieval.utils.vector_utils import get_diverse_vss_elements
+from graphrag_toolkit.retrieval.utils.vector_utils import get_diverse_vss_elements, aget_diverse_vss_elements
+from graphrag_toolkit.retrieval.utils.query_context import memoize, amemoize, graph_query_key
 
 from llama_index.core.schema import QueryBundle
 
@@ -32,23 +32,54 @@ class TopicBasedSearch(TraversalBasedBaseRetriever):
             **kwargs
         )
     
-    def topic_based_graph_search(self, topic_id):
+    def _topic_based_graph_search_query(self, topic_ids):
 
+        # One query for all start topics: statement and result limits are applied per topic
         cypher = self.create_cypher_query(f'''
-        // topic-based graph search                                  
+        // topic-based graph search
+        UNWIND $topicIds AS topicId
         MATCH (f:`__Fact__`)-[:`__NEXT__`*0..1]-(:`__Fact__`)-[:`__SUPPORTS__`]->(:`__Statement__`)-[:`__BELONGS_TO__`]->(tt:`__Topic__`)
-        WHERE {self.graph_store.node_id("tt.topicId")} = $topicId
-        WITH f LIMIT $statementLimit
+        WHERE {self.graph_store.node_id("tt.topicId")} = topicId
+        WITH topicId, collect(f)[0..$statementLimit] AS facts
+        UNWIND facts AS f
         MATCH (f)-[:`__SUPPORTS__`]->(:`__Statement__`)-[:`__PREVIOUS__`*0..2]-(l:`__Statement__`)-[:`__BELONGS_TO__`]->(t:`__Topic__`)
-        ''')
-                                  
+        ''', group_by='topicId')
+                                          
         properties = {
-            'topicId': topic_id,
+            'topicIds': topic_ids,
             'limit': self.args.query_limit,
             'statementLimit': self.args.intermediate_limit
         }
                                           
-        return self.graph_store.execute_query(cypher, properties)
+        return (cypher, properties)
+
+    def batch_topic_based_graph_search(self, topic_ids:List[str]):
+        if not topic_ids:
+            return []
+        (cypher, properties) = self._topic_based_graph_search_query(topic_ids)
+        results = memoize(
+            self.args.query_context,
+            graph_query_key(cypher, properties),
+            lambda: self.graph_store.execute_query(cypher, properties)
+        )
+        return self.ungroup_search_results(topic_ids, results)
+
+    async def abatch_topic_based_graph_search(self, topic_ids:List[str]):
+        if not topic_ids:
+            return []
+        (cypher, properties) = self._topic_based_graph_search_query(topic_ids)
+        results = await amemoize(
+            self.args.query_context,
+            graph_query_key(cypher, properties),
+            lambda: self.graph_store.aexecute_query(cypher, properties)
+        )
+        return self.ungroup_search_results(topic_ids, results)
+
+    def topic_based_graph_search(self, topic_id):
+        return self.batch_topic_based_graph_search([topic_id])
+
+    async def atopic_based_graph_search(self, topic_id):
+        return await self.abatch_topic_based_graph_search([topic_id])
 
     def get_start_node_ids(self, query_bundle: QueryBundle) -> List[str]:
 
@@ -57,40 +88,38 @@ class TopicBasedSearch(TraversalBasedBaseRetriever):
         topics = get_diverse_vss_elements('topic', query_bundle, self.vector_store, self.args)
         
         return [topic['topic']['topicId'] for topic in topics]
+
+    async def aget_start_node_ids(self, query_bundle: QueryBundle) -> List[str]:
+
+        logger.debug('Getting start node ids for topic-based search...')
+
+        topics = await aget_diverse_vss_elements('topic', query_bundle, self.vector_store, self.args)
+        
+        return [topic['topic']['topicId'] for topic in topics]
     
     def do_graph_search(self, query_bundle: QueryBundle, start_node_ids:List[str]) -> SearchResultCollection:
-        
-        topic_ids = start_node_ids
 
         logger.debug('Running topic-based search...')
-        
-        search_results = []
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.args.num_workers) as executor:
-
-            futures = [
-                executor.submit(self.topic_based_graph_search, topic_id)
-                for topic_id in topic_ids
-            ]
-            
-            executor.shutdown()
-
-            for future in futures:
-                for result in future.result():
-                    search_results.append(result)
+
+        search_results = self.batch_topic_based_graph_search(start_node_ids)
                     
+        return self._to_logged_search_results_collection(search_results)
+
+    async def ado_graph_search(self, query_bundle: QueryBundle, start_node_ids:List[str]) -> SearchResultCollection:
+
+        logger.debug('Running topic-based search...')
+
+        search_results = await self.abatch_topic_based_graph_search(start_node_ids)
+
+        return self._to_logged_search_results_collection(search_results)
+
+    def _to_logged_search_results_collection(self, search_results) -> SearchResultCollection:
+
         search_results_collection = self._to_search_results_collection(search_results) 
         
         retriever_name = type(self).__name__
         if retriever_name in self.args.debug_results and logger.isEnabledFor(logging.DEBUG):
-            logger.debug(f'''Topic-based results: {search_results_collection.model_dump_json(
-                    indent=2, 
-                    exclude_unset=True, 
-                    exclude_defaults=True, 
-                    exclude_none=True, 
-                    warnings=False)
-                }''')
+            logger.debug(f'''Topic-based results: {search_results_collection.to_json()}''')
                    
         
         return search_results_collection
-    
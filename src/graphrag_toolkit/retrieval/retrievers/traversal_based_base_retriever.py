@@ -4,15 +4,22 @@
 import logging
 import abc
 import time
-from typing import List, Any, Type, Optional
+from typing import Dict, List, Any, Type, Optional
 
 from graphrag_toolkit.storage.graph_store import GraphStore
+from graphrag_toolkit.utils.tracing import traced
 from graphrag_toolkit.storage.vector_store import VectorStore
-from graphrag_toolkit.retrieval.model import SearchResultCollection, SearchResult, Source, ScoredEntity
+from graphrag_toolkit.storage.statement_lexical_index import StatementLexicalIndex
+from graphrag_toolkit.retrieval import model
+from graphrag_toolkit.retrieval.model import ScoredEntity
+from graphrag_toolkit.retrieval.internal_model import SearchResultCollection, SearchResult
 from graphrag_toolkit.retrieval.processors import *
+from graphrag_toolkit.retrieval.utils.search_result_nodes import SearchResultNode
+from graphrag_toolkit.retrieval.utils.result_cache import resolve_index_generation
+from graphrag_toolkit.utils.query_executor import to_executor, STAGE_RETRIEVAL
 
 from llama_index.core.base.base_retriever import BaseRetriever
-from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+from llama_index.core.schema import NodeWithScore, QueryBundle
 
 logger = logging.getLogger(__name__)
 
@@ -53,38 +60,164 @@ class TraversalBasedBaseRetriever(BaseRetriever):
         self.processors = processors if processors is not None else DEFAULT_PROCESSORS
         self.formatting_processors = formatting_processors if formatting_processors is not None else DEFAULT_FORMATTING_PROCESSORS
         self.entities = entities or []
+
+        if self.args.statement_index_path:
+            StatementLexicalIndex.for_path(self.args.statement_index_path, graph_store)
+
+        if self.args.entity_dictionary is not None:
+            self.args.entity_dictionary.ensure_loaded(graph_store)
         
-    def create_cypher_query(self, match_clause):
+    def create_cypher_query(self, match_clause, group_by:Optional[str]=None):
+        """
+        Appends the clauses that assemble search results to match_clause, which must bind statements
+        to l and their topics to t.
+
+        If group_by is supplied, match_clause is expected to UNWIND a list of start node ids into the
+        group_by variable, and the statement and result limits are applied per id. The query then
+        returns one row per id – { id, results } – which can be ungrouped with ungroup_search_results().
+        """
+
+        g = f'{group_by}, ' if group_by else ''
+
+        if group_by:
+            limit_statements_clause = f'''
+        WITH DISTINCT {g}l, t
+        WITH {g}collect([l, t])[0..$statementLimit] AS statementTopics
+        UNWIND statementTopics AS statementTopic
+        WITH {g}statementTopic[0] AS l, statementTopic[1] AS t'''
+        else:
+            limit_statements_clause = '''
+        WITH DISTINCT l, t LIMIT $statementLimit'''
 
-        return_clause = f'''
-        WITH DISTINCT l, t LIMIT $statementLimit
+        return_clause = f'''{limit_statements_clause}
         MATCH (l:`__Statement__`)-[:`__MENTIONED_IN__`]->(c:`__Chunk__`)-[:`__EXTRACTED_FROM__`]->(s:`__Source__`)
         OPTIONAL MATCH (f:`__Fact__`)-[:`__SUPPORTS__`]->(l:`__Statement__`)
-        WITH {{ sourceId: {self.graph_store.node_id("s.sourceId")}, metadata: s{{.*}}}} AS source,
+        WITH {g}{{ sourceId: {self.graph_store.node_id("s.sourceId")}, metadata: s{{.*}}}} AS source,
             t,
             {{ chunkId: {self.graph_store.node_id("c.chunkId")}, value: NULL }} AS cc, 
             {{ statementId: {self.graph_store.node_id("l.statementId")}, statement: l.value, facts: collect(distinct f.value), details: l.details, chunkId: {self.graph_store.node_id("c.chunkId")}, score: count(l) }} as ll
-        WITH source, 
+        WITH {g}source, 
             t, 
             collect(distinct cc) as chunks, 
             collect(distinct ll) as statements
-        WITH source,
+        WITH {g}source,
             {{ 
                 topic: t.value, 
                 chunks: chunks,
                 statements: statements
-            }} as topic
+            }} as topic'''
+
+        if group_by:
+            return_clause += f'''
+        WITH {g}{{
+            score: sum(size(topic.statements)/size(topic.chunks)), 
+            source: source,
+            topics: collect(distinct topic)
+        }} as result ORDER BY result.score DESC
+        WITH {g}collect(result)[0..$limit] AS results
         RETURN {{
+            id: {group_by},
+            results: results
+        }} as result'''
+        else:
+            return_clause += '''
+        RETURN {
             score: sum(size(topic.statements)/size(topic.chunks)), 
             source: source,
             topics: collect(distinct topic)
-        }} as result ORDER BY result.score DESC LIMIT $limit'''
+        } as result ORDER BY result.score DESC LIMIT $limit'''
 
         return f'{match_clause}{return_clause}'
 
+    def ungroup_search_results(self, ids:List[str], results:List[Any]) -> List[Any]:
+        """Returns the per-id results of a query created with create_cypher_query(..., group_by=...), in the order of ids."""
+        results_by_id = {
+            result['result']['id']: result['result']['results']
+            for result in results
+        }
+        return [
+            {'result': result}
+            for id in ids
+            for result in results_by_id.get(id, [])
+        ]
+
+    def _process_search_results(self, search_results:SearchResultCollection, query_bundle:QueryBundle) -> List[NodeWithScore]:
+
+        if isinstance(search_results, model.SearchResultCollection):
+            search_results = SearchResultCollection.from_model(search_results)
+
+        for processor in self.processors:
+            search_results = processor(self.args).process_results(search_results, query_bundle, type(self).__name__)
+
+        # Formatting processors modify results in place, so format a copy (without formatting processors,
+        # SearchResultNode copies the result it carries as the formatted result)
+        formatted_search_results = search_results.copy() if self.formatting_processors else search_results
+        
+        for processor in self.formatting_processors:
+            formatted_search_results = processor(self.args).process_results(formatted_search_results, query_bundle, type(self).__name__)
+
+        # With serialize_results=False, nodes carry the search results as objects and are
+        # serialized by the consumer (e.g. the query engine) only when required
+        return [
+            NodeWithScore(
+                node=SearchResultNode.from_search_result(
+                    search_result, 
+                    formatted_search_result, 
+                    materialize=self.args.serialize_results
+                ), 
+                score=search_result.score
+            ) 
+            for (search_result, formatted_search_result) in zip(search_results.results, formatted_search_results.results)
+        ]
+
+    def _result_cache_args(self) -> Dict[str, Any]:
+        return self.args.to_dict({
+            'processors': [p.__name__ for p in self.processors],
+            'formatting_processors': [p.__name__ for p in self.formatting_processors],
+            'entities': [e.entity.entityId for e in self.entities]
+        })
+
+    def _result_cache_key(self, query_bundle:QueryBundle):
+        if self.args.result_cache is None:
+            return None
+        return self.args.result_cache.key_for(
+            query_bundle.query_str, 
+            type(self).__name__, 
+            self._result_cache_args(), 
+            resolve_index_generation(self.args.index_generation, self.graph_store),
+            self.graph_store,
+            self.vector_store
+        )
+
+    def _get_cached_results(self, result_cache_key) -> Optional[List[NodeWithScore]]:
+        if result_cache_key is None:
+            return None
+        results = self.args.result_cache.get(result_cache_key)
+        if results is not None:
+            logger.debug(f'[{type(self).__name__}] Returning cached results [num_results: {len(results)}]')
+        return results
+
+    def _cache_results(self, result_cache_key, results:List[NodeWithScore]):
+        if result_cache_key is not None:
+            self.args.result_cache.put(result_cache_key, results)
+
+    def _log_timings(self, start_retrieve:float, end_retrieve:float, end_processing:float):
+
+        retrieval_ms = (end_retrieve-start_retrieve) * 1000
+        processing_ms = (end_processing-end_retrieve) * 1000
+
+        logger.debug(f'[{type(self).__name__}] Retrieval: {retrieval_ms:.2f}ms')
+        logger.debug(f'[{type(self).__name__}] Processing: {processing_ms:.2f}ms')
+
+    @traced('retrieve', lambda self, query_bundle: {'retriever': type(self).__name__})
     def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
 
         logger.debug(f'[{type(self).__name__}] Begin retrieve [args: {self.args.to_dict()}]')
+
+        result_cache_key = self._result_cache_key(query_bundle)
+        cached_results = self._get_cached_results(result_cache_key)
+        if cached_results is not None:
+            return cached_results
         
         start_retrieve = time.time()
         
@@ -93,37 +226,52 @@ class TraversalBasedBaseRetriever(BaseRetriever):
 
         end_retrieve = time.time()
 
-        for processor in self.processors:
-            search_results = processor(self.args).process_results(search_results, query_bundle, type(self).__name__)
+        results = self._process_search_results(search_results, query_bundle)
+        
+        end_processing = time.time()
+
+        self._log_timings(start_retrieve, end_retrieve, end_processing)
+
+        self._cache_results(result_cache_key, results)
+
+        return results
+
+    @traced('retrieve', lambda self, query_bundle: {'retriever': type(self).__name__})
+    async def _aretrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
 
-        formatted_search_results = search_results.model_copy(deep=True)
+        logger.debug(f'[{type(self).__name__}] Begin async retrieve [args: {self.args.to_dict()}]')
+
+        result_cache_key = None
+        if self.args.result_cache is not None:
+            # Reading the index generation, or the disk tier, may block
+            result_cache_key = await to_executor(STAGE_RETRIEVAL, self._result_cache_key, query_bundle)
+            cached_results = await to_executor(STAGE_RETRIEVAL, self._get_cached_results, result_cache_key)
+            if cached_results is not None:
+                return cached_results
         
-        for processor in self.formatting_processors:
-            formatted_search_results = processor(self.args).process_results(formatted_search_results, query_bundle, type(self).__name__)
+        start_retrieve = time.time()
+        
+        start_node_ids = await self.aget_start_node_ids(query_bundle)
+        search_results:SearchResultCollection = await self.ado_graph_search(query_bundle, start_node_ids)
+
+        end_retrieve = time.time()
+
+        # Processors may be CPU-bound (e.g. model-based reranking), so run off the event loop
+        results = await to_executor(STAGE_RETRIEVAL, self._process_search_results, search_results, query_bundle)
         
         end_processing = time.time()
 
-        retrieval_ms = (end_retrieve-start_retrieve) * 1000
-        processing_ms = (end_processing-end_retrieve) * 1000
+        self._log_timings(start_retrieve, end_retrieve, end_processing)
 
-        logger.debug(f'[{type(self).__name__}] Retrieval: {retrieval_ms:.2f}ms')
-        logger.debug(f'[{type(self).__name__}] Processing: {processing_ms:.2f}ms')
+        if result_cache_key is not None:
+            await to_executor(STAGE_RETRIEVAL, self._cache_results, result_cache_key, results)
 
-        return [
-            NodeWithScore(
-                node=TextNode(
-                    text=formatted_search_result.model_dump_json(exclude_none=True, exclude_defaults=True, indent=2),
-                    metadata=search_result.model_dump(exclude_none=True, exclude_unset=True, exclude_defaults=True)
-                ), 
-                score=search_result.score
-            ) 
-            for (search_result, formatted_search_result) in zip(search_results.results, formatted_search_results.results)
-        ]
+        return results
     
     def _to_search_results_collection(self, results:List[Any]) -> SearchResultCollection:
         
         search_results = [
-            SearchResult.model_validate(result['result']) 
+            SearchResult.from_dict(result['result']) 
             for result in results
         ]
 
@@ -135,4 +283,10 @@ class TraversalBasedBaseRetriever(BaseRetriever):
     
     @abc.abstractmethod
     def do_graph_search(self, query_bundle: QueryBundle, start_node_ids:List[str]) -> SearchResultCollection:
-        pass
\ No newline at end of file
+        pass
+
+    async def aget_start_node_ids(self, query_bundle: QueryBundle) -> List[str]:
+        return await to_executor(STAGE_RETRIEVAL, self.get_start_node_ids, query_bundle)
+    
+    async def ado_graph_search(self, query_bundle: QueryBundle, start_node_ids:List[str]) -> SearchResultCollection:
+        return await to_executor(STAGE_RETRIEVAL, self.do_graph_search, query_bundle, start_node_ids)
\ No newline at end of file
@@ -0,0 +1,235 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+import logging
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from graphrag_toolkit.retrieval.utils.keyword_cache import normalize_query
+
+from llama_index.core.schema import NodeWithScore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+DEFAULT_MAX_SIZE = 1000
+DEFAULT_TTL_SECONDS = 3600
+SWEEP_INTERVAL_SECONDS = 60
+
+class CachedAnswer():
+    """An answer returned from the AnswerCache, with the similarity between the new and the cached question."""
+
+    __slots__ = ('query_str', 'answer', 'source_nodes', 'metadata', 'cached_at', 'similarity')
+
+    def __init__(self, query_str:str, answer:str, source_nodes:List[NodeWithScore], metadata:Dict[str, Any], cached_at:float, similarity:float):
+        self.query_str = query_str
+        self.answer = answer
+        self.source_nodes = source_nodes
+        self.metadata = metadata
+        self.cached_at = cached_at
+        self.similarity = similarity
+
+
+class _AnswerCacheEntry():
+
+    __slots__ = ('partition', 'query_str', 'normalized_query', 'embedding', 'answer', 'source_nodes', 'metadata', 'cached_at', 'expires_at')
+
+    def __init__(self, partition, query_str, embedding, answer, source_nodes, metadata, cached_at, expires_at):
+        self.partition = partition
+        self.query_str = query_str
+        self.normalized_query = normalize_query(query_str)
+        self.embedding = embedding
+        self.answer = answer
+        self.source_nodes = source_nodes
+        self.metadata = metadata
+        self.cached_at = cached_at
+        self.expires_at = expires_at
+
+
+class AnswerCache():
+    """
+    A bounded, in-memory cache of the answers generated by a LexicalGraphQueryEngine, for answering
+    paraphrases of earlier questions without retrieval or an LLM call.
+
+    Entries are partitioned by namespace (the engine's LLM, prompts and retriever), tenant id and index
+    generation, so that an answer is only reused for the same engine configuration, tenant and version
+    of the indexed data. Within a partition, a question matches a cached question if their normalized
+    query strings are equal, or if the cosine similarity of their embeddings is at least
+    similarity_threshold. Entries expire after ttl_seconds (None for no expiry): an expired entry is removed
+    when a lookup matches it, and put() sweeps out the others at most once every SWEEP_INTERVAL_SECONDS.
+    The least recently used entries are evicted once the cache holds max_size entries.
+    """
+
+    def __init__(self,
+                 similarity_threshold:float=DEFAULT_SIMILARITY_THRESHOLD,
+                 max_size:int=DEFAULT_MAX_SIZE,
+                 ttl_seconds:Optional[float]=DEFAULT_TTL_SECONDS):
+
+        self.similarity_threshold = similarity_threshold
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries:OrderedDict[int, _AnswerCacheEntry] = OrderedDict()
+        self._entry_ids:Dict[Tuple[Hashable, str], int] = {}
+        self._matrices:Dict[Hashable, Tuple[List[int], np.ndarray]] = {}
+        self._next_id = 0
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _to_unit_vector(self, embedding:Optional[List[float]]) -> Optional[np.ndarray]:
+        if embedding is None:
+            return None
+        v = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        return v / norm if norm > 0 else None
+
+    def _remove(self, entry_id:int):
+        entry = self._entries.pop(entry_id)
+        del self._entry_ids[(entry.partition, entry.normalized_query)]
+        self._matrices.pop(entry.partition, None)
+
+    def _is_expired(self, entry:_AnswerCacheEntry, now:float) -> bool:
+        return entry.expires_at is not None and entry.expires_at <= now
+
+    def _expire(self, entry_ids:List[int]):
+        for entry_id in entry_ids:
+            self._remove(entry_id)
+        self.expirations += len(entry_ids)
+
+    def _remove_expired(self, now:float):
+        # Lookups expire the entries they match; the full sweep, which reclaims entries that are
+        # never looked up again, runs on put(), at most once every SWEEP_INTERVAL_SECONDS
+        if self.ttl_seconds is None or now < self._next_sweep:
+            return
+        self._next_sweep = now + SWEEP_INTERVAL_SECONDS
+        self._expire([
+            entry_id
+            for entry_id, entry in self._entries.items()
+            if self._is_expired(entry, now)
+        ])
+
+    def _partition_matrix(self, partition:Hashable) -> Tuple[List[int], Optional[np.ndarray]]:
+        # Embeddings for each partition are stacked lazily, and restacked after the partition changes
+        if partition not in self._matrices:
+            entry_ids = [
+                entry_id
+                for entry_id, entry in self._entries.items()
+                if entry.partition == partition and entry.embedding is not None
+            ]
+            matrix = np.stack([self._entries[entry_id].embedding for entry_id in entry_ids]) if entry_ids else None
+            self._matrices[partition] = (entry_ids, matrix)
+        return self._matrices[partition]
+
+    def get(self, query_str:str, embedding:Optional[List[float]], partition:Hashable) -> Optional[CachedAnswer]:
+        """Returns the cached answer for the question, or None."""
+
+        if not self.enabled:
+            return None
+
+        normalized_query = normalize_query(query_str)
+        v = self._to_unit_vector(embedding)
+
+        now = time.monotonic()
+
+        with self._lock:
+
+            match_id = self._entry_ids.get((partition, normalized_query))
+            similarity = 1.0
+
+            if match_id is not None and self._is_expired(self._entries[match_id], now):
+                self._expire([match_id])
+                match_id = None
+
+            if match_id is not None:
+                self.hits += 1
+            elif v is not None:
+                entry_ids, matrix = self._partition_matrix(partition)
+                if matrix is not None:
+                    similarities = matrix @ v
+                    # Candidates at or above the threshold, most similar first; expired candidates are removed
+                    candidates = np.flatnonzero(similarities >= self.similarity_threshold)
+                    expired_ids = []
+                    for i in candidates[np.argsort(-similarities[candidates], kind='stable')]:
+                        if self._is_expired(self._entries[entry_ids[i]], now):
+                            expired_ids.append(entry_ids[i])
+                        else:
+                            match_id, similarity = entry_ids[i], float(similarities[i])
+                            self.semantic_hits += 1
+                            break
+                    self._expire(expired_ids)
+
+            if match_id is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(match_id)
+            entry = self._entries[match_id]
+
+            logger.debug(f'Answer cache hit [query: {query_str}, cached_query: {entry.query_str}, similarity: {similarity:.4f}]')
+
+            return CachedAnswer(entry.query_str, entry.answer, list(entry.source_nodes), dict(entry.metadata), entry.cached_at, similarity)
+
+    def put(self, query_str:str, embedding:Optional[List[float]], partition:Hashable, answer:str, source_nodes:List[NodeWithScore], metadata:Dict[str, Any]):
+        """Caches the answer to the question. Empty answers are not cached."""
+
+        if not self.enabled or not answer:
+            return
+
+        now = time.monotonic()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds is not None else None
+        entry = _AnswerCacheEntry(partition, query_str, self._to_unit_vector(embedding), answer, list(source_nodes), dict(metadata), time.time(), expires_at)
+
+        with self._lock:
+
+            self._remove_expired(now)
+
+            existing_id = self._entry_ids.get((partition, entry.normalized_query))
+            if existing_id is not None:
+                self._remove(existing_id)
+
+            self._entries[self._next_id] = entry
+            self._entry_ids[(partition, entry.normalized_query)] = self._next_id
+            self._next_id += 1
+            self._matrices.pop(partition, None)
+
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._entry_ids.clear()
+            self._matrices.clear()
+            self._next_sweep = 0.0
+            self._reset_stats()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.semantic_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'semantic_hits': self.semantic_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.semantic_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+    def __repr__(self):
+        return f'AnswerCache(similarity_threshold={self.similarity_threshold}, max_size={self.max_size}, ttl_seconds={self.ttl_seconds})'
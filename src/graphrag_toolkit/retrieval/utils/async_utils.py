@@ -0,0 +1,15 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from typing import Any, Awaitable, List
+
+async def gather_with_concurrency(max_concurrency:int, *aws:Awaitable[Any]) -> List[Any]:
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency or 1))
+
+    async def with_semaphore(aw:Awaitable[Any]):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*[with_semaphore(aw) for aw in aws])
@@ -0,0 +1,307 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import heapq
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from graphrag_toolkit.retrieval import internal_model
+from graphrag_toolkit.retrieval.internal_model import SearchResult, Source, Topic
+from graphrag_toolkit.retrieval.utils.search_result_nodes import SearchResultNode, internal_search_result_from, internal_formatted_search_result_from
+
+from llama_index.core.schema import NodeWithScore
+from llama_index.core.utils import get_tokenizer
+
+logger = logging.getLogger(__name__)
+
+TokenizerType = Callable[[str], List]
+
+# Approximate tokens added by the context format (keys, brackets, separators) around each element
+STATEMENT_OVERHEAD_TOKENS = 2
+TOPIC_OVERHEAD_TOKENS = 6
+SOURCE_OVERHEAD_TOKENS = 10
+
+class PackedContext():
+    """The nodes selected by a ContextPacker, and a report of the token budget used."""
+
+    __slots__ = ('nodes', 'report')
+
+    def __init__(self, nodes:List[NodeWithScore], report:Dict[str, Any]):
+        self.nodes = nodes
+        self.report = report
+
+
+class _Unit():
+
+    __slots__ = ('node_index', 'group_index', 'statement_index', 'source_key', 'topic_key', 'value', 'cost', 'version')
+
+    def __init__(self, node_index, group_index, statement_index, source_key, topic_key, value, cost):
+        self.node_index = node_index
+        self.group_index = group_index
+        self.statement_index = statement_index
+        self.source_key = source_key
+        self.topic_key = topic_key
+        self.value = value
+        self.cost = cost
+        self.version = 0
+
+
+class _Entry():
+    # A node to be packed: either a search result, whose statements are packed individually, or an
+    # opaque node (e.g. a statement node), which is kept or dropped as a whole
+
+    __slots__ = ('node', 'search_result', 'formatted_search_result', 'groups', 'aligned', 'simplified')
+
+    def __init__(self, node, search_result=None, formatted_search_result=None, groups=None, aligned=False, simplified=False):
+        self.node = node
+        self.search_result = search_result
+        self.formatted_search_result = formatted_search_result
+        self.groups = groups
+        self.aligned = aligned
+        self.simplified = simplified
+
+
+class ContextPacker():
+    """
+    Selects the statements, topics and sources that fit within a token budget for the answer context.
+
+    Each statement is valued by its score (or, if statements are unscored, by the score of its search
+    result, decaying with the statement's position in its topic), and costs the tokens in its text. The
+    first statement selected from a topic also pays for the topic header, and the first statement selected
+    from a source pays for the source metadata: statements are selected greedily by value per marginal
+    token until the budget is exhausted. Search results that share a source are merged, so that source
+    metadata appears only once in the context. Statements keep their ranked order within each topic.
+
+    Nodes that do not carry search results (e.g. the statement nodes produced by SemanticGuidedRetriever)
+    are kept or dropped whole.
+    """
+
+    def __init__(self, token_budget:int, tokenizer:Optional[TokenizerType]=None):
+        if token_budget <= 0:
+            raise ValueError(f'token_budget must be greater than 0 [token_budget: {token_budget}]')
+        self.token_budget = token_budget
+        self.tokenizer = tokenizer or get_tokenizer()
+
+    def count_tokens(self, s:str) -> int:
+        return len(self.tokenizer(s)) if s else 0
+
+    def _to_entry(self, node:NodeWithScore) -> _Entry:
+
+        try:
+            formatted_search_result = internal_formatted_search_result_from(node.node)
+            search_result = internal_search_result_from(node.node)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            if isinstance(node.node, SearchResultNode):
+                raise
+            return _Entry(node)
+
+        groups = [(topic.topic, topic.statements) for topic in formatted_search_result.topics]
+        simplified = bool(formatted_search_result.statements)
+        if simplified:
+            groups.append((formatted_search_result.topic, formatted_search_result.statements))
+
+        # Formatting processors do not add or remove statements, so unformatted statements (which
+        # carry scores) usually align with their formatted counterparts
+        aligned = [len(topic.statements) for topic in search_result.topics] == [len(statements) for (_, statements) in groups]
+
+        return _Entry(node, search_result, formatted_search_result, groups, aligned, simplified)
+
+    def _statement_str(self, statement:internal_model.StatementType) -> str:
+        return statement if isinstance(statement, str) else json.dumps(statement.to_dict(), ensure_ascii=False)
+
+    def _source_key(self, entry:_Entry) -> Tuple[Hashable, str]:
+
+        if entry.search_result is None:
+            source = entry.node.node.metadata.get('source')
+            if isinstance(source, dict) and 'sourceId' in source:
+                metadata = source.get('metadata') or {}
+                return (source['sourceId'], ' '.join(str(v) for v in metadata.values()))
+            return (None, '')
+
+        source = entry.search_result.source
+        formatted_source = entry.formatted_search_result.source
+        source_str = formatted_source if isinstance(formatted_source, str) else json.dumps(formatted_source.to_dict(), ensure_ascii=False)
+        source_id = source.sourceId if isinstance(source, Source) else source_str
+        return (source_id, source_str)
+
+    def _to_units(self, entries:List[_Entry]) -> Tuple[List[_Unit], Dict[Hashable, int], Dict[Hashable, int]]:
+
+        units = []
+        topic_costs = {}
+        source_costs = {}
+
+        for node_index, entry in enumerate(entries):
+
+            score = entry.node.score if entry.node.score is not None else 1.0
+            source_id, source_str = self._source_key(entry)
+            source_key = source_id if source_id is not None else ('node', node_index)
+            source_costs.setdefault(source_key, self.count_tokens(source_str) + SOURCE_OVERHEAD_TOKENS if source_id is not None else 0)
+
+            if entry.search_result is None:
+                units.append(_Unit(node_index, None, None, source_key, None, score, self.count_tokens(entry.node.node.get_content()) + STATEMENT_OVERHEAD_TOKENS))
+                continue
+
+            for group_index, (topic, statements) in enumerate(entry.groups):
+
+                topic_key = (source_key, topic)
+                topic_costs.setdefault(topic_key, self.count_tokens(topic) + TOPIC_OVERHEAD_TOKENS)
+
+                for statement_index, statement in enumerate(statements):
+
+                    value = score / (statement_index + 1)
+                    if entry.aligned:
+                        scored_statement = entry.search_result.topics[group_index].statements[statement_index]
+                        if not isinstance(scored_statement, str) and scored_statement.score is not None:
+                            value = scored_statement.score
+
+                    cost = self.count_tokens(self._statement_str(statement)) + STATEMENT_OVERHEAD_TOKENS
+                    units.append(_Unit(node_index, group_index, statement_index, source_key, topic_key, value, cost))
+
+        return units, topic_costs, source_costs
+
+    def _select(self, units:List[_Unit], topic_costs:Dict[Hashable, int], source_costs:Dict[Hashable, int]) -> Tuple[List[_Unit], int]:
+
+        paid_topics = set()
+        paid_sources = set()
+        units_by_header:Dict[Hashable, List[int]] = {}
+
+        for i, unit in enumerate(units):
+            units_by_header.setdefault(('source', unit.source_key), []).append(i)
+            if unit.topic_key is not None:
+                units_by_header.setdefault(('topic', unit.topic_key), []).append(i)
+
+        def marginal_cost(unit:_Unit) -> int:
+            cost = unit.cost
+            if unit.topic_key is not None and unit.topic_key not in paid_topics:
+                cost += topic_costs[unit.topic_key]
+            if unit.source_key not in paid_sources:
+                cost += source_costs[unit.source_key]
+            return max(cost, 1)
+
+        def push(heap, i):
+            unit = units[i]
+            heapq.heappush(heap, (-unit.value / marginal_cost(unit), i, unit.version))
+
+        heap = []
+        for i in range(len(units)):
+            push(heap, i)
+
+        selected = set()
+        used = 0
+
+        # Greedy knapsack by value per marginal token. A unit's marginal cost only falls (when another
+        # unit pays for its topic or source header), at which point it is pushed again with its new density
+        while heap:
+            (_, i, version) = heapq.heappop(heap)
+            unit = units[i]
+            if i in selected or version != unit.version:
+                continue
+            cost = marginal_cost(unit)
+            if used + cost > self.token_budget:
+                continue
+            selected.add(i)
+            used += cost
+
+            new_headers = []
+            if unit.source_key not in paid_sources:
+                paid_sources.add(unit.source_key)
+                new_headers.append(('source', unit.source_key))
+            if unit.topic_key is not None and unit.topic_key not in paid_topics:
+                paid_topics.add(unit.topic_key)
+                new_headers.append(('topic', unit.topic_key))
+
+            for header in new_headers:
+                for j in units_by_header[header]:
+                    if j not in selected:
+                        units[j].version += 1
+                        push(heap, j)
+
+        return [units[i] for i in sorted(selected)], used
+
+    def _merge(self, entries:List[_Entry], units:List[_Unit]) -> Tuple[SearchResult, SearchResult]:
+
+        # Selected statements, grouped by topic in ranked order, for search results that share a source
+        formatted_topics:Dict[str, List] = {}
+        scored_topics:Dict[str, Topic] = {}
+        aligned = all(entries[unit.node_index].aligned for unit in units)
+
+        for unit in units:
+            entry = entries[unit.node_index]
+            topic, statements = entry.groups[unit.group_index]
+            formatted_topics.setdefault(topic, []).append(statements[unit.statement_index])
+            if aligned:
+                scored_topic = entry.search_result.topics[unit.group_index]
+                if topic not in scored_topics:
+                    scored_topics[topic] = Topic(topic=scored_topic.topic, chunks=[c.copy() for c in scored_topic.chunks])
+                statement = scored_topic.statements[unit.statement_index]
+                scored_topics[topic].statements.append(statement if isinstance(statement, str) else statement.copy())
+
+        first = entries[units[0].node_index]
+        source = first.formatted_search_result.source
+        formatted_source = source if isinstance(source, str) else source.copy()
+
+        if len(formatted_topics) == 1 and any(entries[unit.node_index].simplified for unit in units):
+            [(topic, statements)] = formatted_topics.items()
+            formatted_search_result = SearchResult(source=formatted_source, topic=topic, statements=statements)
+        else:
+            formatted_search_result = SearchResult(
+                source=formatted_source,
+                topics=[Topic(topic=topic, statements=statements) for (topic, statements) in formatted_topics.items()]
+            )
+
+        if aligned:
+            search_result = first.search_result.copy()
+            search_result.topics = list(scored_topics.values())
+        else:
+            search_result = first.search_result
+
+        return search_result, formatted_search_result
+
+    def pack(self, nodes:List[NodeWithScore]) -> PackedContext:
+        """Returns the nodes, pruned and merged to fit the token budget, in their original order."""
+
+        entries = [self._to_entry(node) for node in nodes]
+        units, topic_costs, source_costs = self._to_units(entries)
+        selected, used = self._select(units, topic_costs, source_costs)
+
+        units_by_source:Dict[Hashable, List[_Unit]] = {}
+        for unit in selected:
+            units_by_source.setdefault(unit.source_key, []).append(unit)
+
+        packed_nodes = []
+        packed_sources = set()
+        num_merged = 0
+
+        for unit in selected:
+            entry = entries[unit.node_index]
+            if entry.search_result is None:
+                packed_nodes.append(entry.node)
+            elif unit.source_key not in packed_sources:
+                packed_sources.add(unit.source_key)
+                source_units = units_by_source[unit.source_key]
+                node_indexes = {u.node_index for u in source_units}
+                num_merged += len(node_indexes) - 1
+                search_result, formatted_search_result = self._merge(entries, source_units)
+                scores = [entries[i].node.score for i in node_indexes if entries[i].node.score is not None]
+                packed_nodes.append(NodeWithScore(
+                    node=SearchResultNode.from_search_result(search_result, formatted_search_result, materialize=False),
+                    score=max(scores) if scores else None
+                ))
+
+        report = {
+            'token_budget': self.token_budget,
+            'used_tokens': used,
+            'budget_utilization': used / self.token_budget,
+            'num_statements': len(selected),
+            'num_statements_dropped': len(units) - len(selected),
+            'num_sources': len(units_by_source),
+            'num_results_merged': num_merged
+        }
+
+        logger.debug(f'Packed context: {report}')
+
+        return PackedContext(packed_nodes, report)
+
+    def __repr__(self):
+        return f'ContextPacker(token_budget={self.token_budget})'
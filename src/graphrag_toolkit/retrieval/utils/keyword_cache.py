@@ -0,0 +1,185 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+import time
+import logging
+import threading
+import numpy as np
+from collections import OrderedDict
+from hashlib import sha256
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 1000
+DEFAULT_TTL_SECONDS = 3600
+
+_WHITESPACE = re.compile(r'\s+')
+
+def normalize_query(query_str:str) -> str:
+    """Lowercases a query, collapses whitespace, and strips trailing punctuation."""
+    return _WHITESPACE.sub(' ', query_str).strip().lower().rstrip('?.!;: ')
+
+def keyword_cache_namespace(*parts:Any) -> str:
+    """
+    Returns a namespace for the keywords extracted by a particular combination of LLM, prompts and
+    keyword limit, so that retrievers that extract keywords differently do not share entries.
+    """
+    return sha256('\n'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+
+
+class _KeywordCacheEntry():
+
+    __slots__ = ('keywords', 'embedding', 'expires_at')
+
+    def __init__(self, keywords:List[str], embedding:Optional[np.ndarray], expires_at:Optional[float]):
+        self.keywords = keywords
+        self.embedding = embedding
+        self.expires_at = expires_at
+
+
+class KeywordCache():
+    """
+    A bounded, in-memory cache of the keywords extracted from queries, keyed by namespace and
+    normalized query string. Entries expire after ttl_seconds (None for no expiry), and the least
+    recently used entries are evicted once the cache holds max_size entries. A max_size of 0
+    disables the cache.
+
+    If similarity_threshold is set, a lookup that misses on the query string falls back to a
+    semantic lookup: the keywords cached for the most similar query embedding in the same namespace
+    are reused if the cosine similarity between the embeddings is at least similarity_threshold.
+    """
+
+    def __init__(self,
+                 max_size:int=DEFAULT_MAX_SIZE,
+                 ttl_seconds:Optional[float]=DEFAULT_TTL_SECONDS,
+                 similarity_threshold:Optional[float]=None):
+
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._entries:OrderedDict[Tuple[str, str], _KeywordCacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _to_unit_vector(self, embedding:Optional[List[float]]) -> Optional[np.ndarray]:
+        if self.similarity_threshold is None or embedding is None:
+            return None
+        v = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        return v / norm if norm > 0 else None
+
+    def _is_expired(self, entry:_KeywordCacheEntry, now:float) -> bool:
+        return entry.expires_at is not None and entry.expires_at <= now
+
+    def _semantic_match(self, namespace:str, v:np.ndarray, now:float) -> Optional[Tuple[Tuple[str, str], float]]:
+
+        best_key = None
+        best_similarity = self.similarity_threshold
+        expired_keys = []
+
+        for key, entry in self._entries.items():
+            if key[0] != namespace or entry.embedding is None:
+                continue
+            if self._is_expired(entry, now):
+                expired_keys.append(key)
+                continue
+            similarity = float(np.dot(v, entry.embedding))
+            if similarity >= best_similarity:
+                best_key, best_similarity = key, similarity
+
+        for key in expired_keys:
+            del self._entries[key]
+        self.expirations += len(expired_keys)
+
+        return (best_key, best_similarity) if best_key else None
+
+    def get(self, namespace:str, query_str:str, embedding:Optional[List[float]]=None) -> Optional[List[str]]:
+        """Returns the cached keywords for the query, or None."""
+
+        if not self.enabled:
+            return None
+
+        key = (namespace, normalize_query(query_str))
+        now = time.monotonic()
+
+        with self._lock:
+
+            entry = self._entries.get(key)
+
+            if entry is not None and self._is_expired(entry, now):
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                logger.debug(f'Keyword cache hit [query: {query_str}]')
+                return list(entry.keywords)
+
+            v = self._to_unit_vector(embedding)
+
+            if v is not None:
+                match = self._semantic_match(namespace, v, now)
+                if match:
+                    match_key, similarity = match
+                    self._entries.move_to_end(match_key)
+                    self.semantic_hits += 1
+                    logger.debug(f'Keyword cache semantic hit [query: {query_str}, cached_query: {match_key[1]}, similarity: {similarity:.4f}]')
+                    return list(self._entries[match_key].keywords)
+
+            self.misses += 1
+            return None
+
+    def put(self, namespace:str, query_str:str, keywords:List[str], embedding:Optional[List[float]]=None):
+        """Caches the keywords for the query. Empty keyword lists are not cached."""
+
+        if not self.enabled or not keywords:
+            return
+
+        key = (namespace, normalize_query(query_str))
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else None
+        entry = _KeywordCacheEntry(list(keywords), self._to_unit_vector(embedding), expires_at)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._reset_stats()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.semantic_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'semantic_hits': self.semantic_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.semantic_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+    def __repr__(self):
+        return f'KeywordCache(max_size={self.max_size}, ttl_seconds={self.ttl_seconds}, similarity_threshold={self.similarity_threshold})'
+
+DEFAULT_KEYWORD_CACHE = KeywordCache()
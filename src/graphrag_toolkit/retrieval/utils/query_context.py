@@ -0,0 +1,117 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+class QueryContext():
+    """
+    Memoizes the operations performed while answering a single question – keyword extraction, entity
+    lookup, query embedding, vector searches and graph searches – so that retrievers that require the
+    same result share a single invocation.
+
+    A context is created per question by CompositeTraversalBasedRetriever, and passed to its sub-retrievers
+    via the query_context processor argument. Lookups are safe from multiple threads and concurrent tasks:
+    callers that request a result while it is being computed wait for that computation, rather than
+    starting another. Memoized values are shared: callers must copy a value before modifying it.
+    """
+
+    def __init__(self):
+        self._values:Dict[Hashable, Any] = {}
+        self._key_locks:Dict[Hashable, threading.Lock] = {}
+        self._pending:Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key:Hashable, fn:Callable[[], Any]) -> Any:
+
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                return self._values[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+
+            with self._lock:
+                if key in self._values:
+                    self.hits += 1
+                    return self._values[key]
+
+            value = fn()
+
+            with self._lock:
+                self._values[key] = value
+                self.misses += 1
+
+            return value
+
+    async def aget_or_compute(self, key:Hashable, fn:Callable[[], Awaitable[Any]]) -> Any:
+
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                return self._values[key]
+            pending = self._pending.get(key)
+            if pending is not None:
+                self.hits += 1
+            else:
+                future = asyncio.get_running_loop().create_future()
+                self._pending[key] = future
+
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        try:
+            value = await fn()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            # Mark the exception as retrieved, in case there are no waiters
+            future.add_done_callback(lambda f: f.exception())
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._values[key] = value
+            del self._pending[key]
+            self.misses += 1
+
+        future.set_result(value)
+
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'size': len(self._values),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def __repr__(self):
+        return f'QueryContext({self.stats()})'
+
+def memoize(query_context:Optional[QueryContext], key:Hashable, fn:Callable[[], Any]) -> Any:
+    """Returns fn(), memoized in query_context if there is one."""
+    if query_context is None:
+        return fn()
+    return query_context.get_or_compute(key, fn)
+
+async def amemoize(query_context:Optional[QueryContext], key:Hashable, fn:Callable[[], Awaitable[Any]]) -> Any:
+    """Returns await fn(), memoized in query_context if there is one."""
+    if query_context is None:
+        return await fn()
+    return await query_context.aget_or_compute(key, fn)
+
+def graph_query_key(cypher:str, parameters:Dict[str, Any]) -> Hashable:
+    """Returns a memoization key for a graph query whose parameters are scalars or lists of scalars."""
+    return ('graph_query', cypher, tuple(sorted(
+        (k, tuple(v) if isinstance(v, list) else v) 
+        for k, v in parameters.items()
+    )))
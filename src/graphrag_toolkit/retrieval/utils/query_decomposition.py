@@ -1,12 +1,13 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import re
 import logging
-from typing import List
+from typing import Any, Dict, Generator, List, Tuple
 
 from graphrag_toolkit.config import GraphRAGConfig
 from graphrag_toolkit.utils import LLMCache, LLMCacheType
-from graphrag_toolkit.retrieval.prompts import EXTRACT_SUBQUERIES_PROMPT, IDENTIFY_MULTIPART_QUESTION_PROMPT
+from graphrag_toolkit.retrieval.prompts import EXTRACT_SUBQUERIES_PROMPT, IDENTIFY_MULTIPART_QUESTION_PROMPT, DECOMPOSE_QUERY_PROMPT
 
 from llama_index.core.prompts import PromptTemplate
 from llama_index.core.schema import QueryBundle
@@ -15,12 +16,34 @@ logger = logging.getLogger(__name__)
 
 SINGLE_QUESTION_THRESHOLD = 25
 
+SINGLE_QUESTION_RESPONSE = 'single'
+
+_MULTIPART_MARKERS = re.compile(r'\b(?:and|or|versus|vs|as well as|compared?|respectively|both)\b|;', re.IGNORECASE)
+_LIST_PREFIX = re.compile(r'^\s*(?:[-*•]|\d+[.):])\s*')
+
+def count_multipart_markers(s:str) -> int:
+    """Counts the conjunctions, semicolons and additional question marks in a question."""
+    return len(_MULTIPART_MARKERS.findall(s)) + max(s.count('?') - 1, 0)
+
 class QueryDecomposition():
+    """
+    Breaks complex questions into simpler, standalone subqueries.
+
+    Questions of no more than single_question_threshold words, and longer questions with no
+    conjunctions, semicolons or additional question marks, are returned as-is without calling the
+    LLM. Otherwise, a single LLM call decides whether the question requires details of more than one
+    entity and, if so, decomposes it. With single_call=False, the LLM is called twice, once for each
+    of these steps, using identify_multipart_question_template and extract_subqueries_template.
+    """
+
     def __init__(self,
-                 llm:LLMCacheType=None, 
+                 llm:LLMCacheType=None,
                  identify_multipart_question_template=IDENTIFY_MULTIPART_QUESTION_PROMPT,
                  extract_subqueries_template=EXTRACT_SUBQUERIES_PROMPT,
-                 max_subqueries=2):
+                 max_subqueries=2,
+                 decompose_query_template=DECOMPOSE_QUERY_PROMPT,
+                 single_call=True,
+                 single_question_threshold=SINGLE_QUESTION_THRESHOLD):
         self.llm = llm if llm and isinstance(llm, LLMCache) else LLMCache(
             llm=llm or GraphRAGConfig.response_llm,
             enable_cache=GraphRAGConfig.enable_cache
@@ -28,37 +51,83 @@ class QueryDecomposition():
         self.identify_multipart_question_template = identify_multipart_question_template
         self.extract_subqueries_template = extract_subqueries_template
         self.max_subqueries = max_subqueries
+        self.decompose_query_template = decompose_query_template
+        self.single_call = single_call
+        self.single_question_threshold = single_question_threshold
 
-    def _extract_subqueries(self, s:str) -> List[QueryBundle]:
 
-        response = self.llm.predict(
-                PromptTemplate(template=self.extract_subqueries_template),
-                question=s,
-                max_subqueries=self.max_subqueries
-            )
+    def _parse_subqueries(self, response:str, query_bundle:QueryBundle) -> List[QueryBundle]:
 
-        return [QueryBundle(query_str=s) for s in response.split('\n') if s]
-    
-    def _is_multipart_question(self, s:str):
+        lines = [_LIST_PREFIX.sub('', line).strip() for line in response.strip().split('\n')]
+        lines = [line for line in lines if line]
 
-        response = self.llm.predict(
-                PromptTemplate(template=self.identify_multipart_question_template),
-                question=s
-            )
+        # The response is SINGLE only if the first line is the sentinel alone, give or take punctuation
+        if not lines or lines[0].lower().strip(' .!:"\'*') == SINGLE_QUESTION_RESPONSE:
+            return [query_bundle]
 
-        return response.lower().startswith('no')
+        subqueries = list(dict.fromkeys(lines))[:self.max_subqueries]
 
+        # A single subquery is a restatement of the original question, which may already be embedded
+        if len(subqueries) < 2:
+            return [query_bundle]
 
-    def decompose_query(self, query_bundle: QueryBundle) -> List[QueryBundle]:
+        return [QueryBundle(query_str=s) for s in subqueries]
+
+    def is_simple_query(self, s:str) -> bool:
+        """Returns True if the question is clearly simple, and needs no LLM call to decide whether to decompose it."""
+        return len(s.split()) <= self.single_question_threshold or count_multipart_markers(s) == 0
+
+    def _decompose(self, query_bundle:QueryBundle) -> Generator[Tuple[str, Dict[str, Any]], str, List[QueryBundle]]:
+        """
+        Applies the pre-check, and parses the LLM responses. Yields a (template, prompt arguments) pair for 
+        each LLM call, and is sent the response, so that decompose_query() and adecompose_query() differ 
+        only in how they call the LLM.
+        """
 
-        subqueries = [query_bundle]
-        
         original_query = query_bundle.query_str
 
-        if len(original_query.split()) > SINGLE_QUESTION_THRESHOLD:
-            if self._is_multipart_question(original_query):
-                subqueries = self._extract_subqueries(original_query)
+        if self.is_simple_query(original_query):
+            return [query_bundle]
+
+        if self.single_call:
+            response = yield (self.decompose_query_template, {'question': original_query, 'max_subqueries': self.max_subqueries})
+            return self._parse_subqueries(response, query_bundle)
+
+        response = yield (self.identify_multipart_question_template, {'question': original_query})
+        if not response.lower().startswith('no'):
+            return [query_bundle]
+
+        response = yield (self.extract_subqueries_template, {'question': original_query, 'max_subqueries': self.max_subqueries})
+        return [QueryBundle(query_str=s) for s in response.split('\n') if s]
+
+    def decompose_query(self, query_bundle: QueryBundle) -> List[QueryBundle]:
+
+        steps = self._decompose(query_bundle)
+        response = None
+
+        try:
+            while True:
+                template, prompt_args = steps.send(response)
+                response = self.llm.predict(PromptTemplate(template=template), **prompt_args)
+        except StopIteration as e:
+            subqueries = e.value
+
+        logger.debug(f'Subqueries: {subqueries}')
+
+        return subqueries
+
+    async def adecompose_query(self, query_bundle: QueryBundle) -> List[QueryBundle]:
+
+        steps = self._decompose(query_bundle)
+        response = None
+
+        try:
+            while True:
+                template, prompt_args = steps.send(response)
+                response = await self.llm.apredict(PromptTemplate(template=template), **prompt_args)
+        except StopIteration as e:
+            subqueries = e.value
 
         logger.debug(f'Subqueries: {subqueries}')
-                 
-        return subqueries
\ No newline at end of file
+
+        return subqueries
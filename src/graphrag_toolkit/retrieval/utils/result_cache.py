@@ -0,0 +1,262 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import json
+import logging
+import threading
+from hashlib import sha256
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from graphrag_toolkit.retrieval import internal_model
+from graphrag_toolkit.retrieval.utils.keyword_cache import normalize_query
+from graphrag_toolkit.retrieval.utils.search_result_nodes import SearchResultNode
+
+from graphrag_toolkit.utils.llm_cache import LLMCache
+
+from llama_index.core.llms.llm import LLM
+from llama_index.core.schema import NodeWithScore, TextNode
+from llama_index.core.bridge.pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 1000
+
+IndexGenerationType = Union[Hashable, Callable[[], Hashable]]
+
+# Arguments that hold per-process resources rather than settings that determine a retriever's results
+_RUNTIME_ARGS = {'query_context', 'keyword_cache', 'entity_dictionary', 'result_cache', 'index_generation', 'debug_results', 'embedding_snapshot', 'query_executor'}
+
+def _qualified_name(o:Any) -> str:
+    return f'{type(o).__module__}.{getattr(o, "__qualname__", type(o).__qualname__)}'
+
+def _describe(o:Any) -> Any:
+    # Retrievers, rerankers and LLMs are identified by their settings; functions and other 
+    # objects by their qualified names, which are stable across processes
+    if callable(getattr(o, 'cache_fingerprint', None)):
+        return o.cache_fingerprint()
+    if isinstance(o, LLMCache):
+        return {'llm': o.llm.to_json()}
+    if isinstance(o, LLM):
+        return o.to_json()
+    return _qualified_name(o)
+
+def settings_fingerprint(o:Any) -> Dict[str, Any]:
+    """
+    Returns an object's type and its public str, number and bool attributes: the default 
+    cache_fingerprint() for retrievers and rerankers that do not describe their own settings.
+    """
+    return {
+        'type': type(o).__qualname__,
+        **{k:v for k,v in sorted(vars(o).items()) if not k.startswith('_') and isinstance(v, (str, int, float, bool))}
+    }
+
+def args_fingerprint(args:Dict[str, Any]) -> str:
+    """Returns a stable digest of the retriever arguments that determine its results."""
+    settings = {k:v for k,v in args.items() if k not in _RUNTIME_ARGS}
+    return sha256(json.dumps(settings, sort_keys=True, default=_describe).encode('utf-8')).hexdigest()
+
+# Store fields that hold credentials, or clients and models rather than the location of the data
+_NON_IDENTIFYING_FIELDS = {'username', 'password', 'log_formatting', 'embed_model'}
+
+def _store_identity(o:Any) -> Any:
+    if isinstance(o, BaseModel):
+        return {
+            'type': type(o).__qualname__,
+            **{name:_store_identity(getattr(o, name)) for name in type(o).model_fields if name not in _NON_IDENTIFYING_FIELDS}
+        }
+    if isinstance(o, dict):
+        return {k:_store_identity(v) for k,v in o.items()}
+    return o
+
+def stores_fingerprint(graph_store, vector_store) -> str:
+    """Returns a stable digest of the graph store and vector indexes (endpoints, graph ids, database and index names) a retriever reads from."""
+    identity = [_store_identity(graph_store), _store_identity(vector_store)]
+    return sha256(json.dumps(identity, sort_keys=True, default=_describe).encode('utf-8')).hexdigest()
+
+def resolve_index_generation(index_generation:Optional[IndexGenerationType], graph_store) -> Hashable:
+    """Returns the supplied index generation (a value, or a callable returning the current value), or else the graph store's generation."""
+    if index_generation is None:
+        return graph_store.index_generation().current()
+    return index_generation() if callable(index_generation) else index_generation
+
+
+class _CachedNode():
+
+    __slots__ = ('search_result', 'formatted_search_result', 'materialized', 'node', 'score')
+
+    def __init__(self, node:NodeWithScore):
+        self.score = node.score
+        if isinstance(node.node, SearchResultNode):
+            self.search_result = node.node._search_result.copy()
+            self.formatted_search_result = node.node._formatted_search_result.copy()
+            self.materialized = node.node.is_materialized
+            self.node = None
+        else:
+            self.search_result = self.formatted_search_result = None
+            self.materialized = False
+            self.node = node.node.model_copy(deep=True)
+
+    def to_node(self) -> NodeWithScore:
+        if self.node is not None:
+            return NodeWithScore(node=self.node.model_copy(deep=True), score=self.score)
+        return NodeWithScore(
+            node=SearchResultNode.from_search_result(self.search_result.copy(), self.formatted_search_result.copy(), materialize=self.materialized),
+            score=self.score
+        )
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        if self.node is None:
+            return {
+                'search_result': self.search_result.to_dict(),
+                'formatted_search_result': self.formatted_search_result.to_dict(),
+                'materialized': self.materialized,
+                'score': self.score
+            }
+        if type(self.node) is TextNode:
+            return {'text_node': self.node.to_dict(), 'score': self.score}
+        return None
+
+    @staticmethod
+    def from_dict(d:Dict[str, Any]) -> '_CachedNode':
+        if 'text_node' in d:
+            node = TextNode.from_dict(d['text_node'])
+        else:
+            node = SearchResultNode.from_search_result(
+                internal_model.SearchResult.from_dict(d['search_result']),
+                internal_model.SearchResult.from_dict(d['formatted_search_result']),
+                materialize=d['materialized']
+            )
+        return _CachedNode(NodeWithScore(node=node, score=d['score']))
+
+
+class RetrieverResultCache():
+    """
+    A cache of retriever results, keyed by normalized query, retriever class, retriever arguments,
+    graph and vector stores, and index generation. Because LexicalGraphIndex increments the index generation whenever it builds new
+    data, results computed from earlier versions of the indexed data are never returned.
+
+    Results are held in a bounded, in-memory LRU tier of max_size entries. If cache_dir is supplied,
+    results are also written to a local disk tier, which is shared by processes on the same host and
+    survives restarts; entries read from disk are promoted to memory. Files for earlier generations are
+    not removed automatically: call clear() to empty both tiers.
+
+    Cached results are copied on the way in and on the way out, so that callers may modify them. To plug
+    in another store, subclass RetrieverResultCache and override get() and put().
+    """
+
+    def __init__(self, max_size:int=DEFAULT_MAX_SIZE, cache_dir:Optional[str]=None):
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        self._entries:OrderedDict[Hashable, List[_CachedNode]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key_for(query_str:str, retriever_name:str, args:Dict[str, Any], index_generation:Hashable, graph_store=None, vector_store=None) -> Tuple[str, str, str, str, str]:
+        # Index generations are per-graph counters, so the stores are part of the key
+        return (normalize_query(query_str), retriever_name, args_fingerprint(args), stores_fingerprint(graph_store, vector_store), str(index_generation))
+
+    def _file_for(self, key:Hashable) -> str:
+        return os.path.join(self.cache_dir, f'{sha256(json.dumps(key).encode("utf-8")).hexdigest()}.json')
+
+    def _read(self, key:Hashable) -> Optional[List[_CachedNode]]:
+        cache_file = self._file_for(key)
+        if not os.path.exists(cache_file):
+            return None
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if tuple(data['key']) != tuple(key):
+                return None
+            return [_CachedNode.from_dict(d) for d in data['nodes']]
+        except Exception as e:
+            logger.warning(f'Unable to read cached retriever results [file: {cache_file}, error: {e!s}]')
+            return None
+
+    def _write(self, key:Hashable, cached_nodes:List[_CachedNode]):
+        nodes = [cached_node.to_dict() for cached_node in cached_nodes]
+        if any(node is None for node in nodes):
+            return
+        cache_file = self._file_for(key)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_file = f'{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'key': list(key), 'nodes': nodes}, f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
+
+    def _put_in_memory(self, key:Hashable, cached_nodes:List[_CachedNode]):
+        with self._lock:
+            self._entries[key] = cached_nodes
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, key:Hashable) -> Optional[List[NodeWithScore]]:
+        """Returns a copy of the cached results, or None."""
+
+        with self._lock:
+            cached_nodes = self._entries.get(key)
+            if cached_nodes is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if cached_nodes is None and self.cache_dir:
+            cached_nodes = self._read(key)
+            if cached_nodes is not None:
+                self._put_in_memory(key, cached_nodes)
+                with self._lock:
+                    self.disk_hits += 1
+
+        if cached_nodes is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        return [cached_node.to_node() for cached_node in cached_nodes]
+
+    def put(self, key:Hashable, nodes:List[NodeWithScore]):
+
+        cached_nodes = [_CachedNode(node) for node in nodes]
+
+        if self.max_size > 0:
+            self._put_in_memory(key, cached_nodes)
+
+        if self.cache_dir:
+            try:
+                self._write(key, cached_nodes)
+            except Exception as e:
+                logger.warning(f'Unable to write cached retriever results [dir: {self.cache_dir}, error: {e!s}]')
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._reset_stats()
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith('.json'):
+                    os.remove(os.path.join(self.cache_dir, filename))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions
+            }
+
+    def __repr__(self):
+        return f'RetrieverResultCache(max_size={self.max_size}, cache_dir={self.cache_dir})'
@@ -0,0 +1,122 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from typing import Any, Dict, List, Optional, Union
+
+from graphrag_toolkit.retrieval import internal_model
+from graphrag_toolkit.retrieval.model import SearchResult
+
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.schema import BaseNode, MetadataMode, NodeWithScore, TextNode
+
+SearchResultType = Union[SearchResult, internal_model.SearchResult]
+
+def _to_internal(search_result:SearchResultType) -> internal_model.SearchResult:
+    if isinstance(search_result, SearchResult):
+        return internal_model.SearchResult.from_model(search_result)
+    return search_result
+
+class SearchResultNode(TextNode):
+    """
+    A TextNode that carries a search result, and its formatted counterpart, as objects.
+
+    Retrievers and post-processors within the toolkit read the objects directly. The node's text
+    (the formatted search result as JSON) and metadata (the search result) are only serialized when
+    the node is materialized, which the query engine does once, before returning results. Text and
+    metadata are renderings of the objects: modify the objects, not the text.
+
+    Search results are held as internal_model objects. The search_result and formatted_search_result
+    properties return pydantic copies.
+    """
+
+    _search_result:Optional[internal_model.SearchResult] = PrivateAttr(default=None)
+    _formatted_search_result:Optional[internal_model.SearchResult] = PrivateAttr(default=None)
+    _materialized:bool = PrivateAttr(default=False)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return 'SearchResultNode'
+
+    @staticmethod
+    def from_search_result(search_result:SearchResultType, formatted_search_result:Optional[SearchResultType]=None, materialize:bool=True) -> 'SearchResultNode':
+        node = SearchResultNode()
+        node._search_result = _to_internal(search_result)
+        # Post-processors may modify the formatted search result in place, so it never shares the 
+        # unformatted search result's object
+        if formatted_search_result is None or formatted_search_result is search_result:
+            node._formatted_search_result = node._search_result.copy()
+        else:
+            node._formatted_search_result = _to_internal(formatted_search_result)
+        return node.materialize() if materialize else node
+
+    @property
+    def search_result(self) -> SearchResult:
+        return self._search_result.to_model()
+
+    @property
+    def formatted_search_result(self) -> SearchResult:
+        return self._formatted_search_result.to_model()
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._materialized
+
+    def set_formatted_search_result(self, formatted_search_result:SearchResultType):
+        self._formatted_search_result = _to_internal(formatted_search_result)
+        if self._materialized:
+            self.text = self._formatted_search_result.to_json(indent=2)
+
+    def materialize(self) -> 'SearchResultNode':
+        if not self._materialized:
+            self.text = self._formatted_search_result.to_json(indent=2)
+            self.metadata = self._search_result.to_dict()
+            self._materialized = True
+        return self
+
+    def get_content(self, metadata_mode:MetadataMode=MetadataMode.NONE) -> str:
+        self.materialize()
+        return super().get_content(metadata_mode=metadata_mode)
+
+
+def search_result_from(node:BaseNode) -> SearchResult:
+    """Returns the (unformatted) search result carried by a node."""
+    if isinstance(node, SearchResultNode):
+        return node.search_result
+    return SearchResult.model_validate(node.metadata)
+
+def formatted_search_result_from(node:BaseNode) -> SearchResult:
+    """Returns the formatted search result carried by a node."""
+    if isinstance(node, SearchResultNode):
+        return node.formatted_search_result
+    return SearchResult.model_validate_json(node.text)
+
+def internal_search_result_from(node:BaseNode) -> internal_model.SearchResult:
+    """Returns the (unformatted) search result carried by a node, parsing the node's metadata only if necessary."""
+    if isinstance(node, SearchResultNode):
+        return node._search_result
+    return internal_model.SearchResult.from_dict(node.metadata)
+
+def internal_formatted_search_result_from(node:BaseNode) -> internal_model.SearchResult:
+    """Returns the formatted search result carried by a node, parsing the node's text only if necessary."""
+    if isinstance(node, SearchResultNode):
+        return node._formatted_search_result
+    return internal_model.SearchResult.from_dict(json.loads(node.text))
+
+def formatted_search_result_dict_from(node:BaseNode) -> Dict[str, Any]:
+    if isinstance(node, SearchResultNode):
+        return node._formatted_search_result.to_dict()
+    return json.loads(node.text)
+
+def materialize_nodes(nodes:List[NodeWithScore]) -> List[NodeWithScore]:
+    for node in nodes:
+        if isinstance(node.node, SearchResultNode):
+            node.node.materialize()
+    return nodes
+
+def supports_search_result_nodes(post_processor:Any) -> bool:
+    """
+    Post-processors that read search results via the accessors in this module, rather than parsing
+    node text or metadata, set a `supports_search_result_nodes` class attribute to True.
+    """
+    return getattr(post_processor, 'supports_search_result_nodes', False)
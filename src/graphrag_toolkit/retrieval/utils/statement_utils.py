@@ -6,10 +6,11 @@ import torch
 import pynvml
 import threading
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from graphrag_toolkit.storage.graph_utils import node_result
+from graphrag_toolkit.storage.embedding_snapshot import EmbeddingSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -78,10 +79,11 @@ def get_top_free_gpus(n=2):
     return top_indices
 
 class SharedEmbeddingCache:
-    def __init__(self, vector_store):
+    def __init__(self, vector_store, snapshot:Optional[EmbeddingSnapshot]=None):
         self._cache: Dict[str, np.ndarray] = {}
         self._lock = threading.Lock()
         self.vector_store = vector_store
+        self.snapshot = snapshot
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10),retry=retry_if_exception_type(Exception))
     def _fetch_embeddings(self, statement_ids: List[str]) -> Dict[str, np.ndarray]:
@@ -104,6 +106,12 @@ class SharedEmbeddingCache:
             else:
                 missing_ids.append(sid)
 
+        # Then check snapshot (memory-mapped, so not copied into the cache)
+        if missing_ids and self.snapshot:
+            snapshot_embeddings = self.snapshot.get_embeddings(missing_ids, 'statement')
+            cached_embeddings.update(snapshot_embeddings)
+            missing_ids = [sid for sid in missing_ids if sid not in snapshot_embeddings]
+
         # Fetch missing embeddings with retry
         if missing_ids:
             try:
@@ -5,23 +5,17 @@ import logging
 import queue
 
 from graphrag_toolkit.storage.vector_store import VectorStore
+from graphrag_toolkit.storage.vector_index import VectorIndex, to_embedded_query, to_aembedded_query
 from graphrag_toolkit.retrieval.processors import ProcessorArgs
+from graphrag_toolkit.retrieval.utils.query_context import memoize, amemoize
 
 from llama_index.core.schema import QueryBundle
 
 logger = logging.getLogger(__name__)
 
-def get_diverse_vss_elements(index_name:str, query_bundle: QueryBundle, vector_store:VectorStore, args:ProcessorArgs):
+def _diversify_vss_elements(index_name:str, elements, args:ProcessorArgs):
 
-    diversity_factor = args.vss_diversity_factor
     vss_top_k = args.vss_top_k
-
-    if not diversity_factor or diversity_factor < 1:
-        return vector_store.get_index(index_name).top_k(query_bundle, top_k=vss_top_k)
-
-    top_k = vss_top_k * diversity_factor
-        
-    elements = vector_store.get_index(index_name).top_k(query_bundle, top_k=top_k)
         
     source_map = {}
         
@@ -46,4 +40,75 @@ def get_diverse_vss_elements(index_name:str, query_bundle: QueryBundle, vector_s
 
     logger.debug(f'Diverse {index_name}s:\n' + '\n--------------\n'.join([str(element) for element in diverse_elements]))
 
-    return diverse_elements
\ No newline at end of file
+    return diverse_elements
+
+# Query embeddings and top_k results are memoized in the query context (if any), so that retrievers
+# answering the same question embed and search for each distinct query string once
+
+def _embedding_key(index:VectorIndex, query_bundle: QueryBundle):
+    return ('embedding', id(index.embed_model), tuple(query_bundle.embedding_strs))
+
+def _top_k_key(index_name:str, query_bundle: QueryBundle, top_k:int):
+    return ('top_k', index_name, query_bundle.query_str, top_k)
+
+def _top_k(index_name:str, query_bundle: QueryBundle, vector_store:VectorStore, top_k:int, args:ProcessorArgs):
+
+    index = vector_store.get_index(index_name)
+
+    def search():
+        if not query_bundle.embedding and getattr(index, 'embed_model', None) is not None:
+            query_bundle.embedding = memoize(
+                args.query_context,
+                _embedding_key(index, query_bundle),
+                lambda: to_embedded_query(query_bundle, index.embed_model).embedding
+            )
+        return index.top_k(query_bundle, top_k=top_k)
+    
+    return memoize(args.query_context, _top_k_key(index_name, query_bundle, top_k), search)
+
+async def _atop_k(index_name:str, query_bundle: QueryBundle, vector_store:VectorStore, top_k:int, args:ProcessorArgs):
+
+    index = vector_store.get_index(index_name)
+
+    async def search():
+        if not query_bundle.embedding and getattr(index, 'embed_model', None) is not None:
+
+            async def embed():
+                return (await to_aembedded_query(query_bundle, index.embed_model)).embedding
+            
+            query_bundle.embedding = await amemoize(
+                args.query_context,
+                _embedding_key(index, query_bundle),
+                embed
+            )
+        return await index.atop_k(query_bundle, top_k=top_k)
+    
+    return await amemoize(args.query_context, _top_k_key(index_name, query_bundle, top_k), search)
+
+def get_diverse_vss_elements(index_name:str, query_bundle: QueryBundle, vector_store:VectorStore, args:ProcessorArgs):
+
+    diversity_factor = args.vss_diversity_factor
+    vss_top_k = args.vss_top_k
+
+    if not diversity_factor or diversity_factor < 1:
+        return _top_k(index_name, query_bundle, vector_store, vss_top_k, args)
+
+    top_k = vss_top_k * diversity_factor
+        
+    elements = _top_k(index_name, query_bundle, vector_store, top_k, args)
+
+    return _diversify_vss_elements(index_name, elements, args)
+
+async def aget_diverse_vss_elements(index_name:str, query_bundle: QueryBundle, vector_store:VectorStore, args:ProcessorArgs):
+
+    diversity_factor = args.vss_diversity_factor
+    vss_top_k = args.vss_top_k
+
+    if not diversity_factor or diversity_factor < 1:
+        return await _atop_k(index_name, query_bundle, vector_store, vss_top_k, args)
+
+    top_k = vss_top_k * diversity_factor
+        
+    elements = await _atop_k(index_name, query_bundle, vector_store, top_k, args)
+
+    return _diversify_vss_elements(index_name, elements, args)
@@ -3,8 +3,14 @@
 
 from .graph_store import GraphStore, RedactedGraphQueryLogFormatting, NonRedactedGraphQueryLogFormatting
 from .graph_store_factory import GraphStoreFactory, GraphStoreType
+from .graph_schema import GraphIndex, GraphSchemaManager, GRAPH_INDEXES
+from .index_generation import IndexGeneration
 from .vector_index import VectorIndex
 from .vector_index_factory import VectorIndexFactory
 from .vector_store import VectorStore
 from .vector_store_factory import VectorStoreFactory, VectorStoreType
+from .embedding_snapshot import EmbeddingSnapshot, EmbeddingSnapshotType
+from .statement_lexical_index import StatementLexicalIndex
+from .entity_dictionary import EntityDictionary
+from .query_embedding_cache import QueryEmbeddingCache, DEFAULT_QUERY_EMBEDDING_CACHE
 from .constants import INDEX_KEY, ALL_EMBEDDING_INDEXES, DEFAULT_EMBEDDING_INDEXES
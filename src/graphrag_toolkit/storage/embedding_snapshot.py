@@ -0,0 +1,198 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import json
+import time
+import hashlib
+import logging
+import numpy as np
+from typing import Dict, List, Optional, Union
+
+from graphrag_toolkit.storage.graph_store import GraphStore
+from graphrag_toolkit.storage.vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+DEFAULT_SNAPSHOT_INDEXES = ['statement']
+DEFAULT_EXPORT_BATCH_SIZE = 1000
+
+def _label_for(index_name:str) -> str:
+    return f'__{index_name.capitalize()}__'
+
+def _id_property_for(index_name:str) -> str:
+    return f'{index_name}Id'
+
+def _digest(ids:List[str]) -> str:
+    h = hashlib.sha256()
+    for i in ids:
+        h.update(i.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+def _generation(digests:Dict[str, str]) -> str:
+    return hashlib.sha256(json.dumps(digests, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def get_ids_for_index(graph_store:GraphStore, index_name:str) -> List[str]:
+
+    id_property = _id_property_for(index_name)
+
+    cypher = f'''
+    MATCH (n:`{_label_for(index_name)}`)
+    RETURN {graph_store.node_id(f"n.{id_property}")} AS id
+    '''
+
+    results = graph_store.execute_query(cypher)
+
+    return sorted(set(r['id'] for r in results))
+
+
+class EmbeddingSnapshot():
+    """
+    Read-only, memory-mapped snapshot of the embeddings in one or more vector indexes.
+
+    Each index is stored as a float32 `.npy` matrix together with a sorted `.npy` id table whose
+    rows align with the matrix. The manifest records a generation stamp derived from the ids in
+    each index, and the graph's index generation at the time of export: a snapshot is stale once
+    a build has incremented the index generation, which is checked with a single graph query.
+    """
+
+    @staticmethod
+    def export(graph_store:GraphStore,
+               vector_store:VectorStore,
+               path:str,
+               index_names:List[str]=DEFAULT_SNAPSHOT_INDEXES,
+               batch_size:int=DEFAULT_EXPORT_BATCH_SIZE):
+
+        os.makedirs(path, exist_ok=True)
+
+        # Read before the embeddings, so that a build that runs during the export makes the snapshot stale
+        index_generation = graph_store.index_generation().refresh()
+
+        digests = {}
+        indexes = {}
+        dimensions = None
+
+        for index_name in index_names:
+
+            start = time.time()
+
+            ids = get_ids_for_index(graph_store, index_name)
+            vector_index = vector_store.get_index(index_name)
+            id_property = _id_property_for(index_name)
+
+            embeddings = {}
+            for i in range(0, len(ids), batch_size):
+                for e in vector_index.get_embeddings(ids[i:i+batch_size]):
+                    embeddings[e[index_name][id_property]] = e['embedding']
+
+            snapshot_ids = [i for i in ids if i in embeddings]
+
+            if len(snapshot_ids) < len(ids):
+                logger.warning(f'Missing embeddings for {len(ids) - len(snapshot_ids)} of {len(ids)} {index_name} ids')
+
+            matrix = np.array([embeddings[i] for i in snapshot_ids], dtype=np.float32)
+            if snapshot_ids:
+                dimensions = matrix.shape[1]
+            else:
+                matrix = matrix.reshape(0, dimensions or 0)
+
+            np.save(os.path.join(path, f'{index_name}.npy'), matrix)
+            np.save(os.path.join(path, f'{index_name}.ids.npy'), np.array(snapshot_ids, dtype=str))
+
+            digests[index_name] = _digest(ids)
+            indexes[index_name] = {
+                'count': len(snapshot_ids),
+                'digest': digests[index_name]
+            }
+
+            end = time.time()
+            logger.debug(f'Exported {index_name} embeddings [path: {path}, count: {len(snapshot_ids)}, duration: {(end-start) * 1000:.2f}ms]')
+
+        manifest = {
+            'generation': _generation(digests),
+            'index_generation': index_generation,
+            'created': int(time.time()),
+            'dimensions': dimensions,
+            'indexes': indexes
+        }
+
+        tmp_file = os.path.join(path, f'{MANIFEST_FILE}.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_file, os.path.join(path, MANIFEST_FILE))
+
+        return EmbeddingSnapshot(path)
+
+    def __init__(self, path:str):
+
+        self.path = path
+
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+
+        self._ids:Dict[str, np.ndarray] = {}
+        self._embeddings:Dict[str, np.ndarray] = {}
+
+        for index_name in self.manifest['indexes'].keys():
+            self._ids[index_name] = np.load(os.path.join(path, f'{index_name}.ids.npy'), mmap_mode='r')
+            self._embeddings[index_name] = np.load(os.path.join(path, f'{index_name}.npy'), mmap_mode='r')
+
+        logger.debug(f'Loaded embedding snapshot [path: {path}, generation: {self.generation}, indexes: {list(self._ids.keys())}]')
+
+    @property
+    def generation(self) -> str:
+        return self.manifest['generation']
+
+    @property
+    def index_names(self) -> List[str]:
+        return list(self._ids.keys())
+
+    def is_stale(self, graph_store:GraphStore) -> bool:
+
+        if 'index_generation' in self.manifest:
+            return graph_store.index_generation().refresh() != self.manifest['index_generation']
+
+        # Snapshots exported before index generations were recorded are compared id by id
+        for index_name, index_info in self.manifest['indexes'].items():
+            if _digest(get_ids_for_index(graph_store, index_name)) != index_info['digest']:
+                return True
+        return False
+
+    def get_embeddings(self, ids:List[str], index_name:str='statement') -> Dict[str, np.ndarray]:
+        """Returns zero-copy views of the embeddings for those ids present in the snapshot."""
+
+        id_table = self._ids.get(index_name)
+
+        if id_table is None or len(id_table) == 0 or not ids:
+            return {}
+
+        embeddings = self._embeddings[index_name]
+        positions = np.searchsorted(id_table, np.array(ids, dtype=str))
+
+        results = {}
+        for i, pos in zip(ids, positions):
+            if pos < len(id_table) and id_table[pos] == i:
+                results[i] = embeddings[pos]
+
+        return results
+
+EmbeddingSnapshotType = Union[str, EmbeddingSnapshot]
+
+def load_embedding_snapshot(snapshot:Optional[EmbeddingSnapshotType], graph_store:Optional[GraphStore]=None) -> Optional[EmbeddingSnapshot]:
+
+    if not snapshot:
+        return None
+
+    if not isinstance(snapshot, EmbeddingSnapshot):
+        if not os.path.exists(os.path.join(snapshot, MANIFEST_FILE)):
+            logger.warning(f'No embedding snapshot found at {snapshot}')
+            return None
+        snapshot = EmbeddingSnapshot(snapshot)
+
+    if isinstance(graph_store, GraphStore) and snapshot.is_stale(graph_store):
+        logger.warning(f'Ignoring stale embedding snapshot [path: {snapshot.path}, generation: {snapshot.generation}]')
+        return None
+
+    return snapshot
@@ -0,0 +1,159 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import math
+import time
+import logging
+import threading
+import numpy as np
+from hashlib import blake2b
+from typing import Dict, List, Optional
+
+from graphrag_toolkit.storage.graph_store import GraphStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+
+class BloomFilter():
+    """
+    A fixed-size Bloom filter over strings. might_contain() never returns False for a value that has
+    been added, and returns True for a value that has not been added with (approximately) the
+    false_positive_rate the filter was sized for.
+    """
+
+    def __init__(self, expected_items:int, false_positive_rate:float=DEFAULT_FALSE_POSITIVE_RATE):
+        expected_items = max(expected_items, 1)
+        self.num_bits = max(int(math.ceil(-expected_items * math.log(false_positive_rate) / (math.log(2) ** 2))), 8)
+        self.num_hashes = max(int(round(self.num_bits / expected_items * math.log(2))), 1)
+        self._bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, value:str):
+        digest = blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, value:str):
+        for p in self._positions(value):
+            self._bits[p >> 3] |= np.uint8(1 << (p & 7))
+
+    def might_contain(self, value:str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(value))
+
+    def __contains__(self, value:str) -> bool:
+        return self.might_contain(value)
+
+
+class EntityDictionaryEntry():
+
+    __slots__ = ('entityId', 'value', 'classification', 'degree')
+
+    def __init__(self, entityId:str, value:str, classification:str, degree:int):
+        self.entityId = entityId
+        self.value = value
+        self.classification = classification
+        self.degree = degree
+
+
+class EntityDictionary():
+    """
+    An in-process dictionary of the entities in a graph, keyed by search string, for resolving query
+    keywords to entities without a graph round trip.
+
+    The dictionary is loaded from the graph once, with load(), and reflects the graph at that point:
+    call load() again to pick up entities added since. A Bloom filter over the search strings sits in
+    front of the dictionary, so keywords that match no entity are rejected cheaply. If cache_entities
+    is False, only the Bloom filter is held in memory: keywords that pass the filter are still resolved
+    against the graph, but keywords that match no entity skip the graph entirely.
+
+    Each entry holds an entity's id, value, classification and degree (the number of facts in which
+    the entity is a subject or object).
+    """
+
+    def __init__(self, cache_entities:bool=True, false_positive_rate:float=DEFAULT_FALSE_POSITIVE_RATE):
+        self.cache_entities = cache_entities
+        self.false_positive_rate = false_positive_rate
+        self._bloom_filter:Optional[BloomFilter] = None
+        self._entries:Dict[str, List[EntityDictionaryEntry]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._bloom_filter is not None
+
+    def ensure_loaded(self, graph_store:GraphStore):
+        """Loads the dictionary from the graph, unless it has already been loaded."""
+        if self.is_loaded:
+            return
+        with self._lock:
+            if not self.is_loaded:
+                self._load(graph_store)
+
+    def load(self, graph_store:GraphStore):
+        """(Re)loads the dictionary from the graph."""
+        with self._lock:
+            self._load(graph_store)
+
+    def _load(self, graph_store:GraphStore):
+
+        start = time.time()
+
+        cypher = f'''
+        // load entity dictionary
+        MATCH (entity:`__Entity__`)-[r:`__SUBJECT__`|`__OBJECT__`]->(:`__Fact__`)
+        WITH entity, count(r) AS degree
+        RETURN {{
+            entityId: {graph_store.node_id("entity.entityId")},
+            value: entity.value,
+            class: entity.class,
+            search_str: entity.search_str,
+            degree: degree
+        }} AS result
+        '''
+
+        results = graph_store.execute_query(cypher)
+
+        bloom_filter = BloomFilter(len(results), self.false_positive_rate)
+        entries:Dict[str, List[EntityDictionaryEntry]] = {}
+
+        for result in results:
+            result = result['result']
+            search_str = result['search_str']
+            if not search_str:
+                continue
+            bloom_filter.add(search_str)
+            if self.cache_entities:
+                entries.setdefault(search_str, []).append(
+                    EntityDictionaryEntry(result['entityId'], result['value'], result['class'], result['degree'])
+                )
+
+        for search_str_entries in entries.values():
+            search_str_entries.sort(key=lambda e: e.degree, reverse=True)
+
+        self._entries = entries
+        self._bloom_filter = bloom_filter
+
+        end = time.time()
+
+        logger.debug(f'Loaded entity dictionary [num_entities: {len(results)}, num_bits: {bloom_filter.num_bits}, cache_entities: {self.cache_entities}, duration: {(end-start) * 1000:.2f}ms]')
+
+    def might_contain(self, search_str:str) -> bool:
+        """Returns False if no entity has the search string. Returns True if the dictionary has not been loaded."""
+        bloom_filter = self._bloom_filter
+        return bloom_filter is None or bloom_filter.might_contain(search_str)
+
+    def lookup(self, search_str:str, classification:Optional[str]=None) -> Optional[List[EntityDictionaryEntry]]:
+        """
+        Returns the entities with the search string (and, if supplied, a classification starting with
+        classification), ordered by degree. Returns None if the lookup must be resolved against the graph,
+        because the dictionary has not been loaded or does not cache entities.
+        """
+        if not self.might_contain(search_str):
+            return []
+        if not self.is_loaded or not self.cache_entities:
+            return None
+        entries = self._entries.get(search_str, [])
+        if classification:
+            entries = [e for e in entries if e.classification and e.classification.startswith(classification)]
+        return list(entries)
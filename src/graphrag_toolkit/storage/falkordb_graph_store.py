@@ -17,13 +17,66 @@ from llama_index.core.bridge.pydantic import PrivateAttr
 
 from graphrag_toolkit.storage.graph_store import ( 
     GraphStore, NodeId, 
-    format_id, RedactedGraphQueryLogFormatting)
+    format_id, RedactedGraphQueryLogFormatting, trace_graph_query)
+from graphrag_toolkit.storage.graph_schema import GraphIndex, GraphSchemaManager
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_DATABASE_NAME = 'graphrag'
 QUERY_RESULT_TYPE = Union[List[List[Node]], List[List[List[Path]]], List[List[Edge]]]
 
+class FalkorDBSchemaManager(GraphSchemaManager):
+    """
+    Creates range indexes, and uniqueness constraints for node id properties. FalkorDB builds indexes
+    and constraints asynchronously: a newly created index may not be used by queries until it has been
+    built.
+    """
+
+    def existing_indexes(self) -> List[GraphIndex]:
+
+        client = self.graph_store.client
+
+        indexed = set()
+
+        response = client.query('CALL db.indexes() YIELD label, properties, types, entitytype')
+        for (label, properties, types, entitytype) in response.result_set:
+            if entitytype != 'NODE':
+                continue
+            for p in properties:
+                if isinstance(types, dict) and 'RANGE' not in types.get(p, []):
+                    continue
+                indexed.add((label, p))
+
+        constrained = set(
+            (c['label'], p)
+            for c in client.list_constraints()
+            if c['type'] == 'UNIQUE' and c['entitytype'] == 'NODE' and c['status'] != 'FAILED'
+            for p in c['properties']
+        )
+
+        return [
+            index
+            for index in self.required_indexes()
+            if (index.label, index.property) in indexed and (not index.unique or (index.label, index.property) in constrained)
+        ]
+
+    def create_index(self, index:GraphIndex):
+
+        client = self.graph_store.client
+
+        try:
+            if index.unique:
+                # Also creates the range index the constraint requires
+                client.create_node_unique_constraint(index.label, index.property)
+            else:
+                client.create_node_range_index(index.label, index.property)
+        except ResponseError as e:
+            if 'already indexed' not in str(e) and 'already exists' not in str(e):
+                raise
+            
+        logger.debug(f'Created index [index: {index}]')
+
+
 class FalkorDBDatabaseClient(GraphStore):
     
     endpoint_url:str
@@ -123,6 +176,9 @@ class FalkorDBDatabaseClient(GraphStore):
         return self._client
         
     
+    def schema_manager(self) -> GraphSchemaManager:
+        return FalkorDBSchemaManager(self)
+
     def node_id(self, id_name: str) -> NodeId:
         """
         Format a node identifier.
@@ -132,6 +188,7 @@ class FalkorDBDatabaseClient(GraphStore):
         """
         return format_id(id_name)
 
+    @trace_graph_query
     def execute_query(self, 
                       cypher: str, 
                       parameters: Optional[dict] = None, 
@@ -0,0 +1,90 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from graphrag_toolkit.storage.graph_store import GraphStore
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class GraphIndex:
+    """
+    An index on a node label and property. Unique indexes are on node id properties, and are backed by
+    a uniqueness constraint where the graph store supports one.
+    """
+
+    label:str
+    property:str
+    unique:bool = False
+
+    def __str__(self):
+        return f'{self.label}({self.property}){" UNIQUE" if self.unique else ""}'
+
+# Indexes supporting the MERGE and MATCH clauses issued by the graph builders and retrievers
+GRAPH_INDEXES = [
+    GraphIndex('__Source__', 'sourceId', unique=True),
+    GraphIndex('__Chunk__', 'chunkId', unique=True),
+    GraphIndex('__Topic__', 'topicId', unique=True),
+    GraphIndex('__Statement__', 'statementId', unique=True),
+    GraphIndex('__Fact__', 'factId', unique=True),
+    GraphIndex('__Entity__', 'entityId', unique=True),
+    GraphIndex('__Entity__', 'search_str'),
+    GraphIndex('__SYS_Class__', 'sysClassId', unique=True)
+]
+
+class GraphSchemaManager():
+    """
+    Declares the indexes required by the toolkit's queries, and creates any that are missing.
+
+    The base implementation is for graph stores that index node ids and properties themselves (e.g. Amazon
+    Neptune): it reports no missing indexes, and creates none. Graph stores that require explicitly created
+    indexes return a subclass from GraphStore.schema_manager().
+    """
+
+    def __init__(self, graph_store:'GraphStore', indexes:Optional[List[GraphIndex]]=None):
+        self.graph_store = graph_store
+        self.indexes = indexes if indexes is not None else GRAPH_INDEXES
+
+    def required_indexes(self) -> List[GraphIndex]:
+        """Returns the declared indexes, excluding indexes on node ids that the graph store does not hold as properties."""
+        return [
+            index
+            for index in self.indexes
+            if not index.unique or self.graph_store.node_id(f'n.{index.property}').is_property_based
+        ]
+
+    def existing_indexes(self) -> List[GraphIndex]:
+        return self.required_indexes()
+
+    def create_index(self, index:GraphIndex):
+        raise NotImplementedError
+
+    def missing_indexes(self) -> List[GraphIndex]:
+        existing_indexes = set(self.existing_indexes())
+        return [index for index in self.required_indexes() if index not in existing_indexes]
+
+    def ensure_schema(self) -> List[GraphIndex]:
+        """Creates any missing indexes, and returns the indexes created. Safe to call repeatedly."""
+
+        missing_indexes = self.missing_indexes()
+
+        if not missing_indexes:
+            logger.debug(f'Graph schema up to date [graph_store: {type(self.graph_store).__name__}]')
+            return []
+
+        created_indexes = []
+
+        for index in missing_indexes:
+            try:
+                self.create_index(index)
+                created_indexes.append(index)
+            except Exception as e:
+                logger.warning(f'Failed to create graph index [index: {index}, graph_store: {type(self.graph_store).__name__}]: {e!s}')
+
+        logger.info(f'Created graph indexes [graph_store: {type(self.graph_store).__name__}, indexes: {", ".join(str(i) for i in created_indexes)}]')
+
+        return created_indexes
@@ -9,7 +9,13 @@ from tenacity import Retrying, stop_after_attempt, wait_random
 from tenacity import RetryCallState
 from typing import Callable, List, Dict, Any, Optional
 
-from llama_index.core.bridge.pydantic import BaseModel, Field
+from llama_index.core.bridge.pydantic import BaseModel, Field, PrivateAttr
+
+from graphrag_toolkit.storage.query_coalescing import coalesce, coalescing_key
+from graphrag_toolkit.storage.graph_schema import GraphIndex, GraphSchemaManager
+from graphrag_toolkit.storage.index_generation import IndexGeneration
+from graphrag_toolkit.utils.tracing import traced
+from graphrag_toolkit.utils.query_executor import to_executor, STAGE_GRAPH
 
 logger = logging.getLogger(__name__)
 
@@ -116,10 +122,28 @@ def on_query_failed(
         
     return log_it
 
+def query_template(cypher:str) -> str:
+    """Returns the leading comment of a query (e.g. `// chunk-based graph search`), or else its first line."""
+    first_line = cypher.strip().split('\n', 1)[0].strip()
+    if first_line.startswith('//'):
+        return first_line[2:].strip()
+    return first_line[:100]
+
+def _graph_query_attributes(graph_store:'GraphStore', cypher:str, *args, **kwargs) -> Dict[str, Any]:
+    return {
+        'graph.store': type(graph_store).__name__,
+        'graph.query.template': query_template(cypher)
+    }
+
+trace_graph_query = traced('graph.query', _graph_query_attributes)
+
 class GraphStore(BaseModel):
 
     log_formatting:GraphQueryLogFormatting = Field(default_factory=lambda: RedactedGraphQueryLogFormatting())
 
+    _schema_ensured:bool = PrivateAttr(default=False)
+    _index_generation:Optional[IndexGeneration] = PrivateAttr(default=None)
+
     def execute_query_with_retry(self, query:str, parameters:Dict[str, Any], max_attempts=3, max_wait=5, **kwargs):
         
         correlation_id = uuid.uuid4().hex[:5]
@@ -148,10 +172,41 @@ class GraphStore(BaseModel):
     def node_id(self, id_name:str) -> NodeId:
         return format_id(id_name)
     
+    def schema_manager(self) -> GraphSchemaManager:
+        return GraphSchemaManager(self)
+    
+    def missing_indexes(self) -> List[GraphIndex]:
+        """Returns the indexes required by the toolkit's queries that do not exist in the graph."""
+        return self.schema_manager().missing_indexes()
+    
+    def ensure_schema(self) -> List[GraphIndex]:
+        """Creates any missing indexes required by the toolkit's queries, once per graph store instance."""
+        if self._schema_ensured:
+            return []
+        created_indexes = self.schema_manager().ensure_schema()
+        self._schema_ensured = True
+        return created_indexes
+
+    def __getstate__(self):
+        self._index_generation = None
+        return super().__getstate__()
+
+    def index_generation(self) -> IndexGeneration:
+        """Returns the counter that build runs increment whenever they write new data to this graph."""
+        if self._index_generation is None:
+            self._index_generation = IndexGeneration(self)
+        return self._index_generation
+    
     @abc.abstractmethod
     def execute_query(self, cypher, parameters={}, correlation_id=None) -> Dict[str, Any]:
         raise NotImplementedError
 
+    async def aexecute_query(self, cypher, parameters={}, correlation_id=None) -> Dict[str, Any]:
+        return await coalesce(
+            coalescing_key('graph', cypher, parameters),
+            lambda: to_executor(STAGE_GRAPH, self.execute_query, cypher, parameters, correlation_id)
+        )
+
     
 class DummyGraphStore(GraphStore):
     def execute_query(self, cypher, parameters={}, correlation_id=None):  
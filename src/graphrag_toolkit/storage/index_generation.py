@@ -0,0 +1,79 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+import logging
+import threading
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from graphrag_toolkit.storage.graph_store import GraphStore
+
+logger = logging.getLogger(__name__)
+
+INDEX_GENERATION_ID = 'index-generation'
+DEFAULT_REFRESH_INTERVAL_SECONDS = 5.0
+
+class IndexGeneration():
+    """
+    A counter, stored in the graph, that is incremented each time LexicalGraphIndex builds new data
+    into the graph and vector stores. Caches include the current generation in their keys, so that
+    results computed from earlier versions of the indexed data are no longer used.
+
+    The generation is read from the graph at most once every refresh_interval_seconds: a build run by
+    another process invalidates cached results within this interval. Increments made through this
+    instance take effect immediately.
+    """
+
+    def __init__(self, graph_store:'GraphStore', refresh_interval_seconds:float=DEFAULT_REFRESH_INTERVAL_SECONDS):
+        self.graph_store = graph_store
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self._generation:Optional[int] = None
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def _generation_from(self, results) -> int:
+        return results[0]['result']['generation'] if results else 0
+
+    def _set(self, generation:int) -> int:
+        self._generation = generation
+        self._refreshed_at = time.monotonic()
+        return generation
+
+    def refresh(self) -> int:
+        """Reads the current generation from the graph."""
+
+        cypher = f'''// get index generation
+        MATCH (g:`__IndexGeneration__`{{{self.graph_store.node_id("generationId")}: '{INDEX_GENERATION_ID}'}})
+        RETURN {{ generation: g.generation }} AS result'''
+
+        generation = self._generation_from(self.graph_store.execute_query(cypher))
+
+        with self._lock:
+            return self._set(generation)
+
+    def current(self) -> int:
+        """Returns the current generation, reading it from the graph if the last read is older than the refresh interval."""
+        with self._lock:
+            if self._generation is not None and time.monotonic() - self._refreshed_at < self.refresh_interval_seconds:
+                return self._generation
+        return self.refresh()
+
+    def increment(self) -> int:
+        """Increments the generation in the graph, and returns the new generation."""
+
+        cypher = f'''// increment index generation
+        MERGE (g:`__IndexGeneration__`{{{self.graph_store.node_id("generationId")}: '{INDEX_GENERATION_ID}'}})
+        ON CREATE SET g.generation = 1
+        ON MATCH SET g.generation = g.generation + 1
+        RETURN {{ generation: g.generation }} AS result'''
+
+        generation = self._generation_from(self.graph_store.execute_query(cypher))
+
+        logger.debug(f'Incremented index generation [generation: {generation}]')
+
+        with self._lock:
+            return self._set(generation)
+
+    def __repr__(self):
+        return f'IndexGeneration(generation={self._generation}, refresh_interval_seconds={self.refresh_interval_seconds})'
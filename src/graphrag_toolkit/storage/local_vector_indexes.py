@@ -0,0 +1,400 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import json
+import logging
+import threading
+import numpy as np
+from contextlib import contextmanager
+from typing import List, Sequence, Dict, Any, Optional
+
+from graphrag_toolkit.config import GraphRAGConfig, EmbeddingType
+from graphrag_toolkit.storage.vector_index import VectorIndex, to_embedded_query, trace_vector_query
+from graphrag_toolkit.storage.constants import INDEX_KEY
+
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.schema import BaseNode, QueryBundle
+from llama_index.core.indices.utils import embed_nodes
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+EMBEDDINGS_FILE = 'embeddings.f32'
+RECORDS_FILE = 'records.jsonl'
+IVF_FILE = 'ivf.npz'
+LOCK_FILE = '.lock'
+
+DEFAULT_IVF_THRESHOLD = 10000
+DEFAULT_NPROBE = 8
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_SIZE = 50000
+
+def _kmeans(vectors:np.ndarray, num_clusters:int, iterations:int=KMEANS_ITERATIONS, seed:int=42) -> np.ndarray:
+
+    rng = np.random.default_rng(seed)
+
+    sample = vectors
+    if len(vectors) > KMEANS_SAMPLE_SIZE:
+        sample = vectors[rng.choice(len(vectors), KMEANS_SAMPLE_SIZE, replace=False)]
+    sample = np.asarray(sample, dtype=np.float32)
+
+    centroids = sample[rng.choice(len(sample), num_clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = _nearest_centroids(sample, centroids)
+        for c in range(num_clusters):
+            members = sample[assignments == c]
+            if len(members) > 0:
+                centroids[c] = members.mean(axis=0)
+
+    return centroids
+
+def _squared_distances(vectors:np.ndarray, query:np.ndarray) -> np.ndarray:
+    diff = vectors - query
+    return np.einsum('ij,ij->i', diff, diff)
+
+def _nearest_centroids(vectors:np.ndarray, centroids:np.ndarray, batch_size:int=8192) -> np.ndarray:
+
+    centroid_norms = np.einsum('ij,ij->i', centroids, centroids)
+    assignments = np.empty(len(vectors), dtype=np.int32)
+
+    for start in range(0, len(vectors), batch_size):
+        batch = np.asarray(vectors[start:start+batch_size], dtype=np.float32)
+        # ||v - c||^2 = ||v||^2 - 2v.c + ||c||^2; ||v||^2 is constant per row
+        scores = centroid_norms[None, :] - 2 * (batch @ centroids.T)
+        assignments[start:start+len(batch)] = np.argmin(scores, axis=1)
+
+    return assignments
+
+
+class LocalIndex(VectorIndex):
+    """
+    In-process vector index persisted to the local filesystem.
+
+    Embeddings are appended to a raw float32 file that is memory-mapped at query time;
+    ids, values and metadata are appended to a JSON lines file in the same order. Once the
+    index holds more than `ivf_threshold` vectors, an inverted file (IVF) index is trained
+    over the embeddings and `nprobe` of its lists (plus any vectors added since the IVF
+    index was last trained) are searched exactly. Smaller indexes are searched exhaustively.
+
+    The IVF index is trained when embeddings are added, never while querying, and is retrained
+    once the vectors added since the last training exceed half the indexed vectors. Queries
+    reload the IVF index whenever it has been retrained by this or another process.
+    """
+
+    @staticmethod
+    def for_index(index_name:str,
+                  path:str,
+                  embed_model:EmbeddingType=None,
+                  dimensions:int=None,
+                  nprobe:int=DEFAULT_NPROBE,
+                  ivf_threshold:int=DEFAULT_IVF_THRESHOLD):
+
+        embed_model = embed_model or GraphRAGConfig.embed_model
+        dimensions = dimensions or GraphRAGConfig.embed_dimensions
+
+        return LocalIndex(
+            index_name=index_name,
+            path=path,
+            embed_model=embed_model,
+            dimensions=dimensions,
+            nprobe=nprobe,
+            ivf_threshold=ivf_threshold
+        )
+
+    index_name:str
+    path:str
+    embed_model:EmbeddingType
+    dimensions:int
+    nprobe:int=DEFAULT_NPROBE
+    ivf_threshold:int=DEFAULT_IVF_THRESHOLD
+
+    _lock:Any = PrivateAttr(default=None)
+    _embeddings:Optional[np.ndarray] = PrivateAttr(default=None)
+    _records:List[Dict[str, Any]] = PrivateAttr(default_factory=list)
+    _id_to_row:Dict[str, int] = PrivateAttr(default_factory=dict)
+    _records_offset:int = PrivateAttr(default=0)
+    _centroids:Optional[np.ndarray] = PrivateAttr(default=None)
+    _lists:List[np.ndarray] = PrivateAttr(default_factory=list)
+    _num_indexed:int = PrivateAttr(default=0)
+    _ivf_version:Optional[tuple] = PrivateAttr(default=None)
+
+    def __getstate__(self):
+        self._lock = None
+        self._embeddings = None
+        self._records = []
+        self._id_to_row = {}
+        self._records_offset = 0
+        self._centroids = None
+        self._lists = []
+        self._num_indexed = 0
+        self._ivf_version = None
+        return super().__getstate__()
+
+    @property
+    def index_dir(self) -> str:
+        return os.path.join(self.path, self.index_name)
+
+    def _file(self, name:str) -> str:
+        return os.path.join(self.index_dir, name)
+
+    @property
+    def lock(self):
+        if self._lock is None:
+            self._lock = threading.RLock()
+        return self._lock
+
+    @contextmanager
+    def _file_lock(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(self._file(LOCK_FILE), 'a') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _num_rows_on_disk(self) -> int:
+        embeddings_file = self._file(EMBEDDINGS_FILE)
+        if not os.path.exists(embeddings_file):
+            return 0
+        return os.path.getsize(embeddings_file) // (4 * self.dimensions)
+
+    def _refresh(self):
+
+        # Pick up rows appended by this or other processes since the last refresh
+
+        num_rows = self._num_rows_on_disk()
+
+        if self._embeddings is not None and len(self._embeddings) == num_rows:
+            self._load_ivf()
+            return
+
+        records_file = self._file(RECORDS_FILE)
+
+        if os.path.exists(records_file):
+            with open(records_file, 'r', encoding='utf-8') as f:
+                f.seek(self._records_offset)
+                while len(self._records) < num_rows:
+                    line = f.readline()
+                    if not line:
+                        break
+                    record = json.loads(line)
+                    self._id_to_row[record['id']] = len(self._records)
+                    self._records.append(record)
+                self._records_offset = f.tell()
+
+        num_rows = min(num_rows, len(self._records))
+
+        self._embeddings = (
+            np.memmap(self._file(EMBEDDINGS_FILE), dtype=np.float32, mode='r', shape=(num_rows, self.dimensions))
+            if num_rows > 0
+            else np.zeros((0, self.dimensions), dtype=np.float32)
+        )
+
+        self._load_ivf()
+
+        logger.debug(f'[{self.index_name}] Refreshed local index [path: {self.index_dir}, num_rows: {num_rows}, num_indexed: {self._num_indexed}]')
+
+    def _load_ivf(self):
+
+        # The IVF file is replaced atomically whenever it is retrained, so its modification time
+        # and size identify the version loaded
+
+        ivf_file = self._file(IVF_FILE)
+
+        try:
+            stat = os.stat(ivf_file)
+        except FileNotFoundError:
+            return
+
+        ivf_version = (stat.st_mtime_ns, stat.st_size)
+
+        if ivf_version == self._ivf_version:
+            return
+
+        with np.load(ivf_file) as data:
+            centroids = data['centroids']
+            assignments = data['assignments']
+
+        # Trained over rows this process has not yet read: load on a later refresh
+        if len(assignments) > len(self._embeddings):
+            return
+
+        self._centroids = centroids
+        self._num_indexed = len(assignments)
+        self._lists = self._to_lists(assignments, len(centroids))
+        self._ivf_version = ivf_version
+
+        logger.debug(f'[{self.index_name}] Loaded IVF index [num_indexed: {self._num_indexed}, num_lists: {len(centroids)}]')
+
+    def _train_ivf_if_required(self):
+
+        num_rows = len(self._embeddings)
+        num_unindexed = num_rows - self._num_indexed
+
+        if num_rows >= self.ivf_threshold and num_unindexed > max(self._num_indexed, 1) / 2:
+            self._train_ivf()
+
+    def _to_lists(self, assignments:np.ndarray, num_lists:int) -> List[np.ndarray]:
+        order = np.argsort(assignments, kind='stable')
+        boundaries = np.searchsorted(assignments[order], np.arange(num_lists + 1))
+        return [order[boundaries[i]:boundaries[i+1]] for i in range(num_lists)]
+
+    def _train_ivf(self):
+
+        num_rows = len(self._embeddings)
+        num_lists = max(1, int(np.sqrt(num_rows)))
+
+        logger.debug(f'[{self.index_name}] Training IVF index [num_rows: {num_rows}, num_lists: {num_lists}]')
+
+        centroids = _kmeans(self._embeddings, num_lists)
+        assignments = _nearest_centroids(self._embeddings, centroids)
+
+        tmp_file = self._file(f'{IVF_FILE}.{os.getpid()}.tmp.npz')
+        np.savez(tmp_file, centroids=centroids, assignments=assignments)
+        os.replace(tmp_file, self._file(IVF_FILE))
+
+        self._ivf_version = None
+        self._load_ivf()
+
+    def _candidate_rows(self, query:np.ndarray) -> Optional[np.ndarray]:
+
+        if self._centroids is None:
+            return None
+
+        nprobe = min(self.nprobe, len(self._centroids))
+        centroid_distances = _squared_distances(self._centroids, query)
+        probes = np.argpartition(centroid_distances, nprobe - 1)[:nprobe]
+
+        candidates = [self._lists[p] for p in probes]
+        candidates.append(np.arange(self._num_indexed, len(self._embeddings)))
+
+        return np.concatenate(candidates)
+
+    def add_embeddings(self, nodes:Sequence[BaseNode]) -> Sequence[BaseNode]:
+
+        with self.lock, self._file_lock():
+
+            self._refresh()
+
+            new_nodes = []
+            seen_ids = set()
+
+            for node in nodes:
+                if node.node_id not in self._id_to_row and node.node_id not in seen_ids:
+                    seen_ids.add(node.node_id)
+                    new_nodes.append(node)
+
+            if not new_nodes:
+                return nodes
+
+            id_to_embed_map = embed_nodes(
+                new_nodes, self.embed_model
+            )
+
+            embeddings = np.array([id_to_embed_map[node.node_id] for node in new_nodes], dtype=np.float32)
+
+            if embeddings.shape[1] != self.dimensions:
+                raise ValueError(f'Invalid embedding dimensions for index {self.index_name}: expected {self.dimensions}, got {embeddings.shape[1]}')
+
+            with open(self._file(RECORDS_FILE), 'a', encoding='utf-8') as f:
+                for node in new_nodes:
+                    f.write(json.dumps({
+                        'id': node.node_id,
+                        'value': node.text,
+                        'metadata': node.metadata
+                    }) + '\n')
+
+            with open(self._file(EMBEDDINGS_FILE), 'ab') as f:
+                f.write(embeddings.tobytes())
+
+            logger.debug(f'[{self.index_name}] Added embeddings [num_nodes: {len(new_nodes)}]')
+
+            self._refresh()
+            self._train_ivf_if_required()
+
+        return nodes
+
+    def _to_top_k_result(self, record:Dict[str, Any], score:float):
+
+        result = {
+            'score': round(score, 7)
+        }
+
+        metadata = record['metadata']
+
+        if INDEX_KEY in metadata:
+            index_name = metadata[INDEX_KEY]['index']
+            result[index_name] = metadata[index_name]
+            if 'source' in metadata:
+                result['source'] = metadata['source']
+        else:
+            for k,v in metadata.items():
+                result[k] = v
+
+        return result
+
+    def _to_get_embedding_result(self, record:Dict[str, Any], embedding:np.ndarray):
+
+        result = {
+            'id': record['id'],
+            'value': record['value'],
+            'embedding': embedding.tolist()
+        }
+
+        for k,v in record['metadata'].items():
+            if k != INDEX_KEY:
+                result[k] = v
+
+        return result
+
+    @trace_vector_query
+    def top_k(self, query_bundle:QueryBundle, top_k:int=5) -> Sequence[Dict[str, Any]]:
+
+        query_bundle = to_embedded_query(query_bundle, self.embed_model)
+        query = np.array(query_bundle.embedding, dtype=np.float32)
+
+        with self.lock:
+
+            self._refresh()
+
+            if len(self._embeddings) == 0:
+                return []
+
+            rows = self._candidate_rows(query)
+            vectors = self._embeddings if rows is None else self._embeddings[rows]
+
+            distances = np.sqrt(_squared_distances(vectors, query))
+
+            k = min(top_k, len(distances))
+            nearest = np.argpartition(distances, k - 1)[:k]
+            nearest = nearest[np.argsort(distances[nearest])]
+
+            return [
+                self._to_top_k_result(
+                    self._records[int(i) if rows is None else int(rows[i])],
+                    float(distances[i])
+                )
+                for i in nearest
+            ]
+
+    def get_embeddings(self, ids:List[str]=[]) -> Sequence[Dict[str, Any]]:
+
+        with self.lock:
+
+            self._refresh()
+
+            rows = [self._id_to_row[i] for i in ids if i in self._id_to_row]
+
+            return [
+                self._to_get_embedding_result(self._records[row], self._embeddings[row])
+                for row in rows
+            ]
@@ -9,7 +9,7 @@ import uuid
 from botocore.config import Config
 from typing import Optional, Any
 
-from graphrag_toolkit.storage.graph_store import GraphStore, NodeId
+from graphrag_toolkit.storage.graph_store import GraphStore, NodeId, trace_graph_query
 
 from llama_index.core.bridge.pydantic import PrivateAttr
 
@@ -57,6 +57,7 @@ class NeptuneAnalyticsClient(GraphStore):
     def node_id(self, id_name:str) -> NodeId:
         return format_id_for_neptune(id_name)
  
+    @trace_graph_query
     def execute_query(self, cypher, parameters={}, correlation_id=None):
 
         query_id = uuid.uuid4().hex[:5]
@@ -117,6 +118,7 @@ class NeptuneDatabaseClient(GraphStore):
     def node_id(self, id_name:str) -> NodeId:
         return format_id_for_neptune(id_name)
 
+    @trace_graph_query
     def execute_query(self, cypher, parameters={}, correlation_id=None):
 
         query_id = uuid.uuid4().hex[:5]
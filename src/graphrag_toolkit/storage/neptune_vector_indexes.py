@@ -8,7 +8,7 @@ from graphrag_toolkit.config import GraphRAGConfig
 from graphrag_toolkit.storage import GraphStoreFactory, GraphStore
 from graphrag_toolkit.storage.graph_utils import node_result
 from graphrag_toolkit.storage.neptune_graph_stores import NeptuneAnalyticsClient
-from graphrag_toolkit.storage.vector_index import VectorIndex, to_embedded_query
+from graphrag_toolkit.storage.vector_index import VectorIndex, to_embedded_query, trace_vector_query
 
 from llama_index.core.indices.utils import embed_nodes
 from llama_index.core.schema import QueryBundle
@@ -112,6 +112,7 @@ class NeptuneIndex(VectorIndex):
 
         return nodes
     
+    @trace_vector_query
     def top_k(self, query_bundle:QueryBundle, top_k:int=5):
 
         query_bundle = to_embedded_query(query_bundle, self.embed_model)
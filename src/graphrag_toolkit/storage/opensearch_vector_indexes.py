@@ -20,7 +20,7 @@ from opensearchpy import Urllib3AWSV4SignerAuth, Urllib3HttpConnection
 from opensearchpy import OpenSearch, AsyncOpenSearch
 
 from graphrag_toolkit.config import GraphRAGConfig, EmbeddingType
-from graphrag_toolkit.storage.vector_index import VectorIndex, to_embedded_query
+from graphrag_toolkit.storage.vector_index import VectorIndex, to_embedded_query, trace_vector_query
 from graphrag_toolkit.storage.constants import INDEX_KEY
 
 logger = logging.getLogger(__name__)
@@ -251,6 +251,7 @@ class OpenSearchIndex(VectorIndex):
         
         return nodes
     
+    @trace_vector_query
     def top_k(self, query_bundle:QueryBundle, top_k:int=5):
         
         async def atop_k(query_bundle, top_k):
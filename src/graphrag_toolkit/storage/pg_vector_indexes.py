@@ -11,7 +11,7 @@ from typing import List, Sequence, Dict, Any, Optional
 from urllib.parse import urlparse
 
 from graphrag_toolkit.config import GraphRAGConfig, EmbeddingType
-from graphrag_toolkit.storage.vector_index import VectorIndex, to_embedded_query
+from graphrag_toolkit.storage.vector_index import VectorIndex, to_embedded_query, trace_vector_query
 from graphrag_toolkit.storage.constants import INDEX_KEY
 
 from llama_index.core.schema import BaseNode, QueryBundle
@@ -184,6 +184,7 @@ class PGIndex(VectorIndex):
             
         return result
     
+    @trace_vector_query
     def top_k(self, query_bundle:QueryBundle, top_k:int=5) -> Sequence[Dict[str, Any]]:
 
         dbconn = self._get_connection()
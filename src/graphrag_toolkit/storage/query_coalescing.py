@@ -0,0 +1,65 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_coalescer:ContextVar[Optional['QueryCoalescer']] = ContextVar('query_coalescer', default=None)
+
+def coalescing_key(*parts:Any) -> str:
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
+class QueryCoalescer():
+    """
+    Shares the results of identical store reads issued concurrently by the queries in a batch.
+
+    The first request for a key starts the read; later requests for the same key await the same
+    task. Results are shared between callers, and must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        self._tasks:Dict[str, asyncio.Task] = {}
+        self.num_requests = 0
+        self.num_reads = 0
+
+    @staticmethod
+    @contextmanager
+    def for_batch():
+        """Installs a coalescer for coroutines started within the block. Must be entered from a running event loop."""
+        coalescer = QueryCoalescer()
+        token = _current_coalescer.set(coalescer)
+        try:
+            yield coalescer
+        finally:
+            _current_coalescer.reset(token)
+            logger.debug(f'Coalesced batch reads [num_requests: {coalescer.num_requests}, num_reads: {coalescer.num_reads}]')
+
+    async def run(self, key:str, fn:Callable[[], Awaitable[Any]]) -> Any:
+        self.num_requests += 1
+        task = self._tasks.get(key)
+        if task is None:
+            self.num_reads += 1
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+        return await asyncio.shield(task)
+
+
+async def coalesce(key:str, fn:Callable[[], Awaitable[Any]]) -> Any:
+    """Runs fn, sharing its result with identical concurrent requests if a batch coalescer is active."""
+
+    coalescer = _current_coalescer.get()
+
+    # Tasks are bound to the loop that created them. Coroutines running in a nested
+    # event loop (e.g. in a worker thread) read directly from the store.
+    if coalescer is None or asyncio.get_running_loop() is not coalescer._loop:
+        return await fn()
+
+    return await coalescer.run(key, fn)
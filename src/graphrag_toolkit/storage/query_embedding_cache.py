@@ -0,0 +1,130 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import re
+import logging
+import threading
+from hashlib import sha256
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from graphrag_toolkit.config import GraphRAGConfig, EmbeddingType
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+def normalize_embedding_str(s:str) -> str:
+    """
+    Collapses and strips whitespace. Case and punctuation are preserved, because embedding models are
+    sensitive to both.
+    """
+    return _WHITESPACE.sub(' ', s).strip()
+
+def embed_model_key(embed_model:EmbeddingType) -> Hashable:
+    """
+    Identifies an embedding model by a digest of its configuration, so that models with different
+    configurations do not share entries, and a model created after another has been garbage collected
+    does not inherit its entries.
+    """
+    try:
+        config = embed_model.to_json()
+    except Exception as e:
+        logger.debug(f'Unable to serialize embedding model configuration, falling back to model name: {e}')
+        config = getattr(embed_model, 'model_name', None)
+    return (type(embed_model).__name__, sha256(str(config).encode('utf-8')).hexdigest())
+
+
+class QueryEmbeddingCache():
+    """
+    A bounded, in-memory LRU cache of query embeddings, keyed by embedding model and normalized query
+    strings. Once the cache holds max_size entries, the least recently used entry is evicted on each
+    insert. If max_size is None, the capacity is read from GraphRAGConfig.query_embedding_cache_size;
+    a capacity of 0 disables the cache.
+
+    All retrievers in a process share DEFAULT_QUERY_EMBEDDING_CACHE, via to_embedded_query().
+    """
+
+    def __init__(self, max_size:Optional[int]=None):
+        self._max_size = max_size
+        self._entries:OrderedDict[Tuple[Hashable, Tuple[str, ...]], Tuple[float, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size if self._max_size is not None else GraphRAGConfig.query_embedding_cache_size
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _key(self, embed_model:EmbeddingType, embedding_strs:Sequence[str]):
+        return (embed_model_key(embed_model), tuple(normalize_embedding_str(s) for s in embedding_strs))
+
+    def get(self, embed_model:EmbeddingType, embedding_strs:Sequence[str]) -> Optional[List[float]]:
+        """Returns a copy of the cached embedding for the query strings, or None."""
+
+        if not self.enabled:
+            return None
+
+        key = self._key(embed_model, embedding_strs)
+
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(embedding)
+
+    def put(self, embed_model:EmbeddingType, embedding_strs:Sequence[str], embedding:List[float]):
+
+        if not self.enabled or not embedding:
+            return
+
+        key = self._key(embed_model, embedding_strs)
+        max_size = self.max_size
+
+        with self._lock:
+            self._entries[key] = tuple(embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_embed(self, embed_model:EmbeddingType, embedding_strs:Sequence[str], embed_fn:Callable[[], List[float]]) -> List[float]:
+        """Returns the cached embedding for the query strings, calling embed_fn and caching its result on a miss."""
+        embedding = self.get(embed_model, embedding_strs)
+        if embedding is None:
+            embedding = embed_fn()
+            self.put(embed_model, embedding_strs, embedding)
+        return embedding
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._reset_stats()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions
+            }
+
+    def __repr__(self):
+        return f'QueryEmbeddingCache(max_size={self.max_size})'
+
+DEFAULT_QUERY_EMBEDDING_CACHE = QueryEmbeddingCache()
@@ -0,0 +1,271 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import re
+import json
+import math
+import time
+import logging
+import threading
+import numpy as np
+from collections import Counter
+from contextlib import contextmanager
+from scipy.sparse import csr_matrix, vstack
+from typing import Dict, List, Tuple, Optional
+
+from graphrag_toolkit.storage.graph_store import GraphStore
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+TERMS_FILE = 'statement_terms.jsonl'
+LOCK_FILE = '.lock'
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+def tokenize(text:str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class StatementLexicalIndex():
+    """
+    Sparse TF-IDF index over statement text, persisted to the local filesystem.
+
+    Term counts for each statement are appended to a JSON lines file, either incrementally by
+    `GraphConstruction`, or in a single pass over the graph the first time the index is opened.
+    When statements are appended, only the new lines are read: their log term frequencies are
+    appended to the term matrix, and document frequencies and IDF weights are updated. Candidate
+    rows are weighted by the current IDF, and normalized, when they are scored, so scoring a set of
+    candidate statements against a query requires only a sparse dot product.
+    """
+
+    _instances:Dict[str, 'StatementLexicalIndex'] = {}
+    _instances_lock = threading.Lock()
+
+    @staticmethod
+    def for_path(path:str, graph_store:Optional[GraphStore]=None):
+        """Returns a process-wide instance for the path, building the index from the graph if it doesn't yet exist."""
+
+        path = os.path.abspath(path)
+
+        with StatementLexicalIndex._instances_lock:
+            index = StatementLexicalIndex._instances.get(path)
+            if index is None:
+                index = StatementLexicalIndex(path)
+                StatementLexicalIndex._instances[path] = index
+
+        if graph_store is not None and not index.exists():
+            index.build_from_graph(graph_store)
+
+        return index
+
+    def __init__(self, path:str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._reset()
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._offset = 0
+        self._vocabulary:Dict[str, int] = {}
+        self._id_to_row:Dict[str, int] = {}
+        self._tf:Optional[csr_matrix] = None
+        self._df:np.ndarray = np.zeros(0, dtype=np.int64)
+        self._idf:Optional[np.ndarray] = None
+
+    @property
+    def terms_file(self) -> str:
+        return os.path.join(self.path, TERMS_FILE)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.terms_file)
+
+    @contextmanager
+    def _file_lock(self):
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, LOCK_FILE), 'a') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def add_statements(self, statements:List[Tuple[str, str]]):
+        """Adds (statement_id, statement_text) pairs to the index. Statements already in the index are ignored."""
+
+        with self._lock, self._file_lock():
+
+            self._refresh()
+
+            lines = []
+            seen_ids = set()
+
+            for (statement_id, text) in statements:
+                if statement_id in self._id_to_row or statement_id in seen_ids:
+                    continue
+                seen_ids.add(statement_id)
+                lines.append(json.dumps({'id': statement_id, 'terms': Counter(tokenize(text))}))
+
+            if lines:
+                with open(self.terms_file, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(lines) + '\n')
+
+                logger.debug(f'Added statements to lexical index [path: {self.path}, num_statements: {len(lines)}]')
+
+    def build_from_graph(self, graph_store:GraphStore):
+
+        start = time.time()
+
+        cypher = f'''// get statements for lexical index
+        MATCH (statement:`__Statement__`)
+        RETURN {{
+            statementId: {graph_store.node_id("statement.statementId")},
+            value: statement.value
+        }} AS result
+        '''
+
+        results = graph_store.execute_query(cypher)
+
+        self.add_statements([(r['result']['statementId'], r['result']['value']) for r in results])
+
+        end = time.time()
+
+        logger.debug(f'Built lexical index from graph [path: {self.path}, num_statements: {len(results)}, duration: {(end-start) * 1000:.2f}ms]')
+
+    def _refresh(self):
+
+        if not self.exists():
+            return
+
+        if os.path.getsize(self.terms_file) == self._offset:
+            return
+
+        num_rows = len(self._id_to_row)
+
+        indptr = [0]
+        indices = []
+        counts = []
+
+        with open(self.terms_file, 'r', encoding='utf-8') as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                record = json.loads(line)
+                for term, count in record['terms'].items():
+                    indices.append(self._vocabulary.setdefault(term, len(self._vocabulary)))
+                    counts.append(count)
+                indptr.append(len(indices))
+                self._id_to_row[record['id']] = num_rows + len(indptr) - 2
+                self._offset += len(line.encode('utf-8'))
+
+        # Nothing to do if the file only holds a partially written line
+        if len(indptr) > 1:
+            self._append_rows(indptr, indices, counts)
+
+    def _append_rows(self, indptr:List[int], indices:List[int], counts:List[int]):
+
+        num_terms = len(self._vocabulary)
+
+        new_tf = csr_matrix(
+            (1 + np.log(np.array(counts, dtype=np.float32)), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, num_terms)
+        )
+
+        if self._tf is None:
+            self._tf = new_tf
+        else:
+            # Terms first seen in the new rows add columns to the existing rows
+            self._tf.resize((self._tf.shape[0], num_terms))
+            self._tf = vstack([self._tf, new_tf], format='csr')
+
+        df = np.zeros(num_terms, dtype=np.int64)
+        df[:len(self._df)] = self._df
+        self._df = df + np.bincount(new_tf.indices, minlength=num_terms)
+
+        num_rows = self._tf.shape[0]
+        self._idf = (np.log((1 + num_rows) / (1 + self._df)) + 1).astype(np.float32)
+
+        logger.debug(f'Updated lexical index [path: {self.path}, num_statements: {num_rows}, num_new_statements: {new_tf.shape[0]}, num_terms: {num_terms}]')
+
+    def _weights(self, rows:List[int]) -> csr_matrix:
+        return self._normalize(self._tf[rows].multiply(self._idf).tocsr())
+
+    def _normalize(self, m:csr_matrix) -> csr_matrix:
+        norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return csr_matrix(m.multiply(1 / norms[:, None]))
+
+    def _vectorize(self, texts:List[str]) -> csr_matrix:
+
+        # Terms not in the vocabulary don't contribute to scores, so can be ignored
+
+        indptr = [0]
+        indices = []
+        data = []
+
+        for text in texts:
+            for term, count in Counter(tokenize(text)).items():
+                column = self._vocabulary.get(term)
+                if column is not None:
+                    indices.append(column)
+                    data.append((1 + math.log(count)) * self._idf[column])
+            indptr.append(len(indices))
+
+        m = csr_matrix(
+            (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(texts), len(self._vocabulary))
+        )
+
+        return self._normalize(m)
+
+    def score(self, match_values:List[str], statements:List[Tuple[Optional[str], str]]) -> List[float]:
+        """
+        Scores (statement_id, statement_text) pairs against the match values. A statement's score is the
+        maximum of its cosine similarities with the individual match values. Statements not in the index
+        are vectorized using the index's IDF weights.
+        """
+
+        with self._lock:
+
+            self._refresh()
+
+            if self._tf is None or not statements or not match_values:
+                return [0.0] * len(statements)
+
+            known = [self._id_to_row.get(statement_id) for (statement_id, _) in statements]
+            unknown = [i for i, row in enumerate(known) if row is None]
+
+            if unknown:
+                candidates = vstack([
+                    self._weights([row for row in known if row is not None]),
+                    self._vectorize([statements[i][1] for i in unknown])
+                ]).tocsr()
+                order = [i for i, row in enumerate(known) if row is not None] + unknown
+            else:
+                candidates = self._weights(known)
+                order = list(range(len(statements)))
+
+            query = self._vectorize(match_values)
+
+            similarities = (candidates @ query.T).toarray().max(axis=1)
+
+        scores = [0.0] * len(statements)
+        for position, i in enumerate(order):
+            scores[i] = float(similarities[position])
+
+        return scores
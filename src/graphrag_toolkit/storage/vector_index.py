@@ -3,27 +3,83 @@
 
 import logging
 import abc
+import asyncio
 
-from typing import Sequence, Any, List, Dict
+from typing import Sequence, Any, List, Dict, Optional
 from llama_index.core.schema import QueryBundle, BaseNode
 from llama_index.core.bridge.pydantic import BaseModel, field_validator
 
 from graphrag_toolkit import EmbeddingType
 from graphrag_toolkit.storage.constants import ALL_EMBEDDING_INDEXES
+from graphrag_toolkit.storage.query_coalescing import coalesce, coalescing_key
+from graphrag_toolkit.storage.query_embedding_cache import QueryEmbeddingCache, DEFAULT_QUERY_EMBEDDING_CACHE
+from graphrag_toolkit.utils.tracing import traced
+from graphrag_toolkit.utils.query_executor import to_executor, STAGE_VECTOR, STAGE_EMBEDDING
 
 logger = logging.getLogger(__name__)
 
-def to_embedded_query(query_bundle:QueryBundle, embed_model:EmbeddingType) -> QueryBundle:
+def to_embedded_query(query_bundle:QueryBundle, embed_model:EmbeddingType, embedding_cache:Optional[QueryEmbeddingCache]=None) -> QueryBundle:
     if query_bundle.embedding:
         return query_bundle
+
+    embedding_cache = embedding_cache if embedding_cache is not None else DEFAULT_QUERY_EMBEDDING_CACHE
     
-    query_bundle.embedding = (
-        embed_model.get_agg_embedding_from_queries(
-            query_bundle.embedding_strs
-        )
-    ) 
+    query_bundle.embedding = embedding_cache.get_or_embed(
+        embed_model,
+        query_bundle.embedding_strs,
+        lambda: embed_model.get_agg_embedding_from_queries(query_bundle.embedding_strs)
+    )
     return query_bundle   
 
+async def to_aembedded_query(query_bundle:QueryBundle, embed_model:EmbeddingType, embedding_cache:Optional[QueryEmbeddingCache]=None) -> QueryBundle:
+    if query_bundle.embedding:
+        return query_bundle
+
+    embedding_cache = embedding_cache if embedding_cache is not None else DEFAULT_QUERY_EMBEDDING_CACHE
+
+    # Serve cache hits without a thread hop
+    embedding = embedding_cache.get(embed_model, query_bundle.embedding_strs)
+    if embedding is not None:
+        query_bundle.embedding = embedding
+        return query_bundle
+    
+    # The Bedrock embedding model's async methods call the blocking client directly,
+    # so embed on the query executor
+    query_bundle.embedding = await to_executor(STAGE_EMBEDDING, embed_model.get_agg_embedding_from_queries, query_bundle.embedding_strs)
+    embedding_cache.put(embed_model, query_bundle.embedding_strs, query_bundle.embedding)
+    return query_bundle
+
+async def to_aembedded_queries(query_bundles:List[QueryBundle], embed_model:EmbeddingType, max_concurrency:int=10) -> List[QueryBundle]:
+    """Embeds a batch of queries, embedding each distinct query once."""
+
+    unique_query_bundles = {}
+    for query_bundle in query_bundles:
+        if not query_bundle.embedding:
+            unique_query_bundles.setdefault(tuple(query_bundle.embedding_strs), query_bundle)
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def embed(query_bundle):
+        async with semaphore:
+            return await to_aembedded_query(query_bundle, embed_model)
+
+    await asyncio.gather(*[embed(query_bundle) for query_bundle in unique_query_bundles.values()])
+
+    for query_bundle in query_bundles:
+        if not query_bundle.embedding:
+            query_bundle.embedding = unique_query_bundles[tuple(query_bundle.embedding_strs)].embedding
+
+    return query_bundles
+
+def _vector_query_attributes(vector_index:'VectorIndex', query_bundle:QueryBundle, top_k:int=5) -> Dict[str, Any]:
+    return {
+        'vector.store': type(vector_index).__name__,
+        'vector.index': vector_index.index_name,
+        'vector.top_k': top_k
+    }
+
+trace_vector_query = traced('vector.top_k', _vector_query_attributes)
+
 class VectorIndex(BaseModel):
     index_name: str
     
@@ -44,6 +100,15 @@ class VectorIndex(BaseModel):
     @abc.abstractmethod
     def get_embeddings(self, ids:List[str]=[]) -> Sequence[Dict[str, Any]]:
         raise NotImplementedError
+
+    async def atop_k(self, query_bundle:QueryBundle, top_k:int=5) -> Sequence[Dict[str, Any]]:
+        return await coalesce(
+            coalescing_key('vector', self.index_name, query_bundle.query_str, query_bundle.embedding, top_k),
+            lambda: to_executor(STAGE_VECTOR, self.top_k, query_bundle, top_k)
+        )
+
+    async def aget_embeddings(self, ids:List[str]=[]) -> Sequence[Dict[str, Any]]:
+        return await to_executor(STAGE_VECTOR, self.get_embeddings, ids)
     
 class DummyVectorIndex(VectorIndex):
 
@@ -6,6 +6,7 @@ import logging
 from graphrag_toolkit.storage.opensearch_vector_indexes import OpenSearchIndex
 from graphrag_toolkit.storage.neptune_vector_indexes import NeptuneIndex
 from graphrag_toolkit.storage.pg_vector_indexes import PGIndex
+from graphrag_toolkit.storage.local_vector_indexes import LocalIndex
 from graphrag_toolkit.storage.vector_index import DummyVectorIndex
 
 logger = logging.getLogger(__name__)
@@ -14,6 +15,7 @@ OPENSEARCH_SERVERLESS = 'aoss://'
 NEPTUNE_ANALYTICS = 'neptune-graph://'
 POSTGRES = 'postgres://'
 POSTGRESQL = 'postgresql://'
+LOCAL = 'local://'
 DUMMY_VECTOR_STORE = 'vector://'
 
 def vector_info_resolver(vector_index_info:str=None):
@@ -30,6 +32,8 @@ def vector_info_resolver(vector_index_info:str=None):
         return (OPENSEARCH_SERVERLESS, vector_index_info)
     elif vector_index_info.startswith(POSTGRES) or vector_index_info.startswith(POSTGRESQL):
         return (POSTGRES, vector_index_info)
+    elif vector_index_info.startswith(LOCAL):
+        return (LOCAL, vector_index_info[len(LOCAL):])
     else:
         raise ValueError(f'Incorrectly formatted vector index connection info: {vector_index_info}')
     
@@ -49,6 +53,9 @@ class VectorIndexFactory():
         elif vector_index_type == POSTGRES:
             logger.debug(f"Opening PostgreSQL vector index [index_name: {index_name}, connection_string: {init_info}]")
             return VectorIndexFactory.for_postgres(index_name, init_info, **kwargs)
+        elif vector_index_type == LOCAL:
+            logger.debug(f"Opening local vector index [index_name: {index_name}, path: {init_info}]")
+            return VectorIndexFactory.for_local(index_name, init_info, **kwargs)
         elif vector_index_type == DUMMY_VECTOR_STORE:
             logger.debug(f"Opening dummy vector store [index_name: {index_name}]")
             return VectorIndexFactory.for_dummy_vector_index(index_name, **kwargs)
@@ -66,6 +73,10 @@ class VectorIndexFactory():
     @staticmethod
     def for_postgres(index_name, connection_string, **kwargs):
         return PGIndex.for_index(index_name, connection_string, **kwargs)
+    
+    @staticmethod
+    def for_local(index_name, path, **kwargs):
+        return LocalIndex.for_index(index_name, path, **kwargs)
         
     @staticmethod
     def for_dummy_vector_index(index_name, *args, **kwargs):
@@ -2,4 +2,6 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from .fm_observability import FMObservabilityPublisher, ConsoleFMObservabilitySubscriber
-from .llm_cache import LLMCache, LLMCacheType
\ No newline at end of file
+from .llm_cache import LLMCache, LLMCacheType
+from .tracing import Tracing, InMemorySpanExporter, JsonLinesSpanExporter, trace_span
+from .query_executor import QueryExecutor
@@ -1,13 +1,17 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import logging
 import os
 from hashlib import sha256
-from typing import Optional, Any, Union
+from typing import Optional, Any, Union, Generator, AsyncGenerator
 
 from graphrag_toolkit import ModelError
 from graphrag_toolkit.utils.bedrock_utils import *
+from graphrag_toolkit.storage.query_coalescing import coalesce, coalescing_key
+from graphrag_toolkit.utils.tracing import traced
+from graphrag_toolkit.utils.query_executor import to_executor, current_query_executor, STAGE_LLM
 
 from llama_index.core.llms.llm import LLM
 from llama_index.llms.bedrock import Bedrock
@@ -25,6 +29,7 @@ class LLMCache(BaseModel):
     verbose_prompt:Optional[bool] = Field(default=False)
     verbose_response:Optional[bool] = Field(default=False)
 
+    @traced('llm.predict')
     def predict(
         self,
         prompt: BasePromptTemplate,
@@ -43,9 +48,7 @@ class LLMCache(BaseModel):
                 raise ModelError(f'{e!s} [Model config: {self.llm.to_json()}]') from e
         else:
             
-            cache_key = f'{self.llm.to_json()},{prompt.format(**prompt_args)}'
-            cache_hex = sha256(cache_key.encode('utf-8')).hexdigest()
-            cache_file = f'cache/llm/{cache_hex}.txt'
+            cache_file = self._cache_file_for(prompt, **prompt_args)
 
             if os.path.exists(cache_file):
                 logger.debug('%sCached response %s%s', c_blue, cache_file, c_norm)
@@ -65,6 +68,134 @@ class LLMCache(BaseModel):
             
         return response
     
+    async def apredict(
+        self,
+        prompt: BasePromptTemplate,
+        **prompt_args: Any
+    ) -> str:
+        return await coalesce(
+            coalescing_key('llm', self.llm.to_json(), prompt.format(**prompt_args)),
+            lambda: self._apredict(prompt, **prompt_args)
+        )
+
+    @traced('llm.predict')
+    async def _apredict(
+        self,
+        prompt: BasePromptTemplate,
+        **prompt_args: Any
+    ) -> str:
+
+        # The Bedrock LLM has no native async support (acomplete is not implemented, and
+        # achat blocks), so the synchronous client is run on the query executor
+        
+        response = None
+
+        if self.verbose_prompt:
+            logger.info('%s%s%s', c_blue, prompt.format(**prompt_args), c_norm)
+
+        if not self.enable_cache:
+            try:
+                response = await to_executor(STAGE_LLM, self.llm.predict, prompt, **prompt_args)
+            except Exception as e:
+                raise ModelError(f'{e!s} [Model config: {self.llm.to_json()}]') from e
+        else:
+            
+            cache_file = self._cache_file_for(prompt, **prompt_args)
+
+            if os.path.exists(cache_file):
+                logger.debug('%sCached response %s%s', c_blue, cache_file, c_norm)
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    response = f.read()
+            else:
+                try:
+                    response = await to_executor(STAGE_LLM, self.llm.predict, prompt, **prompt_args)
+                except Exception as e:
+                    raise ModelError(f'{e!s} Model config: {self.llm.to_json()}') from e
+                os.makedirs(os.path.dirname(os.path.realpath(cache_file)), exist_ok=True)
+                with open(cache_file, 'w') as f:
+                    f.write(response)
+
+        if self.verbose_response:
+            logger.info('%s%s%s', c_green, response, c_norm)
+            
+        return response
+    
+    def _cache_file_for(self, prompt: BasePromptTemplate, **prompt_args: Any) -> str:
+        cache_key = f'{self.llm.to_json()},{prompt.format(**prompt_args)}'
+        cache_hex = sha256(cache_key.encode('utf-8')).hexdigest()
+        return f'cache/llm/{cache_hex}.txt'
+
+    def stream(
+        self,
+        prompt: BasePromptTemplate,
+        **prompt_args: Any
+    ) -> Generator[str, None, None]:
+        """
+        Yields the response as it is generated. If the cache is enabled, a cached response is yielded 
+        in a single piece, and a new response is written to the cache once the stream completes.
+        """
+
+        if self.verbose_prompt:
+            logger.info('%s%s%s', c_blue, prompt.format(**prompt_args), c_norm)
+
+        cache_file = self._cache_file_for(prompt, **prompt_args) if self.enable_cache else None
+
+        if cache_file and os.path.exists(cache_file):
+            logger.debug('%sCached response %s%s', c_blue, cache_file, c_norm)
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                response = f.read()
+            if self.verbose_response:
+                logger.info('%s%s%s', c_green, response, c_norm)
+            yield response
+            return
+
+        tokens = []
+
+        try:
+            for token in self.llm.stream(prompt, **prompt_args):
+                tokens.append(token)
+                yield token
+        except Exception as e:
+            raise ModelError(f'{e!s} [Model config: {self.llm.to_json()}]') from e
+
+        response = ''.join(tokens)
+
+        if cache_file:
+            os.makedirs(os.path.dirname(os.path.realpath(cache_file)), exist_ok=True)
+            with open(cache_file, 'w') as f:
+                f.write(response)
+
+        if self.verbose_response:
+            logger.info('%s%s%s', c_green, response, c_norm)
+
+    async def astream(
+        self,
+        prompt: BasePromptTemplate,
+        **prompt_args: Any
+    ) -> AsyncGenerator[str, None]:
+        
+        # The Bedrock LLM's streaming calls block, so each token is fetched on the query executor
+
+        executor = current_query_executor()
+        tokens = self.stream(prompt, **prompt_args)
+        end_of_stream = object()
+        pending = None
+
+        try:
+            while True:
+                pending = executor.submit(STAGE_LLM, next, tokens, end_of_stream)
+                token = await asyncio.wrap_future(pending)
+                if token is end_of_stream:
+                    break
+                yield token
+        finally:
+            # Closing the stream releases the model's response stream if the consumer stops early. A 
+            # generator cannot be closed while a fetch is running, so it is closed once the last fetch is done
+            if pending is None:
+                tokens.close()
+            else:
+                pending.add_done_callback(lambda _: tokens.close())
+
     @property
     def model(self):
         if not isinstance(self.llm, Bedrock):
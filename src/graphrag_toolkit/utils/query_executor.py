@@ -0,0 +1,212 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+import asyncio
+import logging
+import threading
+import contextvars
+import concurrent.futures
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from graphrag_toolkit.config import GraphRAGConfig
+
+logger = logging.getLogger(__name__)
+
+STAGE_GRAPH = 'graph'
+STAGE_VECTOR = 'vector'
+STAGE_EMBEDDING = 'embedding'
+STAGE_LLM = 'llm'
+STAGE_RETRIEVAL = 'retrieval'
+
+DEFAULT_STAGE_LIMITS = {
+    STAGE_GRAPH: 16,
+    STAGE_VECTOR: 16,
+    STAGE_EMBEDDING: 8,
+    STAGE_LLM: 8
+}
+
+class _Stage():
+
+    __slots__ = ('name', 'limit', 'active', 'queue', 'submitted', 'completed', 'started', 'failed', 'cancelled', 'max_queue_depth', 'total_wait_s')
+
+    def __init__(self, name:str, limit:int):
+        self.name = name
+        self.limit = max(1, limit)
+        self.active = 0
+        self.queue = deque()
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.max_queue_depth = 0
+        self.total_wait_s = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'limit': self.limit,
+            'active': self.active,
+            'queue_depth': len(self.queue),
+            'max_queue_depth': self.max_queue_depth,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'avg_wait_ms': (self.total_wait_s / self.started) * 1000 if self.started else 0.0
+        }
+
+
+class QueryExecutor():
+    """
+    A bounded thread pool for the blocking work done while answering questions – graph queries, vector
+    searches, embedding and LLM calls, and synchronous retriever stages – shared by all retrievers.
+
+    Each stage has its own concurrency limit: once a stage has `limit` tasks running, further tasks for
+    that stage wait in the stage's queue, without occupying a pool thread. The retrieval stage is limited
+    to half the pool by default; other stages without a limit in stage_limits are bounded only by the
+    size of the pool. If max_workers is None, the pool size is read from
+    GraphRAGConfig.query_executor_max_workers. stats() reports active tasks, queue depth and queue wait
+    times per stage.
+
+    Tasks run in a copy of the submitting context, so tracing spans (and the current executor) propagate
+    to pool threads. The pool is created on first use.
+    """
+
+    def __init__(self, max_workers:Optional[int]=None, stage_limits:Optional[Dict[str, int]]=None):
+        self._max_workers = max_workers
+        self.stage_limits = DEFAULT_STAGE_LIMITS | (stage_limits or {})
+        self._stages:Dict[str, _Stage] = {}
+        self._executor:Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers if self._max_workers is not None else GraphRAGConfig.query_executor_max_workers
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='graphrag-query')
+            return self._executor
+
+    def _default_limit(self, name:str) -> int:
+        # Retrieval stage tasks may wait on graph and vector tasks submitted to the same pool: limiting
+        # them to half the pool leaves threads free for the tasks they wait on
+        if name == STAGE_RETRIEVAL:
+            return max(1, self.max_workers // 2)
+        return self.max_workers
+
+    def _get_stage(self, name:str) -> _Stage:
+        # Called with the lock held
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = _Stage(name, self.stage_limits.get(name, self._default_limit(name)))
+            self._stages[name] = stage
+        return stage
+
+    def submit(self, stage_name:str, fn:Callable[..., Any], *args:Any, **kwargs:Any) -> concurrent.futures.Future:
+        """Schedules fn(*args, **kwargs) to run in the pool, subject to the stage's concurrency limit."""
+
+        future = concurrent.futures.Future()
+        task = (contextvars.copy_context(), fn, args, kwargs, future, time.monotonic())
+
+        with self._lock:
+            stage = self._get_stage(stage_name)
+            stage.submitted += 1
+            if stage.active < stage.limit:
+                stage.active += 1
+                start = True
+            else:
+                stage.queue.append(task)
+                stage.max_queue_depth = max(stage.max_queue_depth, len(stage.queue))
+                start = False
+
+        if start:
+            self._get_executor().submit(self._run, stage, task)
+
+        return future
+
+    def _run(self, stage:_Stage, task):
+
+        # Runs the task, then any tasks queued for the same stage, on this pool thread
+        while task is not None:
+
+            (context, fn, args, kwargs, future, submitted_at) = task
+
+            if future.set_running_or_notify_cancel():
+                with self._lock:
+                    stage.started += 1
+                    stage.total_wait_s += time.monotonic() - submitted_at
+                try:
+                    result = context.run(fn, *args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                    with self._lock:
+                        stage.failed += 1
+                else:
+                    future.set_result(result)
+                    with self._lock:
+                        stage.completed += 1
+            else:
+                with self._lock:
+                    stage.cancelled += 1
+
+            with self._lock:
+                if stage.queue:
+                    task = stage.queue.popleft()
+                else:
+                    task = None
+                    stage.active -= 1
+
+    async def arun(self, stage_name:str, fn:Callable[..., Any], *args:Any, **kwargs:Any) -> Any:
+        """Runs fn(*args, **kwargs) in the pool, and awaits its result."""
+        return await asyncio.wrap_future(self.submit(stage_name, fn, *args, **kwargs))
+
+    def map(self, stage_name:str, fn:Callable[..., Any], *iterables:Iterable[Any]) -> List[Any]:
+        """Runs fn for each set of arguments in the pool, and returns the results in order."""
+        futures = [self.submit(stage_name, fn, *args) for args in zip(*iterables)]
+        return [future.result() for future in futures]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'stages': {name:stage.stats() for name, stage in self._stages.items()}
+            }
+
+    def shutdown(self, wait:bool=True):
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def __repr__(self):
+        return f'QueryExecutor(max_workers={self.max_workers}, stage_limits={self.stage_limits})'
+
+DEFAULT_QUERY_EXECUTOR = QueryExecutor()
+
+_current_query_executor:contextvars.ContextVar[Optional[QueryExecutor]] = contextvars.ContextVar('current_query_executor', default=None)
+
+def current_query_executor() -> QueryExecutor:
+    """Returns the executor set by the current query engine, or DEFAULT_QUERY_EXECUTOR."""
+    return _current_query_executor.get() or DEFAULT_QUERY_EXECUTOR
+
+@contextmanager
+def use_query_executor(query_executor:Optional[QueryExecutor]):
+    """Makes query_executor the current executor for work started within the block (and tasks it creates)."""
+    if query_executor is None:
+        yield
+        return
+    token = _current_query_executor.set(query_executor)
+    try:
+        yield
+    finally:
+        _current_query_executor.reset(token)
+
+async def to_executor(stage_name:str, fn:Callable[..., Any], *args:Any, **kwargs:Any) -> Any:
+    """Runs fn(*args, **kwargs) on the current executor: a bounded, stage-limited counterpart of asyncio.to_thread()."""
+    return await current_query_executor().arun(stage_name, fn, *args, **kwargs)
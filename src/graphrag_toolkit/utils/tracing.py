@@ -0,0 +1,251 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+import abc
+import json
+import time
+import logging
+import inspect
+import secrets
+import functools
+import threading
+import contextvars
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current_span:contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar('current_span', default=None)
+
+class Span():
+    """
+    A timed operation within a trace. Ids, timestamps (nanoseconds since the epoch), attribute names
+    and status values follow OpenTelemetry conventions.
+    """
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'start_time', 'end_time', 'attributes', 'status')
+
+    def __init__(self, name:str, parent:Optional['Span']=None, attributes:Optional[Dict[str, Any]]=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.start_time = time.time_ns()
+        self.end_time = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.status = 'UNSET'
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return (self.end_time - self.start_time) / 1e6 if self.end_time else None
+
+    def set_attribute(self, key:str, value:Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes:Dict[str, Any]):
+        self.attributes.update(attributes)
+
+    def record_exception(self, e:BaseException):
+        self.status = 'ERROR'
+        self.attributes['exception.type'] = type(e).__name__
+        self.attributes['exception.message'] = str(e)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'duration_ms': self.duration_ms,
+            'status': self.status,
+            'attributes': self.attributes
+        }
+
+
+class SpanExporter(abc.ABC):
+
+    @abc.abstractmethod
+    def export(self, span:Span):
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Retains finished spans in memory. Useful in tests."""
+
+    def __init__(self):
+        self._spans:List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span:Span):
+        with self._lock:
+            self._spans.append(span)
+
+    def get_finished_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends each finished span to a file as a line of JSON."""
+
+    def __init__(self, path:str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8', buffering=1)
+
+    def export(self, span:Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+class _NoOpSpan():
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set_attribute(self, key:str, value:Any):
+        pass
+
+    def set_attributes(self, attributes:Dict[str, Any]):
+        pass
+
+    def record_exception(self, e:BaseException):
+        pass
+
+NOOP_SPAN = _NoOpSpan()
+
+
+class _SpanContext():
+
+    __slots__ = ('_exporters', '_span', '_token')
+
+    def __init__(self, exporters:List[SpanExporter], name:str, attributes:Optional[Dict[str, Any]]):
+        self._exporters = exporters
+        self._span = Span(name, parent=_current_span.get(), attributes=attributes)
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        span = self._span
+        span.end_time = time.time_ns()
+        if exc_value is not None:
+            span.record_exception(exc_value)
+        elif span.status == 'UNSET':
+            span.status = 'OK'
+        _current_span.reset(self._token)
+        for exporter in self._exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(f'Failed to export span [name: {span.name}, exporter: {type(exporter).__name__}]: {e!s}')
+        return False
+
+
+class _Tracing():
+    """
+    Process-wide tracing. Spans are propagated through `contextvars`, so spans started in async tasks,
+    and in functions run via `asyncio.to_thread()` or `with_current_context()`, nest under the span that
+    was current when they were scheduled. When tracing is disabled, `span()` returns a shared no-op span.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._exporters:List[SpanExporter] = []
+        self._otel_tracer = None
+
+    def _replace_exporters(self, exporters:List[SpanExporter]):
+        # Exporters that are not carried over are shut down, so that their files are closed
+        previous_exporters = self._exporters
+        self._exporters = exporters
+        for exporter in previous_exporters:
+            if not any(exporter is e for e in exporters):
+                exporter.shutdown()
+
+    def enable(self, *exporters:SpanExporter):
+        """Records spans, and passes each finished span to the exporters. Exporters passed to a previous call, and not to this one, are shut down."""
+        self._otel_tracer = None
+        self._replace_exporters(list(exporters))
+        self.enabled = True
+
+    def enable_opentelemetry(self, tracer:Optional[Any]=None):
+        """Creates spans using an OpenTelemetry tracer (by default, a tracer from the global tracer provider)."""
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "opentelemetry-api package not found, install with 'pip install opentelemetry-api'"
+            ) from e
+        self._otel_tracer = tracer or trace.get_tracer('graphrag_toolkit')
+        self._replace_exporters([])
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self._otel_tracer = None
+        self._replace_exporters([])
+
+    def span(self, name:str, attributes:Optional[Dict[str, Any]]=None):
+        if not self.enabled:
+            return NOOP_SPAN
+        if self._otel_tracer is not None:
+            return self._otel_tracer.start_as_current_span(name, attributes=attributes)
+        return _SpanContext(self._exporters, name, attributes)
+
+Tracing = _Tracing()
+
+def trace_span(name:str, attributes:Optional[Dict[str, Any]]=None):
+    """Returns a context manager for a span nested under the current span."""
+    return Tracing.span(name, attributes)
+
+def traced(name:str, attributes_fn:Optional[Callable[..., Dict[str, Any]]]=None):
+    """
+    Decorator that runs a function or coroutine function in a span. attributes_fn, if supplied, is called
+    with the function's arguments to get the span's attributes, but only when tracing is enabled.
+    """
+    def decorator(fn):
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not Tracing.enabled:
+                    return await fn(*args, **kwargs)
+                attributes = attributes_fn(*args, **kwargs) if attributes_fn else None
+                with Tracing.span(name, attributes):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not Tracing.enabled:
+                return fn(*args, **kwargs)
+            attributes = attributes_fn(*args, **kwargs) if attributes_fn else None
+            with Tracing.span(name, attributes):
+                return fn(*args, **kwargs)
+        return wrapper
+    
+    return decorator
+
+def with_current_context(fn:Callable) -> Callable:
+    """Binds fn to a copy of the current context, so that spans it starts on an executor thread nest under the current span."""
+    if not Tracing.enabled:
+        return fn
+    return functools.partial(contextvars.copy_context().run, fn)